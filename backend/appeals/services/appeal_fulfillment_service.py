@@ -1,32 +1,29 @@
 from django.db import transaction
+from django.utils import timezone
 from appeals.models import Appeal
-from donations.models import SystemWallet, WalletTransaction
-from decimal import Decimal
+from donations.services.wallet_service import WalletService, InsufficientSystemBalance
 import logging
-from wallet.utils import generate_description, resolve_transfer_by
 
 class AppealFulfillmentService:
     @classmethod
     def fulfill_approved_appeals(cls):
+        """Pay approved, not yet fulfilled appeals from the system wallet, oldest first. Returns the count paid."""
+        fulfilled = 0
         with transaction.atomic():
             # Fetch all approved, unfulfilled appeals
-            appeals = Appeal.objects.select_for_update().filter(status='approved', is_fulfilled=False)
-            wallet, _ = SystemWallet.objects.select_for_update().get_or_create(pk=1)
+            appeals = Appeal.objects.select_for_update().filter(
+                status='approved', fulfilled_at__isnull=True
+            ).order_by('created_at', 'id')
             for appeal in appeals:
-                if wallet.total_balance >= appeal.amount_requested:
-                    # Deduct from wallet
-                    wallet.total_balance -= appeal.amount_requested
-                    wallet.save()
-                    # Log transaction
-                    WalletTransaction.objects.create(
-                        amount=appeal.amount_requested,
-                        type='debit',
-                        description=generate_description('withdrawal', appeal),
-                        transfer_by='System',
-                        related_donation=None  # No direct donation, but could be linked if needed
-                    )
-                    # Mark appeal as fulfilled
-                    appeal.is_fulfilled = True
-                    appeal.status = 'fulfilled'
-                    appeal.save()
-                    logging.info(f"Fulfilled appeal {appeal.id}: {appeal.amount_requested} debited from system wallet.")
+                try:
+                    # Deduct from the (sharded) system wallet and log the debit
+                    WalletService.withdraw_from_system_wallet(appeal.amount_requested)
+                except InsufficientSystemBalance:
+                    continue
+                # Mark appeal as fulfilled
+                appeal.status = 'fulfilled'
+                appeal.fulfilled_at = timezone.now()
+                appeal.save()
+                fulfilled += 1
+                logging.info(f"Fulfilled appeal {appeal.id}: {appeal.amount_requested} debited from system wallet.")
+        return fulfilled
@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from appeals.models import Appeal
+from appeals.services.appeal_fulfillment_service import AppealFulfillmentService
+from donations.models import SystemWallet, WalletTransaction
+from donations.services.wallet_service import WalletService
+
+User = get_user_model()
+
+
+class AppealFulfillmentServiceTests(TestCase):
+    """Paying approved appeals out of the system wallet."""
+
+    def setUp(self):
+        self.shura = User.objects.create_user(
+            email='shura@example.com', password='testpass123', role='shura', first_name='Shura', last_name='Member', phone='2222222222'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='testpass123', role='recipient', is_verified_syed=True,
+            first_name='Test', last_name='Recipient', phone='1111111111'
+        )
+
+    def appeal(self, category, amount, status='approved'):
+        return Appeal.objects.create(
+            title=f'{category} appeal', description='Test', category=category, amount_requested=amount,
+            created_by=self.recipient, beneficiary=self.recipient, status=status,
+            approved_by=self.shura if status == 'approved' else None,
+        )
+
+    def test_pays_approved_appeals_the_balance_covers(self):
+        SystemWallet.objects.create(shard=0, total_balance=Decimal('1500.00'))
+        medical = self.appeal('medical', 1000)
+        school = self.appeal('school_fee', 800)
+        pending = self.appeal('debt', 100, status='pending')
+
+        self.assertEqual(AppealFulfillmentService.fulfill_approved_appeals(), 1)
+        for appeal in (medical, school, pending):
+            appeal.refresh_from_db()
+        self.assertEqual(medical.status, 'fulfilled')
+        self.assertIsNotNone(medical.fulfilled_at)
+        self.assertEqual((school.status, school.fulfilled_at), ('approved', None))
+        self.assertEqual(pending.status, 'pending')
+        self.assertEqual(WalletService.get_balance(), Decimal('500.00'))
+        self.assertEqual(WalletTransaction.objects.filter(type='debit').count(), 1)
+
+        # Nothing left that the balance covers; fulfilled appeals are not paid again
+        self.assertEqual(AppealFulfillmentService.fulfill_approved_appeals(), 0)
+        self.assertEqual(WalletService.get_balance(), Decimal('500.00'))
@@ -1,8 +1,156 @@
+import base64
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ParseError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 
-class FlexiblePageNumberPagination(PageNumberPagination):
+def _count_threshold():
+    return getattr(settings, 'PAGINATION_ESTIMATE_THRESHOLD', 10000)
+
+
+def _count_cache_ttl():
+    return getattr(settings, 'PAGINATION_COUNT_CACHE_TTL', 300)
+
+
+def estimate_count(queryset):
+    """
+    The planner's row estimate for a queryset on Postgres (from EXPLAIN,
+    i.e. reltuples scaled by the filters' selectivity), or None elsewhere.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedPage(Page):
+    """A page whose has_next() comes from fetching one row past the page, not from the count."""
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that only counts exactly while that is cheap.
+
+    Below PAGINATION_ESTIMATE_THRESHOLD rows the count is exact. Above it,
+    Postgres reports the planner estimate; other databases reuse an exact
+    count cached per query for PAGINATION_COUNT_CACHE_TTL seconds. When the
+    count is not exact, pages are served by offset without being clamped to
+    it, and has_next() is decided by peeking one row ahead.
+    """
+    def __init__(self, *args, exact=False, known_count=None, known_count_is_exact=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.force_exact = exact
+        self.count_is_exact = True
+        if known_count is not None and (known_count_is_exact or not exact):
+            self.__dict__['count'] = known_count
+            self.count_is_exact = known_count_is_exact
+
+    def _cache_key(self):
+        sql, params = self.object_list.query.sql_with_params()
+        digest = hashlib.sha1(f'{self.object_list.db}:{sql}:{params!r}'.encode()).hexdigest()
+        return f'pagination:count:{digest}'
+
+    @cached_property
+    def count(self):
+        if self.force_exact or not hasattr(self.object_list, 'query'):
+            return super().count
+        threshold = _count_threshold()
+        estimate = estimate_count(self.object_list)
+        if estimate is not None:
+            if estimate < threshold:
+                return super().count
+            self.count_is_exact = False
+            return estimate
+        key = self._cache_key()
+        cached = cache.get(key)
+        if cached is not None and cached >= threshold:
+            self.count_is_exact = False
+            return cached
+        count = super().count
+        if count >= threshold:
+            cache.set(key, count, _count_cache_ttl())
+        return count
+
+    def validate_number(self, number):
+        self.count  # decides count_is_exact
+        if self.count_is_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return super().validate_number(number)
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_is_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        return EstimatedPage(rows[:self.per_page], number, self, len(rows) > self.per_page)
+
+
+class EstimatedCountPaginationMixin:
+    """
+    Page-number pagination whose count may be estimated on large tables (see
+    EstimatedCountPaginator). Responses carry count_is_exact; ?count=exact
+    forces an exact COUNT(*).
+    """
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.force_exact_count = request.query_params.get(self.count_query_param) == 'exact'
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, *args, **kwargs):
+        return EstimatedCountPaginator(
+            *args, exact=self.force_exact_count, known_count=getattr(self, 'known_count', None),
+            known_count_is_exact=getattr(self, 'known_count_is_exact', True), **kwargs
+        )
+
+    def set_known_count(self, count, exact=True):
+        """
+        Skip counting when the caller already has the total (e.g. from an
+        aggregate). exact=False marks it as possibly stale: it is reported
+        with count_is_exact false, and ?count=exact still runs COUNT(*).
+        """
+        self.known_count = count
+        self.known_count_is_exact = exact
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        page = getattr(self, 'page', None)
+        response.data['count_is_exact'] = page.paginator.count_is_exact if page is not None else True
+        return response
+
+
+class FlexiblePageNumberPagination(EstimatedCountPaginationMixin, PageNumberPagination):
     """
     Custom pagination class that allows 'all' as a page parameter
     to return all results without pagination.
@@ -41,4 +189,93 @@ class FlexiblePageNumberPagination(PageNumberPagination):
             })
         
         # Use standard pagination response
-        return super().get_paginated_response(data) 
\ No newline at end of file
+        return super().get_paginated_response(data) 
+
+def encode_cursor(*values):
+    """
+    Encode keyset values (e.g. a timestamp and an id) into an opaque cursor token.
+    """
+    payload = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(token):
+    """
+    Decode a cursor produced by encode_cursor. Raises ValueError if it is malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+    except (ValueError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def keyset_filter(field, value, pk, descending=True):
+    """
+    Q for rows strictly after (value, pk) in ORDER BY field, id (both in the
+    same direction), i.e. the page that follows a cursor.
+    """
+    op = 'lt' if descending else 'gt'
+    return Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'id__{op}': pk})
+
+
+def timestamp_keyset_page(queryset, cursor, limit, field='timestamp'):
+    """
+    One page of queryset, newest first on (field, id), after an opaque cursor
+    ('' or None for the first page). Returns (rows, next_cursor); next_cursor
+    is None on the last page. Raises ValueError for a malformed cursor.
+
+    Every page is the same bounded range scan over a (field, id) index, so
+    page 500 costs what page 1 does.
+    """
+    queryset = queryset.order_by(f'-{field}', '-id')
+    if cursor:
+        try:
+            ts, pk = decode_cursor(cursor)
+            ts = parse_datetime(ts)
+            pk = int(pk)
+        except (ValueError, TypeError) as e:
+            raise ValueError('Invalid cursor') from e
+        if ts is None:
+            raise ValueError('Invalid cursor')
+        queryset = queryset.filter(keyset_filter(field, ts, pk))
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], field), rows[-1].id)
+    return rows, next_cursor
+
+
+class TimestampCursorPagination(PageNumberPagination):
+    """
+    Page numbers by default; passing ?cursor= (empty for the first page)
+    switches to keyset paging on (timestamp, id) with no COUNT or OFFSET.
+    The cursor response carries results and next_cursor.
+    """
+    cursor_query_param = 'cursor'
+    cursor_field = 'timestamp'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        try:
+            rows, self.next_cursor = timestamp_keyset_page(
+                queryset, request.query_params[self.cursor_query_param],
+                self.get_page_size(request), field=self.cursor_field,
+            )
+        except ValueError:
+            # 400 like the function views' cursors (DRF's own CursorPagination uses 404)
+            raise ParseError('Invalid cursor')
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({'results': data, 'next_cursor': self.next_cursor})
@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.pagination import FlexiblePageNumberPagination
+from users.models import User
+
+
+@override_settings(PAGINATION_ESTIMATE_THRESHOLD=5)
+class EstimatedCountPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(7):
+            User.objects.create_user(
+                email=f'user{i}@example.com', password='pass', role='donor',
+                first_name='User', last_name=str(i), phone=f'12345678{i:02d}'
+            )
+        self.queryset = User.objects.order_by('id')
+
+    def paginate(self, **params):
+        paginator = FlexiblePageNumberPagination()
+        request = Request(APIRequestFactory().get('/', {'page_size': 3, **params}))
+        rows = paginator.paginate_queryset(self.queryset, request)
+        return rows, paginator.get_paginated_response([row.id for row in rows]).data
+
+    def test_first_count_is_exact_then_cached(self):
+        _, data = self.paginate()
+        self.assertEqual((data['count'], data['count_is_exact']), (7, True))
+        User.objects.filter(email='user6@example.com').delete()
+        with self.assertNumQueries(1):
+            _, data = self.paginate()
+        self.assertEqual((data['count'], data['count_is_exact']), (7, False))
+
+    def test_estimated_pages_peek_for_next(self):
+        self.paginate()
+        User.objects.create_user(email='late@example.com', password='pass', role='donor', phone='1234567999')
+        _, data = self.paginate(page=3)
+        self.assertFalse(data['count_is_exact'])
+        # The cached count says 7 rows, but the page still reaches the 8th
+        self.assertEqual(len(data['results']), 2)
+        self.assertIsNone(data['next'])
+        _, data = self.paginate(page=2)
+        self.assertIsNotNone(data['next'])
+
+    def test_count_exact_param_forces_count(self):
+        self.paginate()
+        User.objects.filter(email='user6@example.com').delete()
+        _, data = self.paginate(count='exact')
+        self.assertEqual((data['count'], data['count_is_exact']), (6, True))
+
+    def test_small_lists_stay_exact(self):
+        self.queryset = User.objects.filter(last_name__in=['0', '1']).order_by('id')
+        self.paginate()
+        _, data = self.paginate()
+        self.assertEqual((data['count'], data['count_is_exact']), (2, True))
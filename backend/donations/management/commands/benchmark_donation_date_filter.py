@@ -0,0 +1,72 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+from django.utils import timezone
+
+from donations.models import Donation
+from settings.utils import local_date, local_day_range
+from users.models import User
+
+METHODS = ('stripe', 'jazzcash', 'easypaisa', 'bank_transfer')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the query plan and timing of the old created_at__date filter with the '
+        'half-open created_at range used by the donations list. Seeds throwaway donations '
+        'for a benchmark donor and deletes them afterwards; run it against a scratch database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help='Donations to seed')
+        parser.add_argument('--span-days', type=int, default=730, help='Spread seeded donations over this many days')
+        parser.add_argument('--window-days', type=int, default=7, help='Width of the filtered date window')
+        parser.add_argument('--runs', type=int, default=20)
+
+    def handle(self, *args, **options):
+        donor = User.objects.create_user(
+            email='donation-benchmark@example.invalid', password=None, role='donor',
+            first_name='Donation', last_name='Benchmark', phone='+0000000001',
+        )
+        try:
+            self._seed(donor, options['rows'], options['span_days'])
+            end = local_date() - timedelta(days=options['span_days'] // 2)
+            start = end - timedelta(days=options['window_days'] - 1)
+            lower, upper = local_day_range(start, end)
+            base = Donation.objects.filter(payment_method='jazzcash')
+            variants = {
+                'date cast (before)': base.filter(created_at__date__gte=start, created_at__date__lte=end),
+                'half-open range (after)': base.filter(created_at__gte=lower, created_at__lt=upper),
+            }
+            for label, queryset in variants.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(f'{label}: {start} .. {end}'))
+                self.stdout.write(queryset.explain())
+                self.stdout.write(f"  rows={queryset.count()}  {self._time(queryset, options['runs']):.2f} ms/run")
+        finally:
+            donor.delete()
+
+    def _seed(self, donor, rows, span_days):
+        now = timezone.now()
+        batch = []
+        for i in range(rows):
+            batch.append(Donation(
+                donor=donor, amount=Decimal(random.randint(100, 10000)),
+                payment_method=random.choice(METHODS), transaction_id=f'bench-{i}',
+            ))
+        created = Donation.objects.bulk_create(batch, batch_size=2000)
+        # created_at is auto_now_add, so spread the rows out afterwards
+        for donation in created:
+            donation.created_at = now - timedelta(days=random.randint(0, span_days), minutes=random.randint(0, 1439))
+        Donation.objects.bulk_update(created, ['created_at'], batch_size=500)
+        self.stdout.write(f'Seeded {rows} donations over {span_days} days.')
+
+    def _time(self, queryset, runs):
+        started = time.perf_counter()
+        for _ in range(runs):
+            queryset.aggregate(total=Sum('amount'))
+            list(queryset.order_by('-created_at').values_list('id', flat=True)[:20])
+        return (time.perf_counter() - started) * 1000 / runs
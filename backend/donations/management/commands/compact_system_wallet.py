@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from donations.services.wallet_service import WalletService
+
+
+class Command(BaseCommand):
+    help = (
+        'Fold the system wallet shards back into shard 0 and drop shards beyond '
+        'SYSTEM_WALLET_SHARDS. The balance is unchanged, so it is safe to schedule; '
+        'run it after lowering SYSTEM_WALLET_SHARDS.'
+    )
+
+    def handle(self, *args, **options):
+        balance = WalletService.compact_system_wallet()
+        self.stdout.write(self.style.SUCCESS(
+            f'Compacted system wallet: balance {balance} over {WalletService.shard_count()} shards.'
+        ))
@@ -0,0 +1,53 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from donations.services.donation_import import DonationImportService
+
+
+class Command(BaseCommand):
+    help = (
+        'Import donations from a CSV file (donor_email/donor_phone, amount, payment_method, '
+        'transaction_id, optional currency, donation_type, appeal, note). Rows already recorded '
+        'under the same payment method and transaction id are reported as duplicates.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import')
+        parser.add_argument('--batch-size', type=int, default=DonationImportService.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate and deduplicate without writing')
+        parser.add_argument('--report', help='Write duplicate and rejected rows to this CSV file')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as handle:
+                report = DonationImportService.import_csv(
+                    handle, batch_size=options['batch_size'], dry_run=options['dry_run']
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['report']:
+            self._write_report(options['report'], report)
+        prefix = 'Would insert' if options['dry_run'] else 'Inserted'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {report['inserted_count']}, duplicates {report['duplicate_count']}, "
+            f"rejected {report['rejected_count']}"
+        ))
+        for row in report['rejected'][:20]:
+            self.stdout.write(f"  line {row['line']}: {self._format_errors(row['errors'])}")
+        if report['rejected_count'] > 20:
+            self.stdout.write(f"  ... {report['rejected_count'] - 20} more rejected rows")
+
+    @staticmethod
+    def _format_errors(errors):
+        return '; '.join(f"{field}: {' '.join(str(m) for m in messages)}" for field, messages in errors.items())
+
+    def _write_report(self, path, report):
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['line', 'outcome', 'detail'])
+            for row in report['duplicates']:
+                writer.writerow([row['line'], 'duplicate', f"{row['payment_method']} {row['transaction_id']} ({row['reason']})"])
+            for row in report['rejected']:
+                writer.writerow([row['line'], 'rejected', self._format_errors(row['errors'])])
@@ -0,0 +1,61 @@
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, OperationalError
+from donations.services.webhook_inbox import WebhookInboxService
+
+
+class Command(BaseCommand):
+    help = 'Turn stored payment webhook events into donations; run with --loop (and several processes or --workers) in production'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=WebhookInboxService.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new events')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to sleep when the inbox is empty')
+        parser.add_argument('--workers', type=int, default=1, help='Worker threads in this process')
+
+    def handle(self, *args, **options):
+        released = WebhookInboxService.release_stale_claims()
+        if released:
+            self.stdout.write(f'Re-queued {released} stale events.')
+        if options['workers'] == 1:
+            self._work(options)
+            return
+        threads = [threading.Thread(target=self._work, args=(options,), daemon=True) for _ in range(options['workers'])]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('Stopping after current batches...'))
+
+    def _work(self, options):
+        name = threading.current_thread().name
+        try:
+            while True:
+                try:
+                    events = WebhookInboxService.process_batch(options['batch_size'])
+                except OperationalError as e:
+                    # Lock timeouts and dropped connections: back off and try again
+                    self.stderr.write(f'[{name}] {e}; retrying')
+                    connection.close()
+                    time.sleep(options['interval'])
+                    continue
+                if events:
+                    counts = {}
+                    for event in events:
+                        counts[event.status] = counts.get(event.status, 0) + 1
+                    summary = ', '.join(f'{status} {count}' for status, count in sorted(counts.items()))
+                    self.stdout.write(f'[{name}] {len(events)} events: {summary}')
+                if not options['loop']:
+                    if not events:
+                        return
+                    continue
+                if not events:
+                    time.sleep(options['interval'])
+                    WebhookInboxService.release_stale_claims()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
@@ -0,0 +1,116 @@
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from donations.services.webhook_inbox import WebhookInboxService
+from users.models import User
+
+
+def build_event(gateway, email, amount):
+    """A successful-payment event shaped like the gateway's own webhooks."""
+    if gateway == 'stripe':
+        return {
+            'id': f'evt_{uuid.uuid4().hex[:24]}',
+            'type': 'payment_intent.succeeded',
+            'created': int(time.time()),
+            'data': {'object': {
+                'id': f'pi_{uuid.uuid4().hex[:24]}',
+                'object': 'payment_intent',
+                'amount': amount * 100,
+                'currency': 'pkr',
+                'receipt_email': email,
+                'metadata': {'donor_email': email},
+            }},
+        }
+    return {
+        'event_id': uuid.uuid4().hex,
+        'type': 'payment.succeeded',
+        'transaction_id': f'{gateway[:2].upper()}{random.randint(10 ** 11, 10 ** 12 - 1)}',
+        'amount': f'{amount}.00',
+        'currency': 'PKR',
+        'donor_email': email,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Local stand-in for a payment gateway: POST signed payment webhooks to the donations '
+        'webhook endpoint from many threads, redelivering a share of them the way real gateways '
+        'retry, and report throughput and response codes. Use against a dev server for load tests.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--gateway', choices=WebhookInboxService.GATEWAYS, default='jazzcash')
+        parser.add_argument('--url', help='Endpoint (default: http://127.0.0.1:8000/api/donations/webhooks/<gateway>/)')
+        parser.add_argument('--secret', help="Signing secret (default: the gateway's PAYMENT_WEBHOOK_SECRETS entry)")
+        parser.add_argument('--events', type=int, default=1000, help='Distinct events to generate')
+        parser.add_argument('--redeliver', type=float, default=0.1, help='Share of events sent a second time')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--donor-email', action='append', dest='emails', help='Donor to pay as (repeatable; default: up to 100 existing donors)')
+        parser.add_argument('--save', help='Also write the generated event bodies to this NDJSON file')
+        parser.add_argument('--replay', help='Send the event bodies in this NDJSON file instead of generating new ones')
+
+    def handle(self, *args, **options):
+        gateway = options['gateway']
+        secret = options['secret'] or WebhookInboxService.secret(gateway)
+        if not secret:
+            raise CommandError(f'No webhook secret for {gateway}; pass --secret or configure it')
+        url = options['url'] or f'http://127.0.0.1:8000/api/donations/webhooks/{gateway}/'
+
+        if options['replay']:
+            with open(options['replay'], encoding='utf-8') as handle:
+                bodies = [line.strip().encode() for line in handle if line.strip()]
+        else:
+            emails = options['emails'] or list(User.objects.filter(role='donor').values_list('email', flat=True)[:100])
+            if not emails:
+                raise CommandError('No donors to pay as; pass --donor-email')
+            bodies = [
+                json.dumps(build_event(gateway, random.choice(emails), random.randint(100, 25000))).encode()
+                for _ in range(options['events'])
+            ]
+        if not bodies:
+            raise CommandError('No events to send')
+        if options['save']:
+            with open(options['save'], 'w', encoding='utf-8') as handle:
+                handle.writelines(body.decode() + '\n' for body in bodies)
+
+        deliveries = bodies + random.sample(bodies, int(len(bodies) * options['redeliver']))
+        random.shuffle(deliveries)
+        header = WebhookInboxService.signature_header(gateway)
+
+        def deliver(body):
+            request = urllib.request.Request(url, data=body, method='POST', headers={
+                'Content-Type': 'application/json', header: WebhookInboxService.sign(secret, body),
+            })
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    code = response.status
+            except urllib.error.HTTPError as e:
+                code = e.code
+            except OSError:
+                code = 'error'
+            return code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(deliver, deliveries))
+        elapsed = time.perf_counter() - started
+
+        codes = {}
+        for code, _ in results:
+            codes[code] = codes.get(code, 0) + 1
+        latencies = sorted(latency for _, latency in results)
+
+        def pick(q):
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+        self.stdout.write(f'{len(deliveries)} deliveries ({len(bodies)} events) in {elapsed:.2f}s, {len(deliveries) / elapsed:.0f}/s')
+        self.stdout.write(f'latency ms: p50 {pick(0.5):.1f}  p95 {pick(0.95):.1f}  p99 {pick(0.99):.1f}')
+        self.stdout.write('responses: ' + ', '.join(f'{code}: {count}' for code, count in sorted(codes.items(), key=str)))
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0003_remove_donation_donations_donor_i_6650d2_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['created_at'], name='donations_created_f10839_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['payment_method', 'created_at'], name='donations_payment_e76db4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['appeal', 'created_at'], name='donations_appeal__33a209_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0004_donation_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['transaction_id'], name='donations_txn_id_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0005_transaction_id_prefix_index'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='donation',
+            constraint=models.UniqueConstraint(condition=models.Q(('transaction_id__isnull', False), models.Q(('transaction_id', ''), _negated=True)), fields=('payment_method', 'transaction_id'), name='donations_unique_method_txn'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+def number_existing_rows(apps, schema_editor):
+    # The single pk=1 row becomes shard 0, keeping its balance
+    SystemWallet = apps.get_model('donations', 'SystemWallet')
+    for index, wallet in enumerate(SystemWallet.objects.order_by('pk')):
+        SystemWallet.objects.filter(pk=wallet.pk).update(shard=index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0007_webhook_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='systemwallet',
+            name='shard',
+            field=models.PositiveSmallIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.RunPython(number_existing_rows, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='systemwallet',
+            name='shard',
+            field=models.PositiveSmallIntegerField(unique=True),
+        ),
+    ]
@@ -1,2 +1,3 @@
 from .donation import Donation
 from .wallet import SystemWallet, WalletTransaction
+from .webhook import WebhookEvent
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 
 class Donation(models.Model):
@@ -56,6 +57,19 @@ class Donation(models.Model):
         indexes = [
             models.Index(fields=['donor', 'created_at']),
             models.Index(fields=['donation_type']),
+            models.Index(fields=['created_at']),
+            models.Index(fields=['payment_method', 'created_at']),
+            models.Index(fields=['appeal', 'created_at']),
+            # Prefix search on transaction ids; the opclass lets Postgres serve LIKE 'abc%'
+            models.Index(fields=['transaction_id'], name='donations_txn_id_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ]
+        constraints = [
+            # A gateway transaction is recorded once; rows without an id are not constrained
+            models.UniqueConstraint(
+                fields=['payment_method', 'transaction_id'],
+                condition=Q(transaction_id__isnull=False) & ~Q(transaction_id=''),
+                name='donations_unique_method_txn',
+            ),
         ]
 
     def __str__(self):
@@ -2,6 +2,13 @@ from django.db import models
 from decimal import Decimal
 
 class SystemWallet(models.Model):
+    """
+    One shard of the system wallet balance. Credits go to one of
+    settings.SYSTEM_WALLET_SHARDS rows so concurrent donations do not queue
+    on a single row lock; the balance is the sum of all shards (see
+    WalletService).
+    """
+    shard = models.PositiveSmallIntegerField(unique=True)
     total_balance = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
     last_updated = models.DateTimeField(auto_now=True)
 
@@ -11,7 +18,7 @@ class SystemWallet(models.Model):
         verbose_name_plural = 'System Wallets'
 
     def __str__(self):
-        return f"SystemWallet(balance={self.total_balance})"
+        return f"SystemWallet(shard={self.shard}, balance={self.total_balance})"
 
 class WalletTransaction(models.Model):
     TRANSACTION_TYPE_CHOICES = [
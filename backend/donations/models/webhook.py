@@ -0,0 +1,47 @@
+from django.db import models
+
+
+class WebhookEvent(models.Model):
+    """
+    Inbox row for a payment gateway webhook. The endpoint only verifies the
+    signature and stores the payload; the process_webhook_events worker turns
+    payment events into Donations.
+    """
+    GATEWAY_CHOICES = [
+        ('stripe', 'Stripe'),
+        ('jazzcash', 'JazzCash'),
+        ('easypaisa', 'EasyPaisa'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('processed', 'Processed'),
+        ('ignored', 'Ignored'),
+        ('failed', 'Failed'),
+    ]
+    gateway = models.CharField(max_length=16, choices=GATEWAY_CHOICES)
+    event_id = models.CharField(max_length=128)
+    payload = models.JSONField()
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default='pending')
+    donation = models.ForeignKey(
+        'donations.Donation', null=True, blank=True, on_delete=models.SET_NULL, related_name='webhook_events'
+    )
+    error = models.TextField(blank=True, default='')
+    claim_token = models.CharField(max_length=64, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'donation_webhook_events'
+        ordering = ['-received_at', '-id']
+        indexes = [
+            models.Index(fields=['status', 'received_at']),
+        ]
+        constraints = [
+            # Gateways retry deliveries; each event is stored once
+            models.UniqueConstraint(fields=['gateway', 'event_id'], name='donation_webhook_unique_event'),
+        ]
+
+    def __str__(self):
+        return f"WebhookEvent({self.gateway} {self.event_id}, {self.status})"
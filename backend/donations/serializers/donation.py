@@ -38,3 +38,31 @@ class DonationSerializer(serializers.ModelSerializer):
         user = request.user if request else None
         validated_data['donor'] = user
         return super().create(validated_data)
+
+
+class DonationImportSerializer(DonationSerializer):
+    """
+    One row of a bulk donation import. Same rules as DonationSerializer, but
+    the transaction id is required and the appeal is checked against
+    context['appeals'] ({id: status}, loaded once per batch) instead of one
+    query per row. Uniqueness of (payment_method, transaction_id) is checked
+    per batch by the import service, so the generated validators are dropped.
+    """
+    transaction_id = serializers.CharField(max_length=128)
+    appeal = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Donation
+        fields = ['amount', 'currency', 'donation_type', 'note', 'appeal', 'payment_method', 'transaction_id']
+        extra_kwargs = {'payment_method': {'required': True, 'allow_null': False, 'allow_blank': False}}
+        validators = []
+
+    def validate_appeal(self, value):
+        if value is None:
+            return value
+        status = self.context.get('appeals', {}).get(value)
+        if status is None:
+            raise serializers.ValidationError(f'Invalid pk "{value}" - object does not exist.')
+        if status != 'approved':
+            raise serializers.ValidationError('Appeal must be approved to receive donations.')
+        return value
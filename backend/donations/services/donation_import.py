@@ -0,0 +1,205 @@
+import csv
+from decimal import Decimal
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+
+from appeals.models import Appeal
+from donations.models import Donation
+from donations.serializers.donation import DonationImportSerializer
+from donations.services.donation_stats import DonationStatsService
+from users.models import User
+from wallet.services import activity_feed, dashboard_snapshots, platform_metrics
+
+
+class DonationImportService:
+    """
+    Bulk donation import from CSV (a gateway settlement file or a back-office
+    export). Rows are streamed and handled in batches: one serializer pass per
+    batch for validation, one query each for appeals, donors and already
+    recorded transaction ids, then one bulk_create. Every row ends up in the
+    report as inserted, duplicate or rejected, keyed by its CSV line number.
+
+    Columns: donor_email and/or donor_phone, amount, payment_method,
+    transaction_id, and optionally currency, donation_type, appeal (an id)
+    and note.
+    """
+    DEFAULT_BATCH_SIZE = 1000
+    DONOR_COLUMNS = ('donor_email', 'donor_phone')
+    REQUIRED_COLUMNS = ('amount', 'payment_method', 'transaction_id')
+
+    @classmethod
+    def import_csv(cls, handle, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+        """
+        Import donations from a text file object. With dry_run=True rows are
+        validated and deduplicated but nothing is written. Returns the report
+        (see empty_report); raises ValueError if the header lacks a column.
+        """
+        reader = csv.DictReader(handle)
+        cls._check_header(reader.fieldnames)
+        # line_num is the file line each row ends on (the header is line 1)
+        return cls.import_rows(((reader.line_num, row) for row in reader), batch_size, dry_run)
+
+    @classmethod
+    def import_rows(cls, rows, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+        """
+        Import an iterable of (key, row) pairs, where row is a dict of import
+        columns. The report's `line` fields carry the keys.
+        """
+        rows = iter(rows)
+        report = cls.empty_report()
+        seen = set()
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            cls._import_batch(batch, seen, report, dry_run)
+        return report
+
+    @staticmethod
+    def empty_report():
+        return {
+            'inserted_count': 0,
+            'duplicate_count': 0,
+            'rejected_count': 0,
+            'inserted': [],
+            'duplicates': [],
+            'rejected': [],
+        }
+
+    @classmethod
+    def _check_header(cls, fieldnames):
+        fieldnames = fieldnames or []
+        missing = [column for column in cls.REQUIRED_COLUMNS if column not in fieldnames]
+        if not any(column in fieldnames for column in cls.DONOR_COLUMNS):
+            missing.append(' or '.join(cls.DONOR_COLUMNS))
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    @staticmethod
+    def _clean(row):
+        # Blank cells mean "not given", so model defaults and optional fields apply
+        row = {key: str(value).strip() for key, value in row.items() if key and value is not None}
+        return {key: value for key, value in row.items() if value}
+
+    @classmethod
+    def _import_batch(cls, batch, seen, report, dry_run):
+        rows = [(line, cls._clean(row)) for line, row in batch]
+        appeal_ids = {int(row['appeal']) for _, row in rows if row.get('appeal', '').isdigit()}
+        appeals = dict(Appeal.objects.filter(id__in=appeal_ids).values_list('id', 'status')) if appeal_ids else {}
+
+        # One serializer per batch: fields are built once, then each row runs through them
+        serializer = DonationImportSerializer(context={'appeals': appeals})
+        donors = cls._match_donors(rows)
+
+        candidates = []
+        for line, row in rows:
+            try:
+                data, errors = serializer.run_validation(row), {}
+            except ValidationError as exc:
+                data, errors = None, dict(as_serializer_error(exc))
+            donor = donors.get(('email', row.get('donor_email', '').lower())) or donors.get(('phone', row.get('donor_phone')))
+            if donor is None:
+                errors['donor'] = ['No user with this email or phone.']
+            if errors:
+                report['rejected'].append({'line': line, 'errors': errors})
+                continue
+            key = (data['payment_method'], data['transaction_id'])
+            if key in seen:
+                cls._add_duplicate(report, line, key, 'repeated in file')
+                continue
+            seen.add(key)
+            data['appeal_id'] = data.pop('appeal', None)
+            candidates.append((line, Donation(donor=donor, **data)))
+
+        candidates = cls._drop_recorded(candidates, report)
+        if candidates and not dry_run:
+            candidates = cls._insert(candidates, report)
+        for line, donation in candidates:
+            report['inserted'].append({'line': line, 'id': donation.pk})
+        report['inserted_count'] = len(report['inserted'])
+        report['rejected_count'] = len(report['rejected'])
+
+    @classmethod
+    def _match_donors(cls, rows):
+        """{('email', lowered) | ('phone', phone): User} for the batch, from one query."""
+        emails = {row['donor_email'] for _, row in rows if 'donor_email' in row}
+        phones = {row['donor_phone'] for _, row in rows if 'donor_phone' in row}
+        if not emails and not phones:
+            return {}
+        # LOWER(email) is served by users_email_lower_idx
+        users = (
+            User.objects.alias(email_lower=Lower('email'))
+            .filter(Q(email_lower__in={email.lower() for email in emails}) | Q(phone__in=phones))
+            .only('id', 'email', 'phone', 'first_name', 'last_name').order_by()
+        )
+        donors = {}
+        for user in users:
+            donors[('email', user.email.lower())] = user
+            donors[('phone', user.phone)] = user
+        return donors
+
+    @staticmethod
+    def _add_duplicate(report, line, key, reason):
+        report['duplicates'].append({
+            'line': line, 'payment_method': key[0], 'transaction_id': key[1], 'reason': reason,
+        })
+        report['duplicate_count'] = len(report['duplicates'])
+
+    @classmethod
+    def _drop_recorded(cls, candidates, report):
+        """Move rows whose (payment_method, transaction_id) is already stored to the duplicates."""
+        if not candidates:
+            return candidates
+        recorded = set(
+            Donation.objects.filter(transaction_id__in={d.transaction_id for _, d in candidates})
+            .values_list('payment_method', 'transaction_id').order_by()
+        )
+        fresh = []
+        for line, donation in candidates:
+            key = (donation.payment_method, donation.transaction_id)
+            if key in recorded:
+                cls._add_duplicate(report, line, key, 'already recorded')
+            else:
+                fresh.append((line, donation))
+        return fresh
+
+    @classmethod
+    def _insert(cls, candidates, report):
+        try:
+            with transaction.atomic():
+                Donation.objects.bulk_create([donation for _, donation in candidates])
+                cls._record_side_effects([donation for _, donation in candidates])
+            return candidates
+        except IntegrityError:
+            pass
+        # Another writer recorded some of these ids since the check. Drop the ones now
+        # visible, then insert row by row so any later conflict is reported as a duplicate
+        inserted = []
+        with transaction.atomic():
+            for line, donation in cls._drop_recorded(candidates, report):
+                donation.pk = None  # may be left set by the rolled-back attempt
+                try:
+                    with transaction.atomic():
+                        Donation.objects.bulk_create([donation])
+                except IntegrityError:
+                    cls._add_duplicate(report, line, (donation.payment_method, donation.transaction_id), 'recorded concurrently')
+                    continue
+                inserted.append((line, donation))
+            cls._record_side_effects([donation for _, donation in inserted])
+        return inserted
+
+    @staticmethod
+    def _record_side_effects(donations):
+        """bulk_create skips post_save, so feed the donation rollups directly."""
+        if not donations:
+            return
+        activity_feed.record_donations(donations)
+        platform_metrics.record_donations(sum((d.amount for d in donations), Decimal('0.00')), len(donations))
+        dashboard_snapshots.mark_dirty()
+        DonationStatsService.invalidate()
@@ -0,0 +1,82 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from donations.models import Donation
+
+
+class DonationStatsService:
+    """
+    Admin meta numbers for the donations list: totals per payment method from
+    one grouped aggregate, cached per normalized filter set. A donation write
+    bumps the cache version once it commits; entries also expire after
+    DONATION_STATS_CACHE_TTL seconds, which bounds how stale a cached meta
+    can be when the write happened in another process and the cache is not
+    shared.
+    """
+    CACHE_PREFIX = 'donations:meta'
+    VERSION_KEY = 'donations:meta:version'
+    # The admin list excludes manual donations, so they never appear in the meta
+    METHODS = [code for code, _ in Donation.PAYMENT_METHOD_CHOICES if code != 'manual']
+    # Legacy meta keys kept for the existing dashboard
+    LEGACY_KEYS = {'bank_transfer': 'via_bank', 'jazzcash': 'via_jazzcash', 'easypaisa': 'via_easypaisa', 'stripe': 'via_stripe'}
+
+    @classmethod
+    def _version(cls):
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            cache.add(cls.VERSION_KEY, 1, timeout=None)
+            version = cache.get(cls.VERSION_KEY, 1)
+        return version
+
+    @classmethod
+    def invalidate(cls):
+        """Bump the cache version once the current transaction commits."""
+        def bump():
+            try:
+                cache.incr(cls.VERSION_KEY)
+            except ValueError:
+                cache.add(cls.VERSION_KEY, 1, timeout=None)
+        transaction.on_commit(bump)
+
+    @classmethod
+    def compute(cls, queryset):
+        """One GROUP BY payment_method pass over the filtered queryset."""
+        grouped = {
+            row['payment_method']: row
+            for row in queryset.order_by().values('payment_method').annotate(amount=Sum('amount'), count=Count('id'))
+        }
+        by_method = {
+            method: {
+                'amount': float((grouped.get(method) or {}).get('amount') or 0),
+                'count': (grouped.get(method) or {}).get('count') or 0,
+            }
+            for method in cls.METHODS
+        }
+        meta = {
+            'total_amount': float(sum((row['amount'] or 0) for row in grouped.values())),
+            'total_count': sum(row['count'] for row in grouped.values()),
+            'by_payment_method': by_method,
+        }
+        for method, key in cls.LEGACY_KEYS.items():
+            meta[key] = by_method[method]['amount']
+        return meta
+
+    @classmethod
+    def get_meta(cls, queryset, filters):
+        """
+        Meta for `queryset`, which must be the admin list filtered by `filters`
+        (a normalized dict of the list's query parameters). Returns
+        (meta, cached); cached meta may trail recent writes.
+        """
+        digest = hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+        key = f'{cls.CACHE_PREFIX}:{cls._version()}:{digest}'
+        meta = cache.get(key)
+        if meta is not None:
+            return meta, True
+        meta = cls.compute(queryset)
+        cache.set(key, meta, settings.DONATION_STATS_CACHE_TTL)
+        return meta, False
@@ -1,33 +1,101 @@
+import random
 from decimal import Decimal
 from donations.models import SystemWallet, WalletTransaction, Donation
-from django.db import transaction
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
 import logging
 
+
+class InsufficientSystemBalance(ValueError):
+    """The system wallet holds less than the requested debit."""
+
+
 class WalletService:
     """
     Service for managing the system wallet balance and transaction log.
+
+    The balance is spread over SYSTEM_WALLET_SHARDS SystemWallet rows. A
+    credit is one conditional UPDATE on a single shard (hashed from the
+    donation, random otherwise), so concurrent donations only contend when
+    they land on the same shard. Reads sum the shards; debits lock them all.
     """
+    @classmethod
+    def shard_count(cls) -> int:
+        return max(1, settings.SYSTEM_WALLET_SHARDS)
+
+    @classmethod
+    def _pick_shard(cls, related_donation: Donation = None) -> int:
+        if related_donation is not None and related_donation.pk is not None:
+            return related_donation.pk % cls.shard_count()
+        return random.randrange(cls.shard_count())
+
     @classmethod
     def add_to_system_wallet(cls, amount: Decimal, related_donation: Donation = None) -> Decimal:
         if amount <= 0:
             raise ValueError('Amount must be positive')
+        shard = cls._pick_shard(related_donation)
         with transaction.atomic():
-            wallet, _ = SystemWallet.objects.select_for_update().get_or_create(pk=1)
-            wallet.total_balance += amount
-            wallet.save()
+            credit = {'total_balance': F('total_balance') + amount}
+            if not SystemWallet.objects.filter(shard=shard).update(**credit):
+                # First write to this shard; a concurrent first write wins the insert and we add to it
+                try:
+                    with transaction.atomic():
+                        SystemWallet.objects.create(shard=shard, total_balance=amount)
+                except IntegrityError:
+                    SystemWallet.objects.filter(shard=shard).update(**credit)
             WalletTransaction.objects.create(
                 amount=amount,
                 type='credit',
                 related_donation=related_donation
             )
-            logging.info(f"Added {amount} to system wallet. New balance: {wallet.total_balance}")
-            return wallet.total_balance
+            logging.info(f"Added {amount} to system wallet shard {shard}.")
+        return cls.get_balance()
+
+    @classmethod
+    def withdraw_from_system_wallet(cls, amount: Decimal) -> Decimal:
+        """
+        Debit the system wallet, draining the fullest shards first. All shards
+        are locked in shard order, so the balance check holds until commit.
+        Raises InsufficientSystemBalance. Returns the new balance.
+        """
+        if amount <= 0:
+            raise ValueError('Amount must be positive')
+        with transaction.atomic():
+            shards = list(SystemWallet.objects.select_for_update().order_by('shard'))
+            balance = sum((wallet.total_balance for wallet in shards), Decimal('0.00'))
+            if balance < amount:
+                raise InsufficientSystemBalance('Insufficient system wallet balance')
+            remaining = amount
+            for wallet in sorted(shards, key=lambda w: w.total_balance, reverse=True):
+                if remaining <= 0:
+                    break
+                take = min(wallet.total_balance, remaining)
+                SystemWallet.objects.filter(pk=wallet.pk).update(total_balance=F('total_balance') - take)
+                remaining -= take
+            WalletTransaction.objects.create(amount=amount, type='debit')
+            logging.info(f"Withdrew {amount} from system wallet. New balance: {balance - amount}")
+            return balance - amount
+
+    @classmethod
+    def compact_system_wallet(cls) -> Decimal:
+        """
+        Fold every shard into shard 0 (and drop shards beyond the configured
+        count). Optional housekeeping, run by the compact_system_wallet command;
+        the balance is unchanged. Returns it.
+        """
+        with transaction.atomic():
+            shards = list(SystemWallet.objects.select_for_update().order_by('shard'))
+            balance = sum((wallet.total_balance for wallet in shards), Decimal('0.00'))
+            SystemWallet.objects.update_or_create(shard=0, defaults={'total_balance': balance})
+            SystemWallet.objects.filter(shard__gte=cls.shard_count()).delete()
+            SystemWallet.objects.filter(shard__gt=0).update(total_balance=Decimal('0.00'))
+            return balance
 
     @classmethod
     def get_balance(cls) -> Decimal:
-        wallet, _ = SystemWallet.objects.get_or_create(pk=1)
-        return wallet.total_balance
+        return SystemWallet.objects.aggregate(total=Sum('total_balance'))['total'] or Decimal('0.00')
 
     @classmethod
     def get_transactions(cls):
-        return list(WalletTransaction.objects.all().order_by('-created_at')) 
\ No newline at end of file
+        return list(WalletTransaction.objects.all().order_by('-created_at'))
@@ -0,0 +1,230 @@
+import hashlib
+import hmac
+import json
+import logging
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+
+from donations.models import Donation, WebhookEvent
+from donations.services.donation_import import DonationImportService
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookRejected(ValueError):
+    """A webhook delivery that must not be stored (bad signature or payload)."""
+
+
+class WebhookInboxService:
+    """
+    Payment webhooks through an inbox table. receive() verifies the signature
+    and stores the event with a single INSERT, so the endpoint answers at
+    once however bursty the gateway is; a redelivered event is a no-op. The
+    worker claims pending events in batches and turns payment events into
+    Donations through DonationImportService, so they get the same validation,
+    donor matching and (payment_method, transaction_id) dedupe as an import:
+    replaying an event, or a second event for the same payment, never
+    creates a second donation.
+
+    Every gateway signs with the header format `t=<unix time>,v1=<hex>`,
+    where v1 is HMAC-SHA256 of "<t>.<raw body>" under the gateway's secret
+    (Stripe's scheme, sent as Stripe-Signature; X-Webhook-Signature for the
+    others).
+    """
+    GATEWAYS = [code for code, _ in WebhookEvent.GATEWAY_CHOICES]
+    SIGNATURE_HEADERS = {'stripe': 'Stripe-Signature'}
+    DEFAULT_SIGNATURE_HEADER = 'X-Webhook-Signature'
+    PAYMENT_EVENTS = {
+        'stripe': ('payment_intent.succeeded', 'charge.succeeded'),
+        'jazzcash': ('payment.succeeded',),
+        'easypaisa': ('payment.succeeded',),
+    }
+    DEFAULT_BATCH_SIZE = 100
+    # Events left in 'processing' longer than this belong to a dead worker
+    STALE_CLAIM_AFTER = timedelta(minutes=5)
+
+    @classmethod
+    def secret(cls, gateway):
+        return settings.PAYMENT_WEBHOOK_SECRETS.get(gateway) or ''
+
+    @classmethod
+    def signature_header(cls, gateway):
+        return cls.SIGNATURE_HEADERS.get(gateway, cls.DEFAULT_SIGNATURE_HEADER)
+
+    @staticmethod
+    def sign(secret, body, timestamp=None):
+        """Signature header value for a raw body (used by the stub gateway and tests)."""
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        digest = hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+        return f't={timestamp},v1={digest}'
+
+    @classmethod
+    def verify(cls, gateway, body, header):
+        """True if header carries a current, valid signature of body for this gateway."""
+        secret = cls.secret(gateway)
+        if not secret or not header:
+            return False
+        parts = dict(part.split('=', 1) for part in header.split(',') if '=' in part)
+        try:
+            timestamp = int(parts.get('t', ''))
+        except ValueError:
+            return False
+        if abs(time.time() - timestamp) > settings.PAYMENT_WEBHOOK_TOLERANCE:
+            return False
+        expected = cls.sign(secret, body, timestamp).split('v1=', 1)[1]
+        return hmac.compare_digest(expected, parts.get('v1', ''))
+
+    @staticmethod
+    def event_id(gateway, payload):
+        return payload.get('id') if gateway == 'stripe' else payload.get('event_id')
+
+    @classmethod
+    def receive(cls, gateway, body, header):
+        """
+        Verify and store one delivery. Raises WebhookRejected for a bad
+        signature or payload; a repeat of a stored event is accepted silently.
+        """
+        if not cls.verify(gateway, body, header):
+            raise WebhookRejected('Invalid signature')
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise WebhookRejected('Payload is not valid JSON')
+        event_id = cls.event_id(gateway, payload) if isinstance(payload, dict) else None
+        if not event_id or len(str(event_id)) > 128:
+            raise WebhookRejected('Payload has no event id')
+        WebhookEvent.objects.bulk_create(
+            [WebhookEvent(gateway=gateway, event_id=str(event_id), payload=payload)], ignore_conflicts=True
+        )
+
+    @classmethod
+    def to_row(cls, event):
+        """
+        The import row for a payment event, or None for any other event type.
+        Stripe amounts are in minor units; the local gateways send rupees.
+        """
+        payload = event.payload
+        if payload.get('type') not in cls.PAYMENT_EVENTS[event.gateway]:
+            return None
+        if event.gateway == 'stripe':
+            obj = (payload.get('data') or {}).get('object') or {}
+            metadata = obj.get('metadata') or {}
+            amount = obj.get('amount')
+            return {
+                'donor_email': metadata.get('donor_email') or obj.get('receipt_email'),
+                'donor_phone': metadata.get('donor_phone'),
+                'amount': Decimal(amount) / 100 if isinstance(amount, int) else amount,
+                'currency': (obj.get('currency') or '').upper() or None,
+                'payment_method': 'stripe',
+                # Stripe sends charge.succeeded and payment_intent.succeeded for one card
+                # payment; keying both on the PaymentIntent makes them one donation
+                'transaction_id': obj.get('payment_intent') or obj.get('id'),
+                'appeal': metadata.get('appeal_id'),
+                'donation_type': metadata.get('donation_type'),
+                'note': metadata.get('note'),
+            }
+        return {
+            'donor_email': payload.get('donor_email'),
+            'donor_phone': payload.get('donor_phone'),
+            'amount': payload.get('amount'),
+            'currency': payload.get('currency'),
+            'payment_method': event.gateway,
+            'transaction_id': payload.get('transaction_id'),
+            'appeal': payload.get('appeal_id'),
+            'donation_type': payload.get('donation_type'),
+            'note': payload.get('note'),
+        }
+
+    @classmethod
+    def claim_batch(cls, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Move up to batch_size pending events to 'processing' for this worker,
+        oldest first; same claim strategy as the withdrawal queue (SKIP LOCKED
+        where supported, a single guarded UPDATE elsewhere).
+        """
+        token = uuid.uuid4().hex
+        claim = {'status': 'processing', 'claim_token': token, 'claimed_at': timezone.now()}
+        pending = WebhookEvent.objects.filter(status='pending').order_by('received_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                ids = list(pending.select_for_update(skip_locked=True).values_list('id', flat=True)[:batch_size])
+                if not ids:
+                    return []
+                WebhookEvent.objects.filter(id__in=ids).update(**claim)
+        elif not WebhookEvent.objects.filter(
+            id__in=pending.values('id')[:batch_size], status='pending'
+        ).update(**claim):
+            return []
+        return list(WebhookEvent.objects.filter(claim_token=token, status='processing').order_by('received_at', 'id'))
+
+    @classmethod
+    def process_events(cls, events):
+        """Turn claimed events into donations and record each event's outcome."""
+        now = timezone.now()
+        rows = []
+        for event in events:
+            event.processed_at = now
+            row = cls.to_row(event)
+            if row is None:
+                event.status = 'ignored'
+            else:
+                rows.append((event.id, row))
+        by_id = {event.id: event for event in events}
+        report = DonationImportService.import_rows(rows, batch_size=max(len(rows), 1))
+
+        for item in report['inserted']:
+            by_id[item['line']].status, by_id[item['line']].donation_id = 'processed', item['id']
+        # Already recorded payments: the event is done, linked to the existing donation
+        recorded = {}
+        if report['duplicates']:
+            recorded = {
+                (method, txn): pk for pk, method, txn in Donation.objects.filter(
+                    transaction_id__in={item['transaction_id'] for item in report['duplicates']}
+                ).values_list('id', 'payment_method', 'transaction_id').order_by()
+            }
+        for item in report['duplicates']:
+            event = by_id[item['line']]
+            event.status = 'processed'
+            event.donation_id = recorded.get((item['payment_method'], item['transaction_id']))
+        for item in report['rejected']:
+            event = by_id[item['line']]
+            event.status = 'failed'
+            event.error = json.dumps(item['errors'])
+        WebhookEvent.objects.bulk_update(events, ['status', 'donation', 'error', 'processed_at'])
+        return events
+
+    @classmethod
+    def process_batch(cls, batch_size=DEFAULT_BATCH_SIZE):
+        """Claim and process one batch. Returns the processed events."""
+        events = cls.claim_batch(batch_size)
+        if not events:
+            return []
+        ids = [event.id for event in events]
+        try:
+            return cls.process_events(events)
+        except OperationalError:
+            # Lock timeouts and dropped connections: hand the batch back for a retry,
+            # where donations that made it in are found again as duplicates
+            WebhookEvent.objects.filter(id__in=ids).update(status='pending', claim_token='')
+            raise
+        except Exception:
+            logger.exception("Webhook events %s failed unexpectedly", ids)
+            WebhookEvent.objects.filter(id__in=ids).update(
+                status='failed', error='Processing error', processed_at=timezone.now()
+            )
+            for event in events:
+                event.status, event.error = 'failed', 'Processing error'
+            return events
+
+    @classmethod
+    def release_stale_claims(cls, older_than=STALE_CLAIM_AFTER):
+        """Put events claimed by a worker that died back in the queue. Returns the count."""
+        return WebhookEvent.objects.filter(
+            status='processing', claimed_at__lt=timezone.now() - older_than
+        ).update(status='pending', claim_token='')
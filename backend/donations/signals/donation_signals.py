@@ -1,7 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from donations.models import Donation
 from donations.services.wallet_service import WalletService
+from donations.services.donation_stats import DonationStatsService
 import logging
 from datetime import datetime
 
@@ -9,3 +10,9 @@ from datetime import datetime
 def donation_confirmed_handler(sender, instance, created, **kwargs):
     """No-op: status logic removed from Donation model."""
     pass
+
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+def invalidate_donation_meta(sender, **kwargs):
+    """Any donation write makes the cached admin list meta stale."""
+    DonationStatsService.invalidate()
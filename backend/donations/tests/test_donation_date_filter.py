@@ -0,0 +1,53 @@
+from datetime import datetime, timezone as dt_timezone
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from donations.models import Donation
+from settings.models import Setting
+
+User = get_user_model()
+
+
+class DonationDateFilterTests(TestCase):
+    """Date filters are half-open ranges over platform-local days."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        donor = User.objects.create_user(
+            email='donor@example.com', password='testpass123', role='donor', first_name='Test', last_name='Donor', phone='1234567891'
+        )
+        # 20:00 UTC on 1 March is 01:00 on 2 March in Asia/Karachi (UTC+5)
+        self.late = Donation.objects.create(donor=donor, amount=100, payment_method='jazzcash', transaction_id='late')
+        self.early = Donation.objects.create(donor=donor, amount=50, payment_method='jazzcash', transaction_id='early')
+        Donation.objects.filter(pk=self.late.pk).update(created_at=datetime(2024, 3, 1, 20, 0, tzinfo=dt_timezone.utc))
+        Donation.objects.filter(pk=self.early.pk).update(created_at=datetime(2024, 3, 1, 18, 59, tzinfo=dt_timezone.utc))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def ids(self, **params):
+        response = self.client.get('/api/donations/', params)
+        return sorted(row['id'] for row in response.data['results'])
+
+    def test_days_follow_platform_timezone(self):
+        self.assertEqual(self.ids(date_from='2024-03-02'), [self.late.pk])
+        self.assertEqual(self.ids(date_to='2024-03-01'), [self.early.pk])
+        self.assertEqual(self.ids(date_from='2024-03-01', date_to='2024-03-02'), sorted([self.late.pk, self.early.pk]))
+
+    def test_timezone_setting_change_applies(self):
+        # settings/0002 seeds the timezone row on migrated databases
+        with self.captureOnCommitCallbacks(execute=True):
+            Setting.objects.update_or_create(key='timezone', defaults={'value': 'UTC'})
+        self.assertEqual(self.ids(date_from='2024-03-02'), [])
+        self.assertEqual(self.ids(date_from='2024-03-01', date_to='2024-03-01'), sorted([self.late.pk, self.early.pk]))
+
+    def test_range_query_avoids_date_cast(self):
+        from donations.views.donation import DonationViewSet
+        view = DonationViewSet()
+        view.request = type('Request', (), {'query_params': {}})()
+        sql = str(view._apply_admin_filters(Donation.objects.all(), {'date_from': datetime(2024, 3, 2).date()}).query)
+        self.assertNotIn('django_datetime_cast_date', sql)
+        self.assertNotIn('::date', sql)
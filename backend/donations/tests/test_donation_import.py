@@ -0,0 +1,161 @@
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from appeals.models import Appeal
+from donations.models import Donation
+from donations.services.donation_import import DonationImportService
+from wallet.models import ActivityEvent, DailyPlatformMetrics
+
+User = get_user_model()
+
+HEADER = 'donor_email,donor_phone,amount,payment_method,transaction_id,appeal,note\n'
+
+
+class DonationImportTests(TestCase):
+    """Bulk CSV import: validation, donor matching, dedupe and the report."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.fatima = User.objects.create_user(
+            email='fatima@example.com', password='testpass123', role='donor', first_name='Fatima', last_name='Zahra', phone='03001234567'
+        )
+        self.hassan = User.objects.create_user(
+            email='hassan@example.org', password='testpass123', role='donor', first_name='Hassan', last_name='Ali', phone='03217654321'
+        )
+        recipient = User.objects.create_user(
+            email='recipient@example.com', password='testpass123', role='recipient', is_verified_syed=True,
+            first_name='Verified', last_name='Recipient', phone='1234567891'
+        )
+        self.approved = Appeal.objects.create(
+            title='Approved Appeal', description='Test', category='medical', amount_requested=1000,
+            created_by=recipient, beneficiary=recipient, status='approved', approved_by=self.admin
+        )
+        self.pending = Appeal.objects.create(
+            title='Pending Appeal', description='Test', category='school_fee', amount_requested=1000,
+            created_by=recipient, beneficiary=recipient, status='pending'
+        )
+        Donation.objects.create(donor=self.hassan, amount=500, payment_method='jazzcash', transaction_id='JC-OLD')
+        self.client = APIClient()
+
+    def run_import(self, body, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return DonationImportService.import_csv(io.StringIO(HEADER + body), **kwargs)
+
+    def test_inserts_and_matches_donors_by_email_or_phone(self):
+        report = self.run_import(
+            'FATIMA@example.com,,250,jazzcash,JC-1,,\n'
+            f',03217654321,1000,bank_transfer,BT-1,{self.approved.id},Zakat\n'
+        )
+        self.assertEqual(report['inserted_count'], 2)
+        first, second = (Donation.objects.get(pk=row['id']) for row in report['inserted'])
+        self.assertEqual((first.donor, first.amount, first.currency), (self.fatima, 250, 'PKR'))
+        self.assertEqual((second.donor, second.appeal, second.note), (self.hassan, self.approved, 'Zakat'))
+        self.assertEqual([row['line'] for row in report['inserted']], [2, 3])
+
+    def test_email_match_ignores_case_of_stored_address(self):
+        mixed = User.objects.create_user(
+            email='Zainab.Bibi@example.com', password='testpass123', role='donor', first_name='Zainab', last_name='Bibi', phone='03331234567'
+        )
+        report = self.run_import('zainab.bibi@EXAMPLE.com,,250,jazzcash,JC-1,,\n')
+        self.assertEqual(Donation.objects.get(pk=report['inserted'][0]['id']).donor, mixed)
+
+    def test_rows_recorded_concurrently_are_reported_as_duplicates(self):
+        def racing_drop_recorded(candidates, report):
+            # Another importer writes JC-RACE just after every check this one makes
+            if not Donation.objects.filter(transaction_id='JC-RACE').exists():
+                Donation.objects.create(donor=self.hassan, amount=500, payment_method='jazzcash', transaction_id='JC-RACE')
+            return candidates
+
+        with mock.patch.object(DonationImportService, '_drop_recorded', side_effect=racing_drop_recorded):
+            report = self.run_import('fatima@example.com,,250,jazzcash,JC-RACE,,\nfatima@example.com,,250,jazzcash,JC-NEW,,\n')
+        self.assertEqual([row['line'] for row in report['inserted']], [3])
+        self.assertEqual([(row['line'], row['reason']) for row in report['duplicates']], [(2, 'recorded concurrently')])
+        self.assertEqual(Donation.objects.get(transaction_id='JC-RACE').donor, self.hassan)
+        self.assertTrue(Donation.objects.filter(transaction_id='JC-NEW', donor=self.fatima).exists())
+
+    def test_rejects_rows_that_fail_serializer_rules(self):
+        report = self.run_import(
+            'fatima@example.com,,50,jazzcash,JC-1,,\n'
+            f'fatima@example.com,,500,jazzcash,JC-2,{self.pending.id},\n'
+            'nobody@example.com,,500,jazzcash,JC-3,,\n'
+            'fatima@example.com,,500,cheque,JC-4,,\n'
+            'fatima@example.com,,500,jazzcash,,,\n'
+        )
+        self.assertEqual(report['inserted_count'], 0)
+        errors = {row['line']: row['errors'] for row in report['rejected']}
+        self.assertIn('amount', errors[2])
+        self.assertEqual(str(errors[3]['appeal'][0]), 'Appeal must be approved to receive donations.')
+        self.assertIn('donor', errors[4])
+        self.assertIn('payment_method', errors[5])
+        self.assertIn('transaction_id', errors[6])
+        self.assertEqual(Donation.objects.count(), 1)
+
+    def test_duplicates_in_file_and_database(self):
+        report = self.run_import(
+            'fatima@example.com,,250,jazzcash,JC-OLD,,\n'
+            'fatima@example.com,,250,easypaisa,JC-OLD,,\n'
+            'fatima@example.com,,250,easypaisa,JC-OLD,,\n'
+        )
+        self.assertEqual(report['inserted_count'], 1)
+        self.assertEqual(
+            sorted((row['line'], row['reason']) for row in report['duplicates']),
+            [(2, 'already recorded'), (4, 'repeated in file')],
+        )
+        # Re-running the same file inserts nothing
+        again = self.run_import('fatima@example.com,,250,easypaisa,JC-OLD,,\n')
+        self.assertEqual((again['inserted_count'], again['duplicate_count']), (0, 1))
+
+    def test_batches_and_rollups(self):
+        rows = ''.join(f'fatima@example.com,,100,stripe,ST-{i},,\n' for i in range(25))
+        with self.assertNumQueries(24):
+            # Per batch: donors, recorded ids, then a savepoint around the insert, feed
+            # and rollup writes, and the snapshot flag once it commits
+            report = self.run_import(rows, batch_size=10)
+        self.assertEqual(report['inserted_count'], 25)
+        self.assertEqual(ActivityEvent.objects.filter(type='donation').count(), 26)
+        self.assertEqual(DailyPlatformMetrics.objects.get().donations_count, 26)
+
+    def test_dry_run_writes_nothing(self):
+        report = self.run_import('fatima@example.com,,250,jazzcash,JC-1,,\n', dry_run=True)
+        self.assertEqual(report['inserted'], [{'line': 2, 'id': None}])
+        self.assertEqual(Donation.objects.count(), 1)
+
+    def test_missing_columns(self):
+        with self.assertRaisesMessage(ValueError, 'transaction_id'):
+            DonationImportService.import_csv(io.StringIO('donor_email,amount,payment_method\n'))
+
+    def test_admin_endpoint(self):
+        upload = SimpleUploadedFile('donations.csv', (HEADER + 'fatima@example.com,,250,jazzcash,JC-1,,\n').encode())
+        self.client.force_authenticate(user=self.fatima)
+        response = self.client.post('/api/donations/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        upload.seek(0)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post('/api/donations/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['inserted_count'], 1)
+        self.assertTrue(Donation.objects.filter(transaction_id='JC-1').exists())
+
+    def test_command_writes_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source, report_path = os.path.join(tmp, 'in.csv'), os.path.join(tmp, 'report.csv')
+            with open(source, 'w') as handle:
+                handle.write(HEADER + 'fatima@example.com,,250,jazzcash,JC-1,,\nfatima@example.com,,10,jazzcash,JC-2,,\n')
+            out = io.StringIO()
+            call_command('import_donations', source, report=report_path, stdout=out)
+            self.assertIn('Inserted 1, duplicates 0, rejected 1', out.getvalue())
+            with open(report_path) as handle:
+                self.assertIn('3,rejected,amount', handle.read())
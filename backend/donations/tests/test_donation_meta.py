@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from donations.models import Donation
+
+User = get_user_model()
+
+
+class DonationListMetaTests(TestCase):
+    """The admin donation list computes its meta in one grouped, cached aggregate."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.donor = User.objects.create_user(
+            email='donor@example.com', password='testpass123', role='donor', first_name='Test', last_name='Donor', phone='1234567891'
+        )
+        for method, amount in [('stripe', 100), ('stripe', 50), ('jazzcash', 20), ('bank_transfer', 30), ('manual', 999)]:
+            Donation.objects.create(donor=self.donor, amount=amount, payment_method=method, transaction_id=f'{method}-{amount}')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_meta_covers_every_method(self):
+        response = self.client.get('/api/donations/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        meta = response.data['meta']
+        self.assertEqual(meta['total_amount'], 200.0)
+        self.assertEqual(meta['total_count'], 4)
+        self.assertEqual(meta['by_payment_method']['stripe'], {'amount': 150.0, 'count': 2})
+        self.assertEqual(meta['by_payment_method']['easypaisa'], {'amount': 0.0, 'count': 0})
+        self.assertNotIn('manual', meta['by_payment_method'])
+        self.assertEqual((meta['via_bank'], meta['via_jazzcash'], meta['via_stripe']), (30.0, 20.0, 150.0))
+        self.assertEqual(response.data['count'], 4)
+
+    def test_two_queries_then_one_when_cached(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/donations/')
+        self.assertTrue(response.data['count_is_exact'])
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/donations/')
+        self.assertEqual(len(response.data['results']), 4)
+        # A cached total may trail other processes' writes
+        self.assertEqual((response.data['count'], response.data['count_is_exact']), (4, False))
+        response = self.client.get('/api/donations/', {'count': 'exact'})
+        self.assertEqual((response.data['count'], response.data['count_is_exact']), (4, True))
+
+    @override_settings(DONATION_STATS_CACHE_TTL=0)
+    def test_write_in_another_process_is_seen_after_ttl(self):
+        self.client.get('/api/donations/')
+        # Another worker's write never bumps this process's version key
+        Donation.objects.create(donor=self.donor, amount=10, payment_method='stripe', transaction_id='stripe-10')
+        response = self.client.get('/api/donations/')
+        self.assertEqual(response.data['meta']['total_count'], 5)
+        self.assertEqual((response.data['count'], response.data['count_is_exact']), (5, True))
+
+    def test_cache_is_per_filter_set_and_bumped_by_writes(self):
+        response = self.client.get('/api/donations/', {'payment_method': 'stripe'})
+        self.assertEqual(response.data['meta']['total_count'], 2)
+        response = self.client.get('/api/donations/', {'payment_method': ' stripe ', 'appeal_linked': 'maybe'})
+        self.assertEqual(response.data['meta']['total_count'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            Donation.objects.create(donor=self.donor, amount=10, payment_method='stripe', transaction_id='stripe-10')
+        response = self.client.get('/api/donations/', {'payment_method': 'stripe'})
+        self.assertEqual(response.data['meta']['by_payment_method']['stripe'], {'amount': 160.0, 'count': 3})
+        self.assertEqual(response.data['count'], 3)
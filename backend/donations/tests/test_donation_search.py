@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from donations.models import Donation
+from wallet.services.user_search import rebuild_user_search
+
+User = get_user_model()
+
+
+class DonationSearchTests(TestCase):
+    """Admin donation search over donor name, email, phone and transaction id."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.fatima = User.objects.create_user(
+            email='fatima.z@example.com', password='testpass123', role='donor', first_name='Fatima', last_name='Zahra', phone='03001234567'
+        )
+        self.hassan = User.objects.create_user(
+            email='hassan@example.org', password='testpass123', role='donor', first_name='Hassan', last_name='Ali', phone='03217654321'
+        )
+        self.d1 = Donation.objects.create(donor=self.fatima, amount=100, payment_method='jazzcash', transaction_id='JC-2024-0001')
+        self.d2 = Donation.objects.create(donor=self.hassan, amount=50, payment_method='easypaisa', transaction_id='EP-9999')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def search(self, term):
+        response = self.client.get('/api/donations/', {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(row['id'] for row in response.data['results'])
+
+    def test_donor_fields(self):
+        self.assertEqual(self.search('zahra'), [self.d1.id])
+        self.assertEqual(self.search('Hassan Ali'), [self.d2.id])
+        self.assertEqual(self.search('example.org'), [self.d2.id])
+        self.assertEqual(self.search('7654321'), [self.d2.id])
+
+    def test_transaction_id_prefix(self):
+        self.assertEqual(self.search('JC-2024'), [self.d1.id])
+        self.assertEqual(self.search('EP-'), [self.d2.id])
+        # Prefix, not substring
+        self.assertEqual(self.search('2024-0001'), [])
+
+    def test_no_match(self):
+        self.assertEqual(self.search('nobody'), [])
+
+    def test_broad_term_matches_every_donor(self):
+        donors = User.objects.bulk_create([
+            User(email=f'donor{i}@bulk.example', role='donor', first_name='Bulk', last_name=f'Donor {i}', phone=f'0300{i:07d}')
+            for i in range(600)
+        ])
+        Donation.objects.bulk_create([
+            Donation(donor=donor, amount=10, payment_method='stripe', transaction_id=f'ST-{donor.pk}') for donor in donors
+        ])
+        rebuild_user_search()
+        response = self.client.get('/api/donations/', {'search': 'bulk.example', 'count': 'exact'})
+        self.assertEqual(response.data['count'], 600)
+        self.assertEqual(response.data['meta']['total_count'], 600)
@@ -0,0 +1,122 @@
+import json
+import time
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from donations.models import Donation, WebhookEvent
+from donations.services.webhook_inbox import WebhookInboxService
+
+User = get_user_model()
+
+SECRETS = {'stripe': 'whsec_test', 'jazzcash': 'jc_secret', 'easypaisa': ''}
+
+
+@override_settings(PAYMENT_WEBHOOK_SECRETS=SECRETS)
+class PaymentWebhookTests(TestCase):
+    """Webhook inbox: signed deliveries are stored, the worker creates donations once."""
+
+    def setUp(self):
+        cache.clear()
+        self.donor = User.objects.create_user(
+            email='fatima@example.com', password='testpass123', role='donor', first_name='Fatima', last_name='Zahra', phone='03001234567'
+        )
+        self.client = APIClient()
+
+    def jazzcash_event(self, event_id='evt-1', transaction_id='JC-1', amount='1500.00', **extra):
+        return {'event_id': event_id, 'type': 'payment.succeeded', 'transaction_id': transaction_id,
+                'amount': amount, 'currency': 'PKR', 'donor_email': self.donor.email, **extra}
+
+    def deliver(self, gateway, payload, secret=None, timestamp=None):
+        body = json.dumps(payload).encode()
+        signature = WebhookInboxService.sign(secret or SECRETS[gateway], body, timestamp)
+        header = 'HTTP_' + WebhookInboxService.signature_header(gateway).upper().replace('-', '_')
+        return self.client.post(
+            f'/api/donations/webhooks/{gateway}/', data=body, content_type='application/json', **{header: signature}
+        )
+
+    def process(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return WebhookInboxService.process_batch()
+
+    def test_endpoint_stores_event_without_creating_donation(self):
+        with self.assertNumQueries(1):
+            response = self.deliver('jazzcash', self.jazzcash_event())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.gateway, event.event_id, event.status), ('jazzcash', 'evt-1', 'pending'))
+        self.assertFalse(Donation.objects.exists())
+
+    def test_rejects_bad_or_stale_signatures(self):
+        self.assertEqual(self.deliver('jazzcash', self.jazzcash_event(), secret='wrong').status_code, 400)
+        stale = time.time() - 3600
+        self.assertEqual(self.deliver('jazzcash', self.jazzcash_event(), timestamp=stale).status_code, 400)
+        # A gateway without a configured secret has no endpoint
+        self.assertEqual(self.deliver('easypaisa', self.jazzcash_event(), secret='x').status_code, 404)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_redelivery_and_replays_create_one_donation(self):
+        self.deliver('jazzcash', self.jazzcash_event())
+        self.deliver('jazzcash', self.jazzcash_event())
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+        # A second event for the same payment (e.g. a gateway resend with a new id)
+        self.deliver('jazzcash', self.jazzcash_event(event_id='evt-2'))
+        events = self.process()
+        self.assertEqual(len(events), 2)
+        donation = Donation.objects.get()
+        self.assertEqual((donation.donor, donation.amount, donation.payment_method), (self.donor, 1500, 'jazzcash'))
+        self.assertEqual(
+            sorted(WebhookEvent.objects.values_list('status', 'donation_id')),
+            [('processed', donation.id), ('processed', donation.id)],
+        )
+        # Reprocessing after a crash is a no-op
+        WebhookEvent.objects.update(status='pending')
+        self.process()
+        self.assertEqual(Donation.objects.count(), 1)
+
+    def test_stripe_payload_and_ignored_events(self):
+        self.deliver('stripe', {
+            'id': 'evt_1', 'type': 'payment_intent.succeeded',
+            'data': {'object': {'id': 'pi_1', 'amount': 250050, 'currency': 'pkr', 'receipt_email': self.donor.email, 'metadata': {}}},
+        })
+        self.deliver('stripe', {'id': 'evt_2', 'type': 'customer.created', 'data': {'object': {}}})
+        self.process()
+        donation = Donation.objects.get()
+        self.assertEqual((donation.transaction_id, str(donation.amount), donation.currency), ('pi_1', '2500.50', 'PKR'))
+        self.assertEqual(WebhookEvent.objects.get(event_id='evt_2').status, 'ignored')
+
+    def test_stripe_charge_and_payment_intent_events_make_one_donation(self):
+        payment = {'amount': 150000, 'currency': 'pkr', 'receipt_email': self.donor.email, 'metadata': {}}
+        self.deliver('stripe', {
+            'id': 'evt_pi', 'type': 'payment_intent.succeeded', 'data': {'object': {'id': 'pi_9', **payment}},
+        })
+        self.deliver('stripe', {
+            'id': 'evt_ch', 'type': 'charge.succeeded',
+            'data': {'object': {'id': 'ch_9', 'payment_intent': 'pi_9', **payment}},
+        })
+        self.process()
+        donation = Donation.objects.get()
+        self.assertEqual(donation.transaction_id, 'pi_9')
+        self.assertEqual(
+            sorted(WebhookEvent.objects.values_list('status', 'donation_id')),
+            [('processed', donation.id), ('processed', donation.id)],
+        )
+
+    def test_invalid_payment_is_failed_with_errors(self):
+        self.deliver('jazzcash', self.jazzcash_event(amount='10'))
+        self.deliver('jazzcash', self.jazzcash_event(event_id='evt-2', transaction_id='JC-2', donor_email='nobody@example.com'))
+        self.process()
+        self.assertFalse(Donation.objects.exists())
+        errors = {event.event_id: json.loads(event.error) for event in WebhookEvent.objects.filter(status='failed')}
+        self.assertIn('amount', errors['evt-1'])
+        self.assertIn('donor', errors['evt-2'])
+
+    def test_worker_command(self):
+        self.deliver('jazzcash', self.jazzcash_event())
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('process_webhook_events', stdout=open('/dev/null', 'w'))
+        self.assertEqual(WebhookEvent.objects.get().status, 'processed')
+        self.assertEqual(Donation.objects.count(), 1)
@@ -0,0 +1,73 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from donations.models import Donation, SystemWallet, WalletTransaction
+from donations.services.wallet_service import WalletService, InsufficientSystemBalance
+
+User = get_user_model()
+
+
+@override_settings(SYSTEM_WALLET_SHARDS=4)
+class ShardedSystemWalletTests(TestCase):
+    """System wallet balance spread over shard rows."""
+
+    def setUp(self):
+        self.donor = User.objects.create_user(
+            email='donor@example.com', password='testpass123', role='donor', first_name='Test', last_name='Donor', phone='1234567890'
+        )
+
+    def shards(self):
+        return dict(SystemWallet.objects.values_list('shard', 'total_balance'))
+
+    def test_credits_spread_over_shards_and_sum(self):
+        for _ in range(40):
+            WalletService.add_to_system_wallet(Decimal('10.00'))
+        self.assertEqual(WalletService.get_balance(), Decimal('400.00'))
+        self.assertTrue(set(self.shards()) <= {0, 1, 2, 3})
+        self.assertGreater(len(self.shards()), 1)
+        self.assertEqual(WalletTransaction.objects.filter(type='credit').count(), 40)
+
+    def test_donation_credit_is_one_update_on_its_hashed_shard(self):
+        donation = Donation.objects.create(donor=self.donor, amount=500)
+        WalletService.add_to_system_wallet(Decimal('1.00'), related_donation=donation)
+        with self.assertNumQueries(5):
+            # Savepoint, shard UPDATE, ledger INSERT, release, balance SUM
+            balance = WalletService.add_to_system_wallet(Decimal('500.00'), related_donation=donation)
+        self.assertEqual(balance, Decimal('501.00'))
+        self.assertEqual(self.shards(), {donation.pk % 4: Decimal('501.00')})
+
+    def test_withdraw_drains_shards_and_checks_total(self):
+        SystemWallet.objects.bulk_create([
+            SystemWallet(shard=0, total_balance=Decimal('30.00')),
+            SystemWallet(shard=1, total_balance=Decimal('50.00')),
+            SystemWallet(shard=2, total_balance=Decimal('20.00')),
+        ])
+        self.assertEqual(WalletService.withdraw_from_system_wallet(Decimal('70.00')), Decimal('30.00'))
+        self.assertEqual(self.shards(), {0: Decimal('10.00'), 1: Decimal('0.00'), 2: Decimal('20.00')})
+        with self.assertRaises(InsufficientSystemBalance):
+            WalletService.withdraw_from_system_wallet(Decimal('30.01'))
+        self.assertEqual(WalletService.get_balance(), Decimal('30.00'))
+        self.assertEqual(WalletTransaction.objects.filter(type='debit').count(), 1)
+
+    def test_compaction_folds_shards_into_one(self):
+        SystemWallet.objects.bulk_create([
+            SystemWallet(shard=1, total_balance=Decimal('30.00')),
+            SystemWallet(shard=3, total_balance=Decimal('50.00')),
+            # Left over from a larger shard count
+            SystemWallet(shard=9, total_balance=Decimal('20.00')),
+        ])
+        self.assertEqual(WalletService.compact_system_wallet(), Decimal('100.00'))
+        self.assertEqual(self.shards(), {0: Decimal('100.00'), 1: Decimal('0.00'), 3: Decimal('0.00')})
+
+    def test_compact_command_after_lowering_shard_count(self):
+        SystemWallet.objects.bulk_create([
+            SystemWallet(shard=0, total_balance=Decimal('10.00')),
+            SystemWallet(shard=6, total_balance=Decimal('15.00')),
+        ])
+        out = StringIO()
+        call_command('compact_system_wallet', stdout=out)
+        self.assertEqual(self.shards(), {0: Decimal('25.00')})
+        self.assertIn('balance 25.00 over 4 shards', out.getvalue())
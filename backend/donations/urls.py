@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from donations.views import DonationViewSet
+from donations.views import DonationViewSet, PaymentWebhookView
 
 app_name = 'donations'
 
@@ -8,5 +8,6 @@ router = DefaultRouter()
 router.register(r'donations', DonationViewSet, basename='donation')
 
 urlpatterns = [
+    path('donations/webhooks/<str:gateway>/', PaymentWebhookView.as_view(), name='payment-webhook'),
     path('', include(router.urls)),
 ] 
\ No newline at end of file
@@ -1 +1,2 @@
 from .donation import DonationViewSet
+from .webhook import PaymentWebhookView
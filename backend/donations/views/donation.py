@@ -1,12 +1,19 @@
+import io
+
 from rest_framework import viewsets, mixins, status
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from django.db.models import Sum, Q
+from django.db.models import Q
 from django.utils import timezone
 from datetime import datetime
 from donations.models import Donation
 from donations.serializers.donation import DonationSerializer
-from donations.permissions.donation_permissions import IsDonorOrAdmin, IsOwner
+from donations.services.donation_stats import DonationStatsService
+from donations.services.donation_import import DonationImportService
+from settings.utils import local_day_range
+from wallet.services.user_search import matching_user_ids, prefix_q
+from donations.permissions.donation_permissions import IsDonorOrAdmin, IsOwner, IsAdmin
 
 class DonationViewSet(mixins.CreateModelMixin,
                       mixins.ListModelMixin,
@@ -28,49 +35,75 @@ class DonationViewSet(mixins.CreateModelMixin,
         
         # Admin can see all donations with filtering
         if user.is_superuser or getattr(user, 'role', None) == 'admin':
-            # Apply filters
-            search = self.request.query_params.get('search', '')
-            payment_method = self.request.query_params.get('payment_method', '')
-            appeal_linked = self.request.query_params.get('appeal_linked', '')
-            date_from = self.request.query_params.get('date_from', '')
-            date_to = self.request.query_params.get('date_to', '')
-            
-            if search:
-                queryset = queryset.filter(
-                    Q(donor__name__icontains=search) |
-                    Q(transaction_id__icontains=search)
-                )
-            
-            if payment_method:
-                queryset = queryset.filter(payment_method=payment_method)
-            
-            if appeal_linked == 'true':
-                queryset = queryset.filter(appeal__isnull=False)
-            elif appeal_linked == 'false':
-                queryset = queryset.filter(appeal__isnull=True)
-            
-            if date_from:
-                try:
-                    date_from_obj = datetime.strptime(str(date_from), '%Y-%m-%d').date()
-                    queryset = queryset.filter(created_at__date__gte=date_from_obj)
-                except ValueError:
-                    pass
-            
-            if date_to:
-                try:
-                    date_to_obj = datetime.strptime(str(date_to), '%Y-%m-%d').date()
-                    queryset = queryset.filter(created_at__date__lte=date_to_obj)
-                except ValueError:
-                    pass
-            
-            return queryset
+            return self._apply_admin_filters(queryset, self._admin_filters())
         else:
             # Non-admin users can only see their own donations
             return queryset.filter(donor=user)
 
+    def _admin_filters(self):
+        """The admin list's query parameters, normalized (blank or invalid values dropped)."""
+        params = self.request.query_params
+        filters = {}
+        search = params.get('search', '').strip()
+        if search:
+            filters['search'] = search
+        payment_method = params.get('payment_method', '').strip()
+        if payment_method:
+            filters['payment_method'] = payment_method
+        appeal_linked = params.get('appeal_linked', '')
+        if appeal_linked in ('true', 'false'):
+            filters['appeal_linked'] = appeal_linked == 'true'
+        for key in ('date_from', 'date_to'):
+            value = params.get(key, '')
+            if value:
+                try:
+                    filters[key] = datetime.strptime(str(value), '%Y-%m-%d').date()
+                except ValueError:
+                    pass
+        return filters
+
+    def _apply_admin_filters(self, queryset, filters):
+        if 'search' in filters:
+            # Donor name/email/phone through the user search index, transaction ids by B-tree prefix
+            queryset = queryset.filter(
+                Q(donor_id__in=matching_user_ids(filters['search'])) |
+                prefix_q('transaction_id', filters['search'])
+            )
+        if 'payment_method' in filters:
+            queryset = queryset.filter(payment_method=filters['payment_method'])
+        if 'appeal_linked' in filters:
+            queryset = queryset.filter(appeal__isnull=not filters['appeal_linked'])
+        # Half-open range on platform-local days, so the created_at indexes apply
+        start, end = local_day_range(filters.get('date_from'), filters.get('date_to'))
+        if start is not None:
+            queryset = queryset.filter(created_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(created_at__lt=end)
+        return queryset
+
     def get_permissions(self):
+        if self.action == 'import_csv':
+            return [IsAdmin()]
         return [AllowAny()]
 
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_csv(self, request):
+        """
+        Bulk import donations from an uploaded CSV (multipart field `file`);
+        ?dry_run=1 validates without writing. Returns the import report.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"detail": "Upload a CSV file in the 'file' field"}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        try:
+            report = DonationImportService.import_csv(
+                io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''), dry_run=dry_run
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({**report, 'dry_run': dry_run})
+
     def perform_create(self, serializer):
         if not self.request.user.is_authenticated:
             return Response({"detail": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
@@ -88,11 +121,11 @@ class DonationViewSet(mixins.CreateModelMixin,
         
         queryset = self.get_queryset()
         
-        # Calculate meta stats for admin, excluding manual donations
-        total_amount = queryset.aggregate(total=Sum('amount'))['total'] or 0
-        via_bank = queryset.filter(payment_method='bank_transfer').aggregate(total=Sum('amount'))['total'] or 0
-        via_jazzcash = queryset.filter(payment_method='jazzcash').aggregate(total=Sum('amount'))['total'] or 0
-        via_easypaisa = queryset.filter(payment_method='easypaisa').aggregate(total=Sum('amount'))['total'] or 0
+        # One grouped aggregate (cached per filter set) gives the meta and the total count;
+        # a cached count may trail writes from other processes, so it is not reported as exact
+        meta, cached = DonationStatsService.get_meta(queryset, self._admin_filters())
+        if hasattr(self.paginator, 'set_known_count'):
+            self.paginator.set_known_count(meta['total_count'], exact=not cached)
         
         # Apply pagination
         page = self.paginate_queryset(queryset)
@@ -101,21 +134,11 @@ class DonationViewSet(mixins.CreateModelMixin,
         # If paginated, get the paginated response and inject meta
         if page is not None:
             response_data = self.get_paginated_response(serializer.data)
-            response_data.data['meta'] = {
-                'total_amount': float(total_amount),
-                'via_bank': float(via_bank),
-                'via_jazzcash': float(via_jazzcash),
-                'via_easypaisa': float(via_easypaisa),
-            }
+            response_data.data['meta'] = meta
             return response_data
         # If not paginated (e.g. page=all), return meta in the response
         return Response({
-            'count': queryset.count(),
+            'count': meta['total_count'],
             'results': serializer.data,
-            'meta': {
-                'total_amount': float(total_amount),
-                'via_bank': float(via_bank),
-                'via_jazzcash': float(via_jazzcash),
-                'via_easypaisa': float(via_easypaisa),
-            }
+            'meta': meta,
         })
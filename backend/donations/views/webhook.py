@@ -0,0 +1,26 @@
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from donations.services.webhook_inbox import WebhookInboxService, WebhookRejected
+
+
+class PaymentWebhookView(APIView):
+    """
+    Gateway webhook receiver: verify, store in the inbox, answer at once.
+    Donations are created by the process_webhook_events worker.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request, gateway):
+        if gateway not in WebhookInboxService.GATEWAYS or not WebhookInboxService.secret(gateway):
+            return Response({"detail": "Unknown gateway"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            WebhookInboxService.receive(
+                gateway, request.body, request.headers.get(WebhookInboxService.signature_header(gateway))
+            )
+        except WebhookRejected as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"received": True})
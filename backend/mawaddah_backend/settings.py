@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 from decouple import config
 import dj_database_url
+from corsheaders.defaults import default_headers
 
 # --- Core Paths and Debug Configuration ---
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -137,6 +138,65 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# --- Cache ---
+# Per-process memory by default. Cached settings, wallet overview and donation
+# stats are invalidated by the process that writes, so deployments with several
+# worker processes should point this at a shared backend, e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache with a redis://
+# CACHE_LOCATION (needs the redis package), or
+# django.core.cache.backends.db.DatabaseCache with a table name after
+# `manage.py createcachetable`. The TTLs below bound staleness either way.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# --- Wallet overview ---
+# Seconds the cached platform wallet overview is served before recomputing.
+WALLET_OVERVIEW_CACHE_TTL = config('WALLET_OVERVIEW_CACHE_TTL', default=30, cast=int)
+
+# --- Donation list meta ---
+# Seconds the admin donation list's per-filter totals are cached.
+DONATION_STATS_CACHE_TTL = config('DONATION_STATS_CACHE_TTL', default=30, cast=int)
+
+# --- Dashboard Snapshots ---
+# Seconds before a dashboard snapshot is rebuilt regardless of writes, and the
+# minimum age before a snapshot marked dirty by a write is rebuilt.
+DASHBOARD_SNAPSHOT_MAX_AGE = config('DASHBOARD_SNAPSHOT_MAX_AGE', default=60, cast=int)
+DASHBOARD_SNAPSHOT_MIN_AGE = config('DASHBOARD_SNAPSHOT_MIN_AGE', default=5, cast=int)
+# Rebuild stale snapshots in a background thread instead of inside the request.
+DASHBOARD_SNAPSHOT_ASYNC_REFRESH = config('DASHBOARD_SNAPSHOT_ASYNC_REFRESH', default=True, cast=bool)
+
+# --- List pagination counts ---
+# Lists at least this large report an estimated count (planner estimate on
+# Postgres, otherwise a cached exact count) instead of running COUNT(*) per page.
+PAGINATION_ESTIMATE_THRESHOLD = config('PAGINATION_ESTIMATE_THRESHOLD', default=10000, cast=int)
+PAGINATION_COUNT_CACHE_TTL = config('PAGINATION_COUNT_CACHE_TTL', default=300, cast=int)
+
+# --- Platform settings ---
+# Seconds a settings.Setting value stays cached. Changes drop the entry in the
+# process that made them; other processes pick them up within this window.
+SETTINGS_CACHE_TTL = config('SETTINGS_CACHE_TTL', default=60, cast=int)
+
+# --- System wallet ---
+# Number of rows the system wallet balance is spread over; more shards let more
+# donations credit it concurrently. After lowering it, run
+# `manage.py compact_system_wallet` (safe to schedule) to fold shards beyond the
+# count back into shard 0.
+SYSTEM_WALLET_SHARDS = config('SYSTEM_WALLET_SHARDS', default=8, cast=int)
+
+# --- Payment webhooks ---
+# Per-gateway signing secrets; a gateway without a secret has no webhook endpoint.
+# Signatures older than the tolerance (seconds) are rejected to stop replays.
+PAYMENT_WEBHOOK_SECRETS = {
+    'stripe': config('STRIPE_WEBHOOK_SECRET', default=''),
+    'jazzcash': config('JAZZCASH_WEBHOOK_SECRET', default=''),
+    'easypaisa': config('EASYPAISA_WEBHOOK_SECRET', default=''),
+}
+PAYMENT_WEBHOOK_TOLERANCE = config('PAYMENT_WEBHOOK_TOLERANCE', default=300, cast=int)
+
 # --- CORS and CSRF Settings ---
 CORS_ALLOWED_ORIGINS = [
     "https://mawaddahapp.vercel.app",
@@ -145,6 +205,8 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:5173",
 ]
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed"]
 
 CSRF_TRUSTED_ORIGINS = [
     "https://mawaddahapp.vercel.app",
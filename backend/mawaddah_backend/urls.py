@@ -67,6 +67,7 @@ urlpatterns = [
     path('api/wallet/stats/', WalletStatsView.as_view(), name='wallet-stats'),
     path('api/dashboard/stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
     path('api/dashboard/recent-activity/', RecentActivityView.as_view(), name='recent-activity'),
+    path('api/dashboard/shura-summary/', ShuraSummaryView.as_view(), name='shura-summary'),
 
     # API docs
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Setting
+from .utils import forget_setting
+
+
+@receiver(post_save, sender=Setting)
+@receiver(post_delete, sender=Setting)
+def drop_cached_setting(sender, instance, **kwargs):
+    # After commit, so a concurrent read can't re-cache the old row
+    transaction.on_commit(lambda: forget_setting(instance.key))
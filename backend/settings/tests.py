@@ -1,3 +1,28 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from .models import Setting
+from .utils import get_setting, _cache_key
+
+
+class GetSettingCacheTests(TestCase):
+    """Cached setting values are dropped once a change commits, and expire."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_change_is_seen_after_commit(self):
+        Setting.objects.update_or_create(key='timezone', defaults={'value': 'Asia/Karachi'})
+        self.assertEqual(get_setting('timezone'), 'Asia/Karachi')
+        with self.captureOnCommitCallbacks() as callbacks:
+            Setting.objects.update_or_create(key='timezone', defaults={'value': 'UTC'})
+            # Not yet committed: the cached value is left alone
+            self.assertEqual(get_setting('timezone'), 'Asia/Karachi')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_setting('timezone'), 'UTC')
+
+    @override_settings(SETTINGS_CACHE_TTL=0)
+    def test_entries_expire(self):
+        get_setting('timezone')
+        self.assertIsNone(cache.get(_cache_key('timezone')))
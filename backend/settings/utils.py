@@ -0,0 +1,64 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Setting
+from .serializers import SETTINGS_SCHEMA
+
+CACHE_PREFIX = 'settings:value'
+_MISSING = object()
+
+
+def _cache_key(key):
+    return f'{CACHE_PREFIX}:{key}'
+
+
+def get_setting(key):
+    """
+    A platform setting's stored value, or its SETTINGS_SCHEMA default. Cached
+    for SETTINGS_CACHE_TTL seconds; a change made in this process drops the
+    entry once it commits, other processes see it when their copy expires.
+    """
+    value = cache.get(_cache_key(key), _MISSING)
+    if value is _MISSING:
+        value = Setting.objects.filter(key=key).values_list('value', flat=True).first()
+        if value is None:
+            value = SETTINGS_SCHEMA.get(key, {}).get('default')
+        cache.set(_cache_key(key), value, settings.SETTINGS_CACHE_TTL)
+    return value
+
+
+def forget_setting(key):
+    cache.delete(_cache_key(key))
+
+
+def platform_timezone():
+    """The zone named by the `timezone` setting; the schema default when it is not a valid zone."""
+    try:
+        return ZoneInfo(get_setting('timezone'))
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        return ZoneInfo(SETTINGS_SCHEMA['timezone']['default'])
+
+
+def local_date(value=None):
+    """The platform-local date of an aware datetime (default: now)."""
+    return timezone.localdate(value, platform_timezone())
+
+
+def local_midnight(day):
+    """Aware start of `day` in the platform timezone."""
+    return datetime.combine(day, time.min, tzinfo=platform_timezone())
+
+
+def local_day_range(start=None, end=None):
+    """
+    Aware datetimes (gte, lt) covering platform-local days start..end
+    inclusive, as a half-open range so an index on the timestamp column is
+    usable. Either bound may be None.
+    """
+    lower = local_midnight(start) if start is not None else None
+    upper = local_midnight(end + timedelta(days=1)) if end is not None else None
+    return lower, upper
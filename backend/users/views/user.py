@@ -4,6 +4,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
+from core.pagination import EstimatedCountPaginationMixin
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.views import APIView
 from django.utils import timezone
@@ -20,7 +21,7 @@ from django.core.mail import send_mail
 import random
 
 
-class CustomPageNumberPagination(PageNumberPagination):
+class CustomPageNumberPagination(EstimatedCountPaginationMixin, PageNumberPagination):
     """
     Custom pagination class that properly handles page_size parameter.
     """
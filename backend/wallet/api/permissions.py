@@ -7,4 +7,8 @@ class IsRecipient(BasePermission):
 
 class IsAdminOrShuraUser(BasePermission):
     def has_permission(self, request, view):
-        return request.user and request.user.is_authenticated and (is_admin(request.user) or is_shura(request.user)) 
\ No newline at end of file
+        return request.user and request.user.is_authenticated and (is_admin(request.user) or is_shura(request.user)) 
+
+class IsAdminUserRole(BasePermission):
+    def has_permission(self, request, view):
+        return request.user and request.user.is_authenticated and is_admin(request.user)
@@ -1,7 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
-from rest_framework.pagination import PageNumberPagination
+from core.pagination import TimestampCursorPagination
 from wallet.models import Wallet, WalletTransaction
 from wallet.api.serializers.wallet_serializer import WalletSerializer
 from wallet.api.serializers.transaction_serializer import WalletTransactionSerializer
@@ -20,13 +20,13 @@ class WalletView(APIView):
 class WalletTransactionListView(generics.ListAPIView):
     permission_classes = [IsRecipient]
     serializer_class = WalletTransactionSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = TimestampCursorPagination
 
     def get_queryset(self):
         wallet = getattr(self.request.user, 'wallet', None)
         if not wallet:
             return WalletTransaction.objects.none()
-        return wallet.transactions.all().order_by('-timestamp')
+        return wallet.transactions.all().order_by('-timestamp', '-id')
 
 class WalletWithdrawView(APIView):
     permission_classes = [IsRecipient]
@@ -2,4 +2,10 @@ from django.apps import AppConfig
 
 class WalletConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'wallet' 
\ No newline at end of file
+    name = 'wallet'
+
+    def ready(self):
+        import wallet.signals.metrics_signals
+        import wallet.signals.activity_signals
+        import wallet.signals.snapshot_signals
+        import wallet.signals.search_signals
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from wallet.services.activity_feed import rebuild_activity_events
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the ActivityEvent feed from donations, appeals, users and debit wallet transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding activity feed...')
+        written = rebuild_activity_events(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} activity events.'))
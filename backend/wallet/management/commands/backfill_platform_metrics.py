@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from wallet.services.platform_metrics import rebuild_daily_metrics
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the DailyPlatformMetrics rollup from donations, users, appeals and the wallet ledger'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding daily platform metrics...')
+        rows = rebuild_daily_metrics()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {rows} daily rollup rows.'))
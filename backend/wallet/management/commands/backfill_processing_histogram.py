@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from wallet.services.appeal_processing import rebuild_processing_histogram
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the appeal processing-time histogram from approved_at/rejected_at timestamps'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding appeal processing histogram...')
+        rows = rebuild_processing_histogram()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {rows} histogram rows.'))
@@ -0,0 +1,96 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction, OperationalError
+
+from users.models import User
+from wallet.models import Wallet
+from wallet.services import wallet_service
+
+
+def _locked_credit_debit(user, amount):
+    """The previous read-modify-write path: lock the row, change it in Python, save."""
+    for tx_type in ('credit', 'debit'):
+        with transaction.atomic():
+            wallet = Wallet.objects.select_for_update().get(user=user)
+            if tx_type == 'credit':
+                wallet.balance += amount
+                wallet.total_credited += amount
+            else:
+                wallet.balance -= amount
+                wallet.total_debited += amount
+            wallet.tx_count += 1
+            wallet.save()
+
+
+def _atomic_credit_debit(user, amount):
+    with transaction.atomic():
+        wallet_service._apply_delta(user, 'credit', amount)
+    with transaction.atomic():
+        wallet_service._apply_delta(user, 'debit', amount, require_funds=True)
+
+
+MODES = {
+    'atomic': _atomic_credit_debit,
+    'locked': _locked_credit_debit,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Hammer one wallet from many threads and report balance-update throughput for the '
+        'conditional-UPDATE path versus select_for_update + save. Writes to a throwaway '
+        'benchmark user that is deleted afterwards; run it against a scratch database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--iterations', type=int, default=200, help='Credit/debit pairs per thread')
+        parser.add_argument('--mode', choices=['atomic', 'locked', 'both'], default='both')
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(
+            email='wallet-benchmark@example.invalid', password=None, role='donor',
+            first_name='Wallet', last_name='Benchmark', phone='+0000000000',
+        )
+        wallet_service.create_wallet_for_user(user)
+        try:
+            modes = list(MODES) if options['mode'] == 'both' else [options['mode']]
+            for mode in modes:
+                self._run(mode, user, options['threads'], options['iterations'])
+        finally:
+            user.delete()
+
+    def _run(self, mode, user, threads, iterations):
+        worker = MODES[mode]
+        amount = Decimal('1.00')
+        errors = []
+
+        def run():
+            try:
+                for _ in range(iterations):
+                    try:
+                        worker(user, amount)
+                    except OperationalError as e:
+                        errors.append(e)
+            finally:
+                connection.close()
+
+        pool = [threading.Thread(target=run) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        wallet = Wallet.objects.get(user=user)
+        pairs = threads * iterations - len(errors)
+        self.stdout.write(
+            f'{mode:>6}: {pairs} credit/debit pairs in {elapsed:.2f}s '
+            f'({pairs * 2 / elapsed:.0f} updates/s, {len(errors)} failed pairs), '
+            f'final balance {wallet.balance} (expected 0.00), tx_count {wallet.tx_count}'
+        )
+        Wallet.objects.filter(pk=wallet.pk).update(balance=0, total_credited=0, total_debited=0, tx_count=0)
@@ -0,0 +1,17 @@
+from datetime import date
+from django.core.management.base import BaseCommand
+from wallet.services.balance_checkpoints import create_checkpoints, local_midnight, pending_checkpoint_days
+
+
+class Command(BaseCommand):
+    help = 'Write midnight wallet balance checkpoints for every day since the last run (schedule daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, help='Checkpoint only the start of this day (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        days = [options['date']] if options['date'] else pending_checkpoint_days()
+        for day in days:
+            written = create_checkpoints(local_midnight(day))
+            self.stdout.write(f'{day}: {written} wallet checkpoints')
+        self.stdout.write(self.style.SUCCESS('Done.'))
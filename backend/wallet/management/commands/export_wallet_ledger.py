@@ -0,0 +1,35 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from wallet.services.ledger_export import FORMATS, DEFAULT_CHUNK_SIZE, iter_export
+
+
+class Command(BaseCommand):
+    help = 'Stream the wallet ledger (with user and appeal fields) to a CSV or NDJSON file, optionally gzipped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', dest='fmt', choices=FORMATS, default='csv')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output on the fly')
+        parser.add_argument('--start', type=date.fromisoformat, help='First day to include (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day to include (YYYY-MM-DD)')
+        parser.add_argument('--type', dest='tx_type', choices=('credit', 'debit'))
+        parser.add_argument('--user', dest='user_id', type=int, help='Only this user\'s wallet')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['gzip'] and not options['output']:
+            raise CommandError('--gzip needs --output')
+        chunks = iter_export(
+            options['fmt'], compress=options['gzip'], chunk_size=options['chunk_size'],
+            start=options['start'], end=options['end'], tx_type=options['tx_type'], user_id=options['user_id'],
+        )
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        mode = 'wb' if options['gzip'] else 'w'
+        with open(options['output'], mode, **({} if options['gzip'] else {'newline': '', 'encoding': 'utf-8'})) as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
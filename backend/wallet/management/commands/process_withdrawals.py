@@ -0,0 +1,57 @@
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, OperationalError
+from wallet.services.withdrawal_queue import DEFAULT_BATCH_SIZE, process_batch, release_stale_claims
+
+
+class Command(BaseCommand):
+    help = 'Settle queued withdrawal requests; run with --loop (and several processes or --workers) in production'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new requests')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--workers', type=int, default=1, help='Worker threads in this process')
+
+    def handle(self, *args, **options):
+        released = release_stale_claims()
+        if released:
+            self.stdout.write(f'Re-queued {released} stale requests.')
+        if options['workers'] == 1:
+            self._work(options)
+            return
+        threads = [threading.Thread(target=self._work, args=(options,), daemon=True) for _ in range(options['workers'])]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('Stopping after current batches...'))
+
+    def _work(self, options):
+        name = threading.current_thread().name
+        try:
+            while True:
+                try:
+                    processed = process_batch(options['batch_size'])
+                except OperationalError as e:
+                    # Lock timeouts and dropped connections: back off and try again
+                    self.stderr.write(f'[{name}] {e}; retrying')
+                    connection.close()
+                    time.sleep(options['interval'])
+                    continue
+                for request in processed:
+                    self.stdout.write(f'[{name}] withdrawal {request.id}: {request.status} {request.error}'.rstrip())
+                if not options['loop']:
+                    if not processed:
+                        return
+                    continue
+                if not processed:
+                    time.sleep(options['interval'])
+                    release_stale_claims()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from wallet.services.user_search import rebuild_user_search, search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rewrite the normalized user search documents (after bulk user edits that bypass post_save)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Rebuilding user search documents ({search_backend()} backend)...')
+        written = rebuild_user_search(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} search documents.'))
@@ -0,0 +1,92 @@
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Max, Min
+
+from wallet.models import Wallet
+from wallet.services.wallet_totals import DEFAULT_CHUNK_SIZE, reconcile_range
+
+REPORT_FIELDS = ['wallet_id', 'user_id', 'field', 'stored', 'expected']
+
+
+def _init_worker():
+    import django
+    django.setup()
+    # Forked children must not reuse the parent's database connections
+    connections.close_all()
+
+
+def _reconcile(args):
+    start_id, end_id, chunk_size, fix = args
+    return reconcile_range(start_id, end_id, chunk_size=chunk_size, fix=fix)
+
+
+def split_id_range(low, high, parts):
+    """Split [low, high] into at most `parts` contiguous inclusive ranges."""
+    span = high - low + 1
+    step = max(1, -(-span // parts))
+    return [(start, min(start + step - 1, high)) for start in range(low, high + 1, step)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Check Wallet.balance, running totals and the legacy User.wallet_balance against the '
+        'WalletTransaction ledger, streaming wallets in id chunks across a process pool'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                            help='Worker processes; 1 runs in this process')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Wallets per keyset chunk')
+        parser.add_argument('--report', help='Write discrepancies as CSV to this path (default: stdout)')
+        parser.add_argument('--fix', action='store_true', help='Reset drifted wallets to the ledger')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        bounds = Wallet.objects.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            self.stdout.write(self.style.SUCCESS('No wallets to reconcile.'))
+            return
+
+        workers = max(1, options['workers'])
+        # More ranges than workers so a dense id range does not leave the others idle
+        ranges = split_id_range(bounds['low'], bounds['high'], workers * 4)
+        tasks = [(start, end, options['chunk_size'], options['fix']) for start, end in ranges]
+        if workers == 1:
+            results = map(_reconcile, tasks)
+        else:
+            connections.close_all()
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            results = pool.map(_reconcile, tasks)
+
+        report = open(options['report'], 'w', newline='') if options['report'] else sys.stdout
+        try:
+            writer = csv.DictWriter(report, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            checked = drifted = 0
+            wallets = set()
+            for range_checked, rows in results:
+                checked += range_checked
+                drifted += len(rows)
+                wallets.update(row['wallet_id'] for row in rows)
+                writer.writerows(rows)
+        finally:
+            if report is not sys.stdout:
+                report.close()
+            if workers > 1:
+                pool.shutdown()
+
+        elapsed = time.monotonic() - started
+        summary = (
+            f'Checked {checked} wallets in {elapsed:.1f}s with {workers} worker(s): '
+            f'{drifted} discrepancies across {len(wallets)} wallets'
+        )
+        if options['fix'] and wallets:
+            summary += ' (fixed)'
+        style = self.style.SUCCESS if not wallets else self.style.WARNING
+        self.stderr.write(style(summary))
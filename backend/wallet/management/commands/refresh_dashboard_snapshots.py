@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from wallet.services.dashboard_snapshots import refresh_all
+
+
+class Command(BaseCommand):
+    help = 'Rebuild dashboard snapshots once, or keep them fresh with --loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and rebuild snapshots as they come due')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between checks when looping')
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            refreshed = refresh_all()
+            self.stdout.write(self.style.SUCCESS(f'Refreshed snapshots for periods: {refreshed}'))
+            return
+
+        self.stdout.write(f"Refreshing dashboard snapshots every {options['interval']}s (Ctrl+C to stop)...")
+        try:
+            while True:
+                refreshed = refresh_all(only_due=True)
+                if refreshed:
+                    self.stdout.write(f'Refreshed periods: {refreshed}')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('Stopped.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from wallet.services.wallet_totals import find_total_mismatches, repair_totals
+
+
+class Command(BaseCommand):
+    help = 'Check Wallet running totals (total_credited, total_debited, tx_count) against the transaction ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true', help='Overwrite drifted totals with the ledger values')
+
+    def handle(self, *args, **options):
+        mismatches = find_total_mismatches()
+        for item in mismatches:
+            self.stdout.write(
+                f"Wallet {item['wallet_id']} (user {item['user_id']}): "
+                f"stored {item['stored']} != ledger {item['expected']}"
+            )
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS('All wallet totals match the ledger.'))
+            return
+        if options['repair']:
+            fixed = repair_totals(mismatches)
+            self.stdout.write(self.style.SUCCESS(f'Repaired {fixed} wallets.'))
+        else:
+            self.stdout.write(self.style.WARNING(f'{len(mismatches)} wallets drifted; rerun with --repair to fix.'))
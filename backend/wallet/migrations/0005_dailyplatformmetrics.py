@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:46
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0004_wallettransaction_transfer_by'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPlatformMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('donations_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('donations_count', models.PositiveIntegerField(default=0)),
+                ('new_users', models.PositiveIntegerField(default=0)),
+                ('wallet_balance_delta', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('total_users', models.PositiveIntegerField(default=0)),
+                ('active_appeals', models.IntegerField(default=0)),
+                ('wallet_balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+    ]
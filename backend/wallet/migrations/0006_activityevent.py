@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:47
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0005_dailyplatformmetrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('donation', 'Donation'), ('appeal', 'Appeal'), ('user', 'User'), ('withdrawal', 'Withdrawal')], max_length=16)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(max_length=128)),
+                ('message', models.CharField(max_length=255)),
+                ('actor_name', models.CharField(max_length=255)),
+                ('amount', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-timestamp', '-id'],
+                'indexes': [models.Index(fields=['-timestamp', '-id'], name='wallet_acti_timesta_e1cf70_idx')],
+            },
+        ),
+    ]
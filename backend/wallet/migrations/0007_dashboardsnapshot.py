@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:48
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0006_activityevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.PositiveSmallIntegerField(unique=True)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('computed_at', models.DateTimeField()),
+                ('dirty', models.BooleanField(default=False)),
+                ('refresh_claimed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
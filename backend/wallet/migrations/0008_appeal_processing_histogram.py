@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0007_dashboardsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppealProcessingHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month the decision was made')),
+                ('outcome', models.CharField(choices=[('approved', 'Approved'), ('rejected', 'Rejected')], max_length=16)),
+                ('bucket', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_seconds', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['month', 'outcome', 'bucket'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['type', 'timestamp'], name='wallet_wall_type_62789e_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='appealprocessinghistogram',
+            unique_together={('month', 'outcome', 'bucket')},
+        ),
+    ]
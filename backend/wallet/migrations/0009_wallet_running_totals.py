@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Q, Sum
+
+
+def backfill_running_totals(apps, schema_editor):
+    Wallet = apps.get_model('wallet', 'Wallet')
+    WalletTransaction = apps.get_model('wallet', 'WalletTransaction')
+    totals = (
+        WalletTransaction.objects.values('wallet_id')
+        .annotate(
+            credited=Sum('amount', filter=Q(type='credit')),
+            debited=Sum('amount', filter=Q(type='debit')),
+            count=Count('id'),
+        )
+    )
+    for row in totals.iterator():
+        Wallet.objects.filter(pk=row['wallet_id']).update(
+            total_credited=row['credited'] or 0,
+            total_debited=row['debited'] or 0,
+            tx_count=row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appeals', '0004_appeal_cancelled_at_appeal_rejected_at'),
+        ('wallet', '0008_appeal_processing_histogram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wallet',
+            name='total_credited',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='wallet',
+            name='total_debited',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='wallet',
+            name='tx_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='wallettransaction',
+            name='appeal',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='wallet_transactions', to='appeals.appeal'),
+        ),
+        migrations.RunPython(backfill_running_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0009_wallet_running_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletBalanceCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateTimeField()),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('total_credited', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('total_debited', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('tx_count', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['wallet', '-as_of'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['wallet', 'timestamp'], name='wallet_wall_wallet__47eaab_idx'),
+        ),
+        migrations.AddField(
+            model_name='walletbalancecheckpoint',
+            name='wallet',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='wallet.wallet'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='walletbalancecheckpoint',
+            unique_together={('wallet', 'as_of')},
+        ),
+    ]
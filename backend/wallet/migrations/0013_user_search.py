@@ -0,0 +1,87 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+FTS_TABLE = 'wallet_usersearchentry_fts'
+TRGM_INDEX = 'wallet_usersearch_doc_trgm'
+
+
+def backfill_search_documents(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    UserSearchEntry = apps.get_model('wallet', 'UserSearchEntry')
+    batch = []
+    for pk, first_name, last_name, email in User.objects.values_list('pk', 'first_name', 'last_name', 'email').iterator():
+        document = ' '.join(f'{first_name} {last_name} {email}'.casefold().split())
+        batch.append(UserSearchEntry(user_id=pk, document=document))
+        if len(batch) >= 1000:
+            UserSearchEntry.objects.bulk_create(batch)
+            batch = []
+    UserSearchEntry.objects.bulk_create(batch)
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX {TRGM_INDEX} ON wallet_usersearchentry USING gin (document gin_trgm_ops)'
+        )
+    elif connection.vendor == 'sqlite':
+        # The trigram tokenizer (sqlite 3.34+) gives substring matches like the pg index;
+        # without it the search helper falls back to a LIKE scan of the search table
+        if connection.Database.sqlite_version_info < (3, 34):
+            return
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                f"document, content='wallet_usersearchentry', content_rowid='user_id', tokenize='trigram')"
+            )
+        except connection.Database.OperationalError:
+            return  # sqlite built without FTS5
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON wallet_usersearchentry BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.user_id, new.document); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON wallet_usersearchentry BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.user_id, old.document); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON wallet_usersearchentry BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.user_id, old.document); "
+            f"INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.user_id, new.document); END"
+        )
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRGM_INDEX}')
+    elif connection.vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('wallet', '0012_withdrawal_requests'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchEntry',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_entry', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('document', models.TextField()),
+            ],
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0013_user_search'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='wallettransaction',
+            name='wallet_wall_wallet__47eaab_idx',
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['wallet', 'timestamp', 'id'], name='wallet_wall_wallet__fe11f0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['timestamp', 'id'], name='wallet_wall_timesta_e9e3eb_idx'),
+        ),
+    ]
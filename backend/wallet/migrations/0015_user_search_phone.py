@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def add_phone_to_documents(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    UserSearchEntry = apps.get_model('wallet', 'UserSearchEntry')
+    batch = []
+    users = User.objects.values_list('pk', 'first_name', 'last_name', 'email', 'phone')
+    for pk, first_name, last_name, email, phone in users.iterator():
+        document = ' '.join(f'{first_name} {last_name} {email} {phone or ""}'.casefold().split())
+        batch.append(UserSearchEntry(user_id=pk, document=document))
+        if len(batch) >= 1000:
+            UserSearchEntry.objects.bulk_create(batch, update_conflicts=True, unique_fields=['user'], update_fields=['document'])
+            batch = []
+    UserSearchEntry.objects.bulk_create(batch, update_conflicts=True, unique_fields=['user'], update_fields=['document'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0014_transaction_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_phone_to_documents, migrations.RunPython.noop),
+    ]
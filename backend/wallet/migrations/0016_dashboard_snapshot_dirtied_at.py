@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0015_user_search_phone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboardsnapshot',
+            name='dirtied_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,3 +1,11 @@
 from .wallet import Wallet
 from .transaction import WalletTransaction
-from .audit import AuditLog 
\ No newline at end of file
+from .audit import AuditLog
+from .metrics import DailyPlatformMetrics
+from .activity import ActivityEvent
+from .snapshot import DashboardSnapshot
+from .processing import AppealProcessingHistogram
+from .checkpoint import WalletBalanceCheckpoint
+from .idempotency import IdempotencyKey
+from .withdrawal import WithdrawalRequest
+from .search import UserSearchEntry
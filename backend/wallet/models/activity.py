@@ -0,0 +1,31 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ActivityEvent(models.Model):
+    """
+    Append-only dashboard feed. Display fields are denormalized at write time so
+    the feed is read with one indexed query and no FK lookups.
+    """
+    TYPE_CHOICES = [
+        ("donation", "Donation"),
+        ("appeal", "Appeal"),
+        ("user", "User"),
+        ("withdrawal", "Withdrawal"),
+    ]
+    type = models.CharField(max_length=16, choices=TYPE_CHOICES)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=128)
+    message = models.CharField(max_length=255)
+    actor_name = models.CharField(max_length=255)
+    amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-timestamp', '-id']
+        indexes = [
+            models.Index(fields=['-timestamp', '-id']),
+        ]
+
+    def __str__(self):
+        return f"ActivityEvent({self.type}, {self.object_id}, {self.timestamp})"
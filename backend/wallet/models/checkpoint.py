@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class WalletBalanceCheckpoint(models.Model):
+    """
+    A wallet's ledger position at a point in time: the effect of every
+    WalletTransaction with timestamp < as_of. Written daily at midnight so
+    point-in-time balances only replay the tail after the nearest checkpoint.
+    """
+    wallet = models.ForeignKey('wallet.Wallet', on_delete=models.CASCADE, related_name='checkpoints')
+    as_of = models.DateTimeField()
+    balance = models.DecimalField(max_digits=14, decimal_places=2)
+    total_credited = models.DecimalField(max_digits=14, decimal_places=2)
+    total_debited = models.DecimalField(max_digits=14, decimal_places=2)
+    tx_count = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('wallet', 'as_of')
+        ordering = ['wallet', '-as_of']
+
+    def __str__(self):
+        return f"WalletBalanceCheckpoint(wallet={self.wallet_id}, as_of={self.as_of}, balance={self.balance})"
@@ -0,0 +1,29 @@
+from decimal import Decimal
+from django.db import models
+
+
+class DailyPlatformMetrics(models.Model):
+    """
+    One row per day of platform activity, maintained incrementally by signals.
+    Flow columns hold the day's movement; gauge columns hold the closing value.
+    """
+    date = models.DateField(unique=True)
+
+    # Flows
+    donations_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    donations_count = models.PositiveIntegerField(default=0)
+    new_users = models.PositiveIntegerField(default=0)
+    wallet_balance_delta = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+
+    # Gauges (closing values, carried forward into the next day's row)
+    total_users = models.PositiveIntegerField(default=0)
+    active_appeals = models.IntegerField(default=0)
+    wallet_balance = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"DailyPlatformMetrics({self.date}, donations={self.donations_total})"
@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class AppealProcessingHistogram(models.Model):
+    """
+    Count of appeal decisions per month, outcome and latency bucket
+    (created_at -> approved_at/rejected_at). Updated on each status transition.
+    """
+    OUTCOME_CHOICES = [
+        ("approved", "Approved"),
+        ("rejected", "Rejected"),
+    ]
+    month = models.DateField(help_text='First day of the month the decision was made')
+    outcome = models.CharField(max_length=16, choices=OUTCOME_CHOICES)
+    bucket = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    total_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('month', 'outcome', 'bucket')
+        ordering = ['month', 'outcome', 'bucket']
+
+    def __str__(self):
+        return f"AppealProcessingHistogram({self.month}, {self.outcome}, bucket={self.bucket}, count={self.count})"
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.db import models
+
+
+class UserSearchEntry(models.Model):
+    """
+    One normalized search document per user ("first last email phone", casefolded,
+    whitespace collapsed). The backend-specific index lives on this table:
+    a pg_trgm GIN index on Postgres, an FTS5 shadow table on sqlite
+    (see wallet.services.user_search).
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='search_entry'
+    )
+    document = models.TextField()
+
+    def __str__(self):
+        return f"UserSearchEntry(user={self.user_id}, document={self.document!r})"
@@ -0,0 +1,20 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class DashboardSnapshot(models.Model):
+    """
+    Precomputed DashboardStatsView payload for one period (7/30/90 days).
+    Served as-is to every admin; rebuilt when stale or marked dirty by writes.
+    """
+    period = models.PositiveSmallIntegerField(unique=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    computed_at = models.DateTimeField()
+    dirty = models.BooleanField(default=False)
+    # When a write last marked it dirty; a rebuild only clears marks older than its computed_at
+    dirtied_at = models.DateTimeField(null=True, blank=True)
+    # Lease taken by whichever process is rebuilding this snapshot
+    refresh_claimed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"DashboardSnapshot({self.period}d, computed_at={self.computed_at})"
@@ -9,7 +9,7 @@ class WalletTransaction(models.Model):
     wallet = models.ForeignKey('wallet.Wallet', on_delete=models.CASCADE, related_name='transactions')
     type = models.CharField(max_length=8, choices=TRANSACTION_TYPE_CHOICES)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
-    appeal = models.ForeignKey('appeals.Appeal', on_delete=models.CASCADE, related_name='wallet_transactions')
+    appeal = models.ForeignKey('appeals.Appeal', null=True, blank=True, on_delete=models.CASCADE, related_name='wallet_transactions')
     donor = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='donor_wallet_transactions')
     description = models.CharField(max_length=255, blank=True, null=True)
     timestamp = models.DateTimeField(auto_now_add=True)
@@ -20,5 +20,12 @@ class WalletTransaction(models.Model):
         blank=True
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['type', 'timestamp']),
+            models.Index(fields=['wallet', 'timestamp', 'id']),
+            models.Index(fields=['timestamp', 'id']),
+        ]
+
     def __str__(self):
         return f"{self.type} {self.amount} (Wallet: {self.wallet_id}, Appeal: {self.appeal_id})" 
\ No newline at end of file
@@ -4,6 +4,10 @@ from django.conf import settings
 class Wallet(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='wallet')
     balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Running totals maintained by wallet_service on every ledger write
+    total_credited = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_debited = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    tx_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
-        return f"Wallet(user={self.user.pk}, balance={self.balance})" 
\ No newline at end of file
+        return f"Wallet(user={self.user.pk}, balance={self.balance})"
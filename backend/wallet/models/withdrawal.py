@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import models
+
+
+class WithdrawalRequest(models.Model):
+    """
+    A recipient's withdrawal, queued by the API and settled by the
+    process_withdrawals worker through wallet_service.debit_wallet.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("processing", "Processing"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='withdrawal_requests')
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default='pending')
+    transaction = models.OneToOneField(
+        'wallet.WalletTransaction', null=True, blank=True, on_delete=models.SET_NULL, related_name='withdrawal_request'
+    )
+    error = models.CharField(max_length=255, blank=True, default='')
+    claim_token = models.CharField(max_length=64, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"WithdrawalRequest({self.id}, user={self.user_id}, {self.amount}, {self.status})"
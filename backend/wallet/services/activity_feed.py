@@ -0,0 +1,160 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from core.pagination import encode_cursor, decode_cursor
+from users.models import User
+from appeals.models import Appeal
+from donations.models import Donation
+from wallet.models import WalletTransaction, ActivityEvent
+
+DEFAULT_FEED_LIMIT = 10
+MAX_FEED_LIMIT = 100
+
+
+def _name(user, fallback):
+    return (getattr(user, 'full_name', None) or fallback) if user else fallback
+
+
+def _donation_event(donation):
+    donor_name = _name(donation.donor, 'Anonymous')
+    return ActivityEvent(
+        type='donation',
+        object_id=donation.pk,
+        title='New donation received',
+        message=f"${donation.amount} from {donor_name}",
+        actor_name=donor_name,
+        amount=donation.amount,
+        timestamp=donation.created_at,
+    )
+
+
+def _appeal_event(appeal):
+    status = appeal.status or 'Unknown'
+    return ActivityEvent(
+        type='appeal',
+        object_id=appeal.pk,
+        title=f"Appeal {status}",
+        message=f"\"{appeal.title}\" was {status}"[:255],
+        actor_name=_name(appeal.created_by, 'Unknown'),
+        amount=appeal.amount_requested or None,
+        timestamp=appeal.created_at,
+    )
+
+
+def _user_event(user):
+    full_name = _name(user, user.email)
+    return ActivityEvent(
+        type='user',
+        object_id=user.pk,
+        title='New user registered',
+        message=f"{full_name} joined the platform"[:255],
+        actor_name=full_name,
+        amount=None,
+        timestamp=user.date_joined,
+    )
+
+
+def _withdrawal_event(tx):
+    user = tx.wallet.user if tx.wallet_id else None
+    return ActivityEvent(
+        type='withdrawal',
+        object_id=tx.pk,
+        title='Withdrawal processed',
+        message=f"${tx.amount} withdrawal processed",
+        actor_name=_name(user, 'Unknown'),
+        amount=tx.amount,
+        timestamp=tx.timestamp,
+    )
+
+
+def record_donation(donation):
+    _donation_event(donation).save()
+
+
+def record_donations(donations):
+    """Feed events for donations written with bulk_create (which skips post_save)."""
+    ActivityEvent.objects.bulk_create([_donation_event(donation) for donation in donations])
+
+
+def record_appeal(appeal):
+    _appeal_event(appeal).save()
+
+
+def record_user(user):
+    _user_event(user).save()
+
+
+def record_withdrawal(tx):
+    _withdrawal_event(tx).save()
+
+
+def serialize_event(event):
+    return {
+        "id": f"{event.type}_{event.object_id}",
+        "type": event.type,
+        "title": event.title,
+        "message": event.message,
+        "user": event.actor_name,
+        "timestamp": event.timestamp.isoformat(),
+        "amount": float(event.amount) if event.amount is not None else None,
+    }
+
+
+def get_activity_feed(since=None, cursor=None, limit=DEFAULT_FEED_LIMIT):
+    """
+    Read one page of the activity feed, newest first.
+
+    Returns (activities, next_cursor, error). Pages are keyed on
+    (timestamp, id), so every page costs the same indexed range scan.
+    """
+    limit = max(1, min(int(limit), MAX_FEED_LIMIT))
+    qs = ActivityEvent.objects.all()
+    if since is not None:
+        qs = qs.filter(timestamp__gte=since)
+    if cursor:
+        try:
+            ts, pk = decode_cursor(cursor)
+            ts = parse_datetime(ts)
+            pk = int(pk)
+        except (ValueError, TypeError):
+            return [], None, 'Invalid cursor'
+        if ts is None:
+            return [], None, 'Invalid cursor'
+        qs = qs.filter(Q(timestamp__lt=ts) | Q(timestamp=ts, id__lt=pk))
+
+    events = list(qs.order_by('-timestamp', '-id')[:limit + 1])
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        last = events[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+    return [serialize_event(e) for e in events], next_cursor, None
+
+
+def rebuild_activity_events(chunk_size=1000):
+    """
+    Regenerate the feed from the source tables (for rows written before the
+    feed existed). Returns the number of events written.
+    """
+    sources = [
+        (Donation.objects.select_related('donor'), _donation_event),
+        (Appeal.objects.select_related('created_by'), _appeal_event),
+        (User.objects.all(), _user_event),
+        (WalletTransaction.objects.filter(type='debit').select_related('wallet__user'), _withdrawal_event),
+    ]
+    written = 0
+    with transaction.atomic():
+        ActivityEvent.objects.all().delete()
+        for qs, build in sources:
+            batch = []
+            for obj in qs.order_by('pk').iterator(chunk_size=chunk_size):
+                batch.append(build(obj))
+                if len(batch) >= chunk_size:
+                    ActivityEvent.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                ActivityEvent.objects.bulk_create(batch)
+                written += len(batch)
+    return written
@@ -0,0 +1,162 @@
+from bisect import bisect_left
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import F, Sum, Count, Case, When, Value, ExpressionWrapper, DurationField, IntegerField
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from appeals.models import Appeal
+from wallet.models import AppealProcessingHistogram
+
+# Upper bounds (hours) of the latency buckets; anything slower lands in the overflow bucket
+BUCKET_BOUNDS_HOURS = [1, 2, 4, 8, 12, 24, 48, 72, 120, 168, 336, 720]
+OVERFLOW_BUCKET = len(BUCKET_BOUNDS_HOURS)
+DECISION_FIELDS = {
+    'approved': 'approved_at',
+    'rejected': 'rejected_at',
+}
+PERCENTILES = (50, 90, 99)
+
+
+def bucket_for(hours):
+    return bisect_left(BUCKET_BOUNDS_HOURS, hours)
+
+
+def _month_start(dt):
+    return timezone.localtime(dt).date().replace(day=1)
+
+
+def record_decision(appeal, previous=None):
+    """
+    Add an approval/rejection to the histogram. Ignores appeals without
+    timestamps, and re-decisions (previous status already a decision), so each
+    appeal is sampled once.
+    """
+    if previous in DECISION_FIELDS:
+        return
+    field = DECISION_FIELDS.get(appeal.status)
+    decided_at = getattr(appeal, field, None) if field else None
+    if decided_at is None or appeal.created_at is None:
+        return
+    seconds = max(int((decided_at - appeal.created_at).total_seconds()), 0)
+    key = {
+        'month': _month_start(decided_at),
+        'outcome': appeal.status,
+        'bucket': bucket_for(seconds / 3600),
+    }
+    updates = {'count': F('count') + 1, 'total_seconds': F('total_seconds') + seconds}
+    if not AppealProcessingHistogram.objects.filter(**key).update(**updates):
+        row, _ = AppealProcessingHistogram.objects.get_or_create(**key)
+        AppealProcessingHistogram.objects.filter(pk=row.pk).update(**updates)
+
+
+def _percentile(buckets, q):
+    """
+    Estimate the q-th percentile (hours) from {bucket: count}, interpolating
+    linearly inside the bucket that holds the target rank.
+    """
+    total = sum(buckets.values())
+    if not total:
+        return None
+    target = total * q / 100
+    seen = 0
+    for bucket in sorted(buckets):
+        count = buckets[bucket]
+        if seen + count >= target:
+            lower = BUCKET_BOUNDS_HOURS[bucket - 1] if bucket > 0 else 0
+            if bucket >= OVERFLOW_BUCKET:
+                return float(lower)
+            upper = BUCKET_BOUNDS_HOURS[bucket]
+            fraction = (target - seen) / count if count else 0
+            return round(lower + (upper - lower) * fraction, 2)
+        seen += count
+    return float(BUCKET_BOUNDS_HOURS[-1])
+
+
+def _summarize(rows):
+    buckets = {}
+    count = 0
+    seconds = 0
+    for row in rows:
+        buckets[row['bucket']] = buckets.get(row['bucket'], 0) + row['count']
+        count += row['count']
+        seconds += row['total_seconds']
+    summary = {
+        'count': count,
+        'avg_hours': round(seconds / count / 3600, 2) if count else None,
+    }
+    for q in PERCENTILES:
+        summary[f'p{q}_hours'] = _percentile(buckets, q)
+    return summary
+
+
+def get_processing_summary(months=12):
+    """
+    Processing-time stats for the Shura page: overall and per outcome, plus one
+    entry per month. Reads only the histogram (at most months x 2 x buckets rows).
+    """
+    today = timezone.localdate()
+    first = today.year * 12 + today.month - 1 - (months - 1)
+    since = date(first // 12, first % 12 + 1, 1)
+    rows = list(
+        AppealProcessingHistogram.objects.filter(month__gte=since)
+        .values('month', 'outcome', 'bucket', 'count', 'total_seconds')
+    )
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(row['month'], []).append(row)
+
+    monthly = []
+    for month in sorted(by_month):
+        month_rows = by_month[month]
+        entry = {'month': month.strftime('%Y-%m'), **_summarize(month_rows)}
+        for outcome in DECISION_FIELDS:
+            entry[outcome] = sum(r['count'] for r in month_rows if r['outcome'] == outcome)
+        monthly.append(entry)
+
+    return {
+        'overall': _summarize(rows),
+        'by_outcome': {
+            outcome: _summarize([r for r in rows if r['outcome'] == outcome])
+            for outcome in DECISION_FIELDS
+        },
+        'monthly': monthly,
+        'bucket_bounds_hours': BUCKET_BOUNDS_HOURS,
+    }
+
+
+def rebuild_processing_histogram():
+    """
+    Recompute the histogram from Appeal timestamps, bucketing and summing the
+    latencies in the database. Returns the number of histogram rows written.
+    """
+    objs = []
+    for outcome, field in DECISION_FIELDS.items():
+        latency = ExpressionWrapper(F(field) - F('created_at'), output_field=DurationField())
+        bucket = Case(
+            *[When(latency__lte=timedelta(hours=bound), then=Value(i)) for i, bound in enumerate(BUCKET_BOUNDS_HOURS)],
+            default=Value(OVERFLOW_BUCKET),
+            output_field=IntegerField(),
+        )
+        grouped = (
+            Appeal.objects.filter(**{f'{field}__isnull': False})
+            .annotate(latency=latency)
+            .annotate(month=TruncMonth(field), bucket=bucket)
+            .values('month', 'bucket')
+            .annotate(count=Count('id'), total=Sum('latency'))
+        )
+        for item in grouped:
+            total = item['total'] or timedelta(0)
+            objs.append(AppealProcessingHistogram(
+                month=item['month'].date() if hasattr(item['month'], 'date') else item['month'],
+                outcome=outcome,
+                bucket=item['bucket'],
+                count=item['count'],
+                total_seconds=max(int(total.total_seconds()), 0),
+            ))
+
+    with transaction.atomic():
+        AppealProcessingHistogram.objects.all().delete()
+        AppealProcessingHistogram.objects.bulk_create(objs, batch_size=500)
+    return len(objs)
@@ -0,0 +1,186 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum, Count, Q, Max, OuterRef, Subquery
+from django.utils import timezone
+
+from settings.utils import local_date, local_day_range, local_midnight
+from wallet.models import WalletTransaction, WalletBalanceCheckpoint
+
+ZERO = Decimal('0.00')
+
+
+def parse_day_range(params):
+    """
+    Read ?start= / ?end= (YYYY-MM-DD, both optional) from a mapping.
+    Returns (start, end) as dates; raises ValueError when malformed.
+    """
+    start, end = params.get('start'), params.get('end')
+    return (date.fromisoformat(start) if start else None, date.fromisoformat(end) if end else None)
+
+
+def day_range_q(start=None, end=None, field='timestamp'):
+    """Q for rows on local days start..end inclusive, as a half-open timestamp range."""
+    lower, upper = local_day_range(start, end)
+    q = Q()
+    if lower is not None:
+        q &= Q(**{f'{field}__gte': lower})
+    if upper is not None:
+        q &= Q(**{f'{field}__lt': upper})
+    return q
+
+
+def _ledger_totals():
+    return dict(
+        credited=Sum('amount', filter=Q(type='credit')),
+        debited=Sum('amount', filter=Q(type='debit')),
+        count=Count('id'),
+    )
+
+
+def position_at(wallet, ts):
+    """
+    Ledger position of a wallet just before ts (transactions with timestamp < ts):
+    the nearest checkpoint at or before ts plus the transactions after it.
+    """
+    checkpoint = (
+        WalletBalanceCheckpoint.objects.filter(wallet=wallet, as_of__lte=ts)
+        .order_by('-as_of').first()
+    )
+    tail = WalletTransaction.objects.filter(wallet=wallet, timestamp__lt=ts)
+    if checkpoint:
+        tail = tail.filter(timestamp__gte=checkpoint.as_of)
+    totals = tail.aggregate(**_ledger_totals())
+    credited = totals['credited'] or ZERO
+    debited = totals['debited'] or ZERO
+    return {
+        'balance': (checkpoint.balance if checkpoint else ZERO) + credited - debited,
+        'total_credited': (checkpoint.total_credited if checkpoint else ZERO) + credited,
+        'total_debited': (checkpoint.total_debited if checkpoint else ZERO) + debited,
+        'tx_count': (checkpoint.tx_count if checkpoint else 0) + totals['count'],
+    }
+
+
+def balance_at(wallet, ts):
+    """Wallet balance just before ts, replaying only the ledger tail after the nearest checkpoint."""
+    return position_at(wallet, ts)['balance']
+
+
+@transaction.atomic
+def create_checkpoints(as_of):
+    """
+    Checkpoint every wallet with ledger activity since the previous checkpoint
+    run. Only transactions in [previous as_of, as_of) are read: anything older
+    is already folded into each wallet's latest checkpoint. Returns the number
+    of checkpoints written (0 if this as_of was already checkpointed).
+    """
+    if as_of > timezone.now():
+        raise ValueError('Cannot checkpoint a time in the future')
+    if WalletBalanceCheckpoint.objects.filter(as_of=as_of).exists():
+        return 0
+    previous = WalletBalanceCheckpoint.objects.filter(as_of__lt=as_of).aggregate(last=Max('as_of'))['last']
+    tail = WalletTransaction.objects.filter(timestamp__lt=as_of)
+    if previous:
+        tail = tail.filter(timestamp__gte=previous)
+    grouped = {row['wallet_id']: row for row in tail.values('wallet_id').annotate(**_ledger_totals())}
+    if not grouped:
+        return 0
+
+    latest_as_of = (
+        WalletBalanceCheckpoint.objects.filter(wallet=OuterRef('wallet'), as_of__lt=as_of)
+        .order_by('-as_of').values('as_of')[:1]
+    )
+    latest = {
+        checkpoint.wallet_id: checkpoint
+        for checkpoint in WalletBalanceCheckpoint.objects.filter(
+            wallet_id__in=list(grouped), as_of=Subquery(latest_as_of)
+        )
+    }
+    objs = []
+    for wallet_id, row in grouped.items():
+        base = latest.get(wallet_id)
+        credited = row['credited'] or ZERO
+        debited = row['debited'] or ZERO
+        objs.append(WalletBalanceCheckpoint(
+            wallet_id=wallet_id,
+            as_of=as_of,
+            balance=(base.balance if base else ZERO) + credited - debited,
+            total_credited=(base.total_credited if base else ZERO) + credited,
+            total_debited=(base.total_debited if base else ZERO) + debited,
+            tx_count=(base.tx_count if base else 0) + row['count'],
+        ))
+    WalletBalanceCheckpoint.objects.bulk_create(objs, batch_size=500)
+    return len(objs)
+
+
+def pending_checkpoint_days(today=None):
+    """Midnights not yet checkpointed, from the day after the last run through today."""
+    today = today or local_date()
+    last = WalletBalanceCheckpoint.objects.aggregate(last=Max('as_of'))['last']
+    if last is None:
+        return [today]
+    day = local_date(last) + timedelta(days=1)
+    days = []
+    while day <= today:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def parse_month(value):
+    """'YYYY-MM' -> (year, month); None defaults to last month. Raises ValueError."""
+    if not value:
+        first = local_date().replace(day=1) - timedelta(days=1)
+        return first.year, first.month
+    year, month = (int(part) for part in value.split('-'))
+    date(year, month, 1)
+    return year, month
+
+
+def get_monthly_statement(wallet, year, month):
+    """
+    Month statement for a wallet: opening balance from the nearest checkpoint,
+    the month's transactions with a running balance, and the closing balance.
+    """
+    start_day = date(year, month, 1)
+    end_day = (start_day + timedelta(days=32)).replace(day=1)
+    start, end = local_midnight(start_day), local_midnight(end_day)
+    if start > timezone.now():
+        return None, 'Statement month is in the future'
+
+    opening = balance_at(wallet, start)
+    running = opening
+    total_credits = total_debits = ZERO
+    lines = []
+    transactions = (
+        WalletTransaction.objects.filter(wallet=wallet, timestamp__gte=start, timestamp__lt=end)
+        .order_by('timestamp', 'id')
+    )
+    for tx in transactions.iterator(chunk_size=500):
+        if tx.type == 'credit':
+            running += tx.amount
+            total_credits += tx.amount
+        else:
+            running -= tx.amount
+            total_debits += tx.amount
+        lines.append({
+            'id': tx.id,
+            'timestamp': tx.timestamp.isoformat(),
+            'type': tx.type,
+            'amount': tx.amount,
+            'description': tx.description,
+            'transfer_by': tx.transfer_by,
+            'balance_after': running,
+        })
+    return {
+        'wallet_id': wallet.id,
+        'month': start_day.strftime('%Y-%m'),
+        'period_start': start.isoformat(),
+        'period_end': end.isoformat(),
+        'opening_balance': opening,
+        'closing_balance': running,
+        'total_credits': total_credits,
+        'total_debits': total_debits,
+        'transactions': lines,
+    }, None
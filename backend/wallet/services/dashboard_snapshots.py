@@ -0,0 +1,129 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, Q, Value, When
+from django.utils import timezone
+
+from wallet.models import DashboardSnapshot
+from wallet.services.platform_metrics import get_dashboard_totals
+from wallet.services.activity_feed import get_activity_feed
+
+logger = logging.getLogger(__name__)
+
+PERIODS = (7, 30, 90)
+# A claimed refresh that has not finished after this long is considered abandoned
+REFRESH_LEASE = timedelta(seconds=60)
+
+
+def _max_age():
+    return timedelta(seconds=getattr(settings, 'DASHBOARD_SNAPSHOT_MAX_AGE', 60))
+
+
+def _min_age():
+    return timedelta(seconds=getattr(settings, 'DASHBOARD_SNAPSHOT_MIN_AGE', 5))
+
+
+def build_payload(days):
+    """Compute the DashboardStatsView body for a period."""
+    now = timezone.now()
+    totals = get_dashboard_totals(days)
+    activities, next_cursor, _ = get_activity_feed(since=now - timedelta(days=days))
+    return {
+        "stats": {
+            "total_donations": float(totals["total_donations"]),
+            "active_appeals": totals["active_appeals"],
+            "registered_users": totals["registered_users"],
+            "wallet_balance": float(totals["wallet_balance"]),
+            "donations_count": totals["donations_count"],
+            "new_users": totals["new_users"],
+        },
+        "activities": activities,
+        "activities_next_cursor": next_cursor,
+    }
+
+
+def refresh_snapshot(days):
+    """
+    Rebuild and store the snapshot for one period. The dirty flag is cleared
+    only if it was set before computed_at: a write committing while the
+    payload is built keeps it dirty, so the next request rebuilds again.
+    """
+    computed_at = timezone.now()
+    payload = build_payload(days)
+    fields = {'payload': payload, 'computed_at': computed_at, 'refresh_claimed_at': None}
+    updated = DashboardSnapshot.objects.filter(period=days).update(
+        dirty=Case(When(dirtied_at__gte=computed_at, then=Value(True)), default=Value(False)),
+        **fields,
+    )
+    if not updated:
+        try:
+            with transaction.atomic():
+                return DashboardSnapshot.objects.create(period=days, **fields)
+        except IntegrityError:
+            pass  # built concurrently by another request; serve that one
+    return DashboardSnapshot.objects.get(period=days)
+
+
+def refresh_all(only_due=False):
+    """Rebuild every period (or only those due). Returns the periods refreshed."""
+    refreshed = []
+    for days in PERIODS:
+        if only_due:
+            snapshot = DashboardSnapshot.objects.filter(period=days).first()
+            if snapshot is not None and not _is_due(snapshot, timezone.now()):
+                continue
+        refresh_snapshot(days)
+        refreshed.append(days)
+    return refreshed
+
+
+def mark_dirty():
+    """Flag all snapshots for rebuild once the current transaction commits."""
+    # Always stamp dirtied_at, even when already dirty, so a rebuild in progress sees this write
+    transaction.on_commit(
+        lambda: DashboardSnapshot.objects.update(dirty=True, dirtied_at=timezone.now())
+    )
+
+
+def _is_due(snapshot, now):
+    age = now - snapshot.computed_at
+    return age >= _max_age() or (snapshot.dirty and age >= _min_age())
+
+
+def _claim_refresh(snapshot, now):
+    """Take the refresh lease with a conditional UPDATE so only one worker rebuilds."""
+    return DashboardSnapshot.objects.filter(pk=snapshot.pk).filter(
+        Q(refresh_claimed_at__isnull=True) | Q(refresh_claimed_at__lt=now - REFRESH_LEASE)
+    ).update(refresh_claimed_at=now) == 1
+
+
+def _refresh_in_background(days):
+    try:
+        refresh_snapshot(days)
+    except Exception:
+        logger.exception("Dashboard snapshot refresh failed for period %s", days)
+        DashboardSnapshot.objects.filter(period=days).update(refresh_claimed_at=None)
+    finally:
+        connection.close()
+
+
+def get_snapshot(days):
+    """
+    Return the stored snapshot for a period straight away (stale-while-revalidate).
+    A stale or dirty snapshot is still served; its rebuild is kicked off in the
+    background. Only a missing snapshot is computed inside the request.
+    """
+    snapshot = DashboardSnapshot.objects.filter(period=days).first()
+    if snapshot is None:
+        return refresh_snapshot(days)
+
+    now = timezone.now()
+    if _is_due(snapshot, now) and _claim_refresh(snapshot, now):
+        if getattr(settings, 'DASHBOARD_SNAPSHOT_ASYNC_REFRESH', True):
+            threading.Thread(target=_refresh_in_background, args=(days,), daemon=True).start()
+        else:
+            return refresh_snapshot(days)
+    return snapshot
@@ -0,0 +1,59 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+
+from wallet.models import IdempotencyKey
+
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyReused(ValueError):
+    """The same Idempotency-Key was sent again with a different request."""
+
+
+def _request_hash(payload):
+    encoded = json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _replay(record, request_hash):
+    if record.request_hash != request_hash:
+        raise IdempotencyKeyReused('Idempotency-Key was already used for a different request')
+    return record.status_code, record.response, True
+
+
+def run_once(user, scope, key, payload, action):
+    """
+    Run action() -> (status_code, body) at most once per (user, scope, key) and
+    cache its response. Returns (status_code, body, replayed).
+
+    A retry is a single indexed read that never reaches the wallet. The first
+    attempt writes the key in the same transaction as the wallet change, so a
+    concurrent duplicate loses on the unique index, rolls back its own write and
+    replays the winner. Without a key the action just runs.
+    """
+    if not key:
+        status_code, body = action()
+        return status_code, body, False
+    if len(key) > MAX_KEY_LENGTH:
+        raise IdempotencyKeyReused(f'Idempotency-Key must be at most {MAX_KEY_LENGTH} characters')
+
+    request_hash = _request_hash(payload)
+    lookup = {'user': user, 'scope': scope, 'key': key}
+    record = IdempotencyKey.objects.filter(**lookup).first()
+    if record:
+        return _replay(record, request_hash)
+    try:
+        with transaction.atomic():
+            status_code, body = action()
+            IdempotencyKey.objects.create(
+                **lookup, request_hash=request_hash, status_code=status_code, response=body
+            )
+    except IntegrityError:
+        record = IdempotencyKey.objects.filter(**lookup).first()
+        if record is None:
+            raise
+        return _replay(record, request_hash)
+    return status_code, body, False
@@ -0,0 +1,136 @@
+import csv
+import json
+import zlib
+
+from wallet.models import WalletTransaction
+from wallet.services.balance_checkpoints import day_range_q, parse_day_range
+
+# (column, lookup) pairs; the export is one values_list() over these joins
+EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('timestamp', 'timestamp'),
+    ('type', 'type'),
+    ('amount', 'amount'),
+    ('wallet_id', 'wallet_id'),
+    ('user_id', 'wallet__user_id'),
+    ('user_email', 'wallet__user__email'),
+    ('user_first_name', 'wallet__user__first_name'),
+    ('user_last_name', 'wallet__user__last_name'),
+    ('user_role', 'wallet__user__role'),
+    ('appeal_id', 'appeal_id'),
+    ('appeal_title', 'appeal__title'),
+    ('appeal_status', 'appeal__status'),
+    ('donor_id', 'donor_id'),
+    ('description', 'description'),
+    ('transfer_by', 'transfer_by'),
+)
+FORMATS = ('csv', 'ndjson')
+CONTENT_TYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+DEFAULT_CHUNK_SIZE = 2000
+# Compressed output is flushed in blocks of about this size
+GZIP_BLOCK_SIZE = 64 * 1024
+
+
+def parse_filters(params):
+    """
+    Read start/end (YYYY-MM-DD, inclusive), type and user from a mapping.
+    Returns (filters, error) with filters ready for export_rows().
+    """
+    filters = {}
+    try:
+        start, end = parse_day_range(params)
+    except ValueError:
+        return None, 'Invalid date, expected YYYY-MM-DD'
+    if start:
+        filters['start'] = start
+    if end:
+        filters['end'] = end
+    tx_type = params.get('type')
+    if tx_type:
+        if tx_type not in dict(WalletTransaction.TRANSACTION_TYPE_CHOICES):
+            return None, 'Invalid type, expected credit or debit'
+        filters['tx_type'] = tx_type
+    if params.get('user'):
+        try:
+            filters['user_id'] = int(params['user'])
+        except (TypeError, ValueError):
+            return None, 'Invalid user'
+    return filters, None
+
+
+def export_rows(start=None, end=None, tx_type=None, user_id=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream ledger rows as tuples in EXPORT_COLUMNS order, oldest first.
+    Rows come through a server-side iterator, so memory does not grow with
+    the size of the export.
+    """
+    qs = WalletTransaction.objects.filter(day_range_q(start, end))
+    if tx_type:
+        qs = qs.filter(type=tx_type)
+    if user_id is not None:
+        qs = qs.filter(wallet__user_id=user_id)
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    return qs.order_by('id').values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+class _Echo:
+    """File-like object whose write() hands back the line csv.writer produced."""
+    def write(self, value):
+        return value
+
+
+def _plain(value):
+    if value is None:
+        return ''
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([column for column, _ in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow([_plain(value) for value in row])
+
+
+def iter_ndjson(rows):
+    columns = [column for column, _ in EXPORT_COLUMNS]
+    for row in rows:
+        record = {
+            column: (str(value) if column == 'amount' else value.isoformat() if hasattr(value, 'isoformat') else value)
+            for column, value in zip(columns, row)
+        }
+        yield json.dumps(record) + '\n'
+
+
+def gzip_chunks(chunks, block_size=GZIP_BLOCK_SIZE):
+    """Gzip a stream of str chunks on the fly, yielding compressed blocks."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+        if pending_size >= block_size:
+            yield b''.join(pending)
+            pending = []
+            pending_size = 0
+    pending.append(compressor.flush())
+    yield b''.join(pending)
+
+
+def iter_export(fmt='csv', compress=False, chunk_size=DEFAULT_CHUNK_SIZE, **filters):
+    """The whole export as an iterator of str chunks (bytes when compressed)."""
+    rows = export_rows(chunk_size=chunk_size, **filters)
+    chunks = iter_csv(rows) if fmt == 'csv' else iter_ndjson(rows)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_filename(fmt, compress=False, **filters):
+    parts = ['wallet-ledger']
+    if filters.get('start'):
+        parts.append(filters['start'].isoformat())
+    if filters.get('end'):
+        parts.append(filters['end'].isoformat())
+    return '-'.join(parts) + f'.{fmt}' + ('.gz' if compress else '')
@@ -0,0 +1,208 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum, Count, Case, When, F, DecimalField
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from users.models import User
+from appeals.models import Appeal
+from donations.models import Donation
+from wallet.models import Wallet, WalletTransaction, DailyPlatformMetrics
+
+# Appeals still in play (see Appeal.clean: "active (pending/approved)")
+ACTIVE_APPEAL_STATUSES = ('pending', 'approved')
+GAUGE_FIELDS = ('total_users', 'active_appeals', 'wallet_balance')
+
+
+def _live_gauges():
+    """Read the gauge values straight from the source tables."""
+    return {
+        'total_users': User.objects.count(),
+        'active_appeals': Appeal.objects.filter(status__in=ACTIVE_APPEAL_STATUSES).count(),
+        'wallet_balance': Wallet.objects.aggregate(total=Sum('balance'))['total'] or Decimal('0.00'),
+    }
+
+
+def _bump(flows=None, gauges=None):
+    """
+    Apply deltas to today's rollup row with a single UPDATE.
+    The first write of a day creates the row, seeding gauges from the previous
+    row (or from the live tables when no history exists yet).
+    """
+    flows = flows or {}
+    gauges = gauges or {}
+    changes = {**flows, **gauges}
+    if not changes:
+        return
+    today = timezone.localdate()
+    updates = {field: F(field) + value for field, value in changes.items()}
+    if DailyPlatformMetrics.objects.filter(date=today).update(**updates):
+        return
+
+    previous = DailyPlatformMetrics.objects.filter(date__lt=today).order_by('-date').values(*GAUGE_FIELDS).first()
+    # Live gauges are read after the triggering write, so they already include it
+    seed = previous if previous is not None else _live_gauges()
+    row, created = DailyPlatformMetrics.objects.get_or_create(date=today, defaults=seed)
+    if created and previous is None:
+        updates = {field: F(field) + value for field, value in flows.items()}
+    if updates:
+        DailyPlatformMetrics.objects.filter(pk=row.pk).update(**updates)
+
+
+def record_donation(amount):
+    _bump(flows={'donations_total': amount, 'donations_count': 1})
+
+
+def record_donations(total, count):
+    """Rollup for a batch of donations written with bulk_create."""
+    if count:
+        _bump(flows={'donations_total': total, 'donations_count': count})
+
+
+def record_new_user():
+    _bump(flows={'new_users': 1}, gauges={'total_users': 1})
+
+
+def _take_back(day, **deltas):
+    """
+    Subtract flow deltas from `day`'s row when the row they were counted in
+    loses them (a deletion). Counts stop at zero; no row, nothing to undo.
+    """
+    updates = {
+        field: Greatest(F(field) - value, 0) if isinstance(value, int) else F(field) - value
+        for field, value in deltas.items()
+    }
+    DailyPlatformMetrics.objects.filter(date=day).update(**updates)
+
+
+def record_donation_deleted(amount, created_at):
+    _take_back(timezone.localdate(created_at), donations_total=amount, donations_count=1)
+
+
+def record_user_deleted(date_joined):
+    _take_back(timezone.localdate(date_joined), new_users=1)
+    _bump(gauges={'total_users': -1})
+
+
+def record_wallet_deleted(balance):
+    """The balance leaves the platform total; no ledger entry moved it, so no flow."""
+    if balance:
+        _bump(gauges={'wallet_balance': -balance})
+
+
+def record_appeal_transition(old_status, new_status):
+    was_active = old_status in ACTIVE_APPEAL_STATUSES
+    is_active = new_status in ACTIVE_APPEAL_STATUSES
+    if was_active != is_active:
+        _bump(gauges={'active_appeals': 1 if is_active else -1})
+
+
+def record_wallet_delta(amount):
+    if amount:
+        _bump(flows={'wallet_balance_delta': amount}, gauges={'wallet_balance': amount})
+
+
+def get_dashboard_totals(days):
+    """
+    Dashboard tiles for the last `days` days (today included), read from at most
+    `days` rollup rows plus the latest row for the gauges.
+    """
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    totals = DailyPlatformMetrics.objects.filter(date__gte=start, date__lte=today).aggregate(
+        total_donations=Sum('donations_total'),
+        donations_count=Sum('donations_count'),
+        new_users=Sum('new_users'),
+    )
+    latest = DailyPlatformMetrics.objects.order_by('-date').values(*GAUGE_FIELDS).first()
+    gauges = latest if latest is not None else _live_gauges()
+    return {
+        'total_donations': totals['total_donations'] or 0,
+        'donations_count': totals['donations_count'] or 0,
+        'new_users': totals['new_users'] or 0,
+        'active_appeals': gauges['active_appeals'],
+        'registered_users': gauges['total_users'],
+        'wallet_balance': gauges['wallet_balance'],
+    }
+
+
+def rebuild_daily_metrics():
+    """
+    Recompute every rollup row from the source tables.
+
+    Flows are grouped per day in the database. Gauges are closing values: user
+    totals are cumulative sign-ups, wallet balance is walked back from the live
+    total using the daily ledger deltas, and active appeals (whose history is not
+    recorded) count currently active appeals created on or before each day.
+    Returns the number of rows written.
+    """
+    days = {}
+
+    def row(day):
+        return days.setdefault(day, {
+            'donations_total': Decimal('0.00'), 'donations_count': 0,
+            'new_users': 0, 'wallet_balance_delta': Decimal('0.00'),
+            'appeals_opened': 0,
+        })
+
+    donations = (
+        Donation.objects.annotate(day=TruncDate('created_at')).values('day')
+        .annotate(total=Sum('amount'), count=Count('id'))
+    )
+    for item in donations:
+        row(item['day']).update(donations_total=item['total'] or Decimal('0.00'), donations_count=item['count'])
+
+    for item in User.objects.annotate(day=TruncDate('date_joined')).values('day').annotate(count=Count('id')):
+        row(item['day']).update(new_users=item['count'])
+
+    ledger = (
+        WalletTransaction.objects.annotate(day=TruncDate('timestamp')).values('day')
+        .annotate(delta=Sum(Case(
+            When(type='credit', then=F('amount')),
+            When(type='debit', then=-F('amount')),
+            default=0,
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        )))
+    )
+    for item in ledger:
+        row(item['day'])['wallet_balance_delta'] = item['delta'] or Decimal('0.00')
+
+    active = (
+        Appeal.objects.filter(status__in=ACTIVE_APPEAL_STATUSES)
+        .annotate(day=TruncDate('created_at')).values('day').annotate(count=Count('id'))
+    )
+    for item in active:
+        row(item['day'])['appeals_opened'] = item['count']
+
+    today = timezone.localdate()
+    row(today)
+    ordered = sorted(day for day in days if day is not None)
+
+    # Walk backwards from today's live balance to derive each closing balance
+    closing_balance = {}
+    balance = _live_gauges()['wallet_balance']
+    for day in reversed(ordered):
+        closing_balance[day] = balance
+        balance -= days[day]['wallet_balance_delta']
+
+    objs = []
+    total_users = 0
+    active_appeals = 0
+    for day in ordered:
+        values = days[day]
+        total_users += values['new_users']
+        active_appeals += values.pop('appeals_opened')
+        objs.append(DailyPlatformMetrics(
+            date=day,
+            total_users=total_users,
+            active_appeals=active_appeals,
+            wallet_balance=closing_balance[day],
+            **values,
+        ))
+
+    with transaction.atomic():
+        DailyPlatformMetrics.objects.all().delete()
+        DailyPlatformMetrics.objects.bulk_create(objs, batch_size=500)
+    return len(objs)
@@ -0,0 +1,145 @@
+from functools import lru_cache
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from users.models import User
+from wallet.models import UserSearchEntry
+
+FTS_TABLE = 'wallet_usersearchentry_fts'
+TRGM_INDEX = 'wallet_usersearch_doc_trgm'
+# Search results rank at most this many best-matching users ahead of the rest
+MAX_MATCHED_USERS = 100
+# Both trigram backends need at least three characters to use their index
+MIN_INDEXED_LENGTH = 3
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def normalize(text):
+    return ' '.join((text or '').casefold().split())
+
+
+def build_document(first_name, last_name, email, phone=''):
+    return normalize(f'{first_name} {last_name} {email} {phone or ""}')
+
+
+def sync_user(user):
+    """Write the user's search document if it changed."""
+    document = build_document(user.first_name, user.last_name, user.email, user.phone)
+    if not UserSearchEntry.objects.filter(user_id=user.pk, document=document).exists():
+        UserSearchEntry.objects.update_or_create(user_id=user.pk, defaults={'document': document})
+
+
+def rebuild_user_search(chunk_size=DEFAULT_CHUNK_SIZE):
+    """Rewrite every search document from the users table. Returns the number written."""
+    written = 0
+    batch = []
+    users = User.objects.order_by('pk').values_list('pk', 'first_name', 'last_name', 'email', 'phone')
+    for pk, first_name, last_name, email, phone in users.iterator(chunk_size=chunk_size):
+        batch.append(UserSearchEntry(user_id=pk, document=build_document(first_name, last_name, email, phone)))
+        if len(batch) >= chunk_size:
+            written += _upsert(batch)
+            batch = []
+    if batch:
+        written += _upsert(batch)
+    return written
+
+
+def _upsert(batch):
+    UserSearchEntry.objects.bulk_create(
+        batch, update_conflicts=True, unique_fields=['user'], update_fields=['document']
+    )
+    return len(batch)
+
+
+@lru_cache(maxsize=None)
+def _sqlite_fts_available(database):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def search_backend():
+    """'postgres_trgm', 'sqlite_fts5', or 'basic' (unindexed LIKE) for the current database."""
+    if connection.vendor == 'postgresql':
+        return 'postgres_trgm'
+    if connection.vendor == 'sqlite' and _sqlite_fts_available(connection.settings_dict['NAME']):
+        return 'sqlite_fts5'
+    return 'basic'
+
+
+def _like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def search_user_ids(term, limit=MAX_MATCHED_USERS):
+    """
+    Ids of the users whose name, email or phone contains `term`, best match first.
+
+    Postgres ranks by trigram similarity and filters with LIKE through the
+    gin_trgm_ops index. sqlite matches the trigram-tokenized FTS5 table and
+    ranks by bm25. Terms shorter than three characters, and databases with
+    neither index, fall back to a LIKE scan of the (one row per user) search
+    table ordered by match position.
+    """
+    term = normalize(term)
+    if not term:
+        return []
+    backend = search_backend()
+    table = UserSearchEntry._meta.db_table
+    if len(term) < MIN_INDEXED_LENGTH:
+        backend = 'basic'
+
+    if backend == 'postgres_trgm':
+        sql = (
+            f"SELECT user_id FROM {table} WHERE document LIKE %s "
+            f"ORDER BY similarity(document, %s) DESC, user_id LIMIT %s"
+        )
+        params = [_like_pattern(term), term, limit]
+    elif backend == 'sqlite_fts5':
+        phrase = '"' + term.replace('"', '""') + '"'
+        sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY bm25({FTS_TABLE}), rowid LIMIT %s"
+        params = [phrase, limit]
+    else:
+        sql = (
+            f"SELECT user_id FROM {table} WHERE document LIKE %s ESCAPE '\\' "
+            f"ORDER BY INSTR(document, %s), user_id LIMIT %s"
+        )
+        if connection.vendor == 'postgresql':
+            sql = sql.replace('INSTR(document, %s)', 'STRPOS(document, %s)')
+        params = [_like_pattern(term), term, limit]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def matching_user_ids(term):
+    """
+    Every user whose name, email or phone contains `term`, as an unranked
+    subquery for `user_id__in=` filters. Unlike search_user_ids nothing is
+    capped, so a broad term still finds all of its matches; the same indexes
+    apply (FTS5 on sqlite, the trigram index serving LIKE on Postgres).
+    """
+    term = normalize(term)
+    entries = UserSearchEntry.objects.all()
+    if not term:
+        return entries.none().values('user_id')
+    if len(term) >= MIN_INDEXED_LENGTH and search_backend() == 'sqlite_fts5':
+        phrase = '"' + term.replace('"', '""') + '"'
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [phrase])
+        return entries.filter(user_id__in=matches).values('user_id')
+    return entries.filter(document__contains=term).values('user_id')
+
+
+def prefix_q(field, prefix):
+    """
+    Q for `field` starting with `prefix` (case-sensitive) in a form a plain
+    B-tree index can serve: LIKE 'prefix%' on Postgres (with a
+    varchar_pattern_ops index), a [prefix, prefix + U+10FFFF) range elsewhere.
+    """
+    if connection.vendor == 'postgresql':
+        return Q(**{f'{field}__startswith': prefix})
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\U0010ffff'})
@@ -1,118 +1,265 @@
-from django.db.models import Sum, Q
+import time
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum, Q, Case, When, Value, CharField, DecimalField, IntegerField
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim, TruncDay, TruncMonth
+from core.pagination import encode_cursor, decode_cursor, keyset_filter, timestamp_keyset_page
 from users.models import User
 from wallet.models import Wallet, WalletTransaction
+from wallet.services.user_search import matching_user_ids, search_user_ids
+from wallet.services.balance_checkpoints import day_range_q
+from settings.utils import local_date, platform_timezone
 from django.core.paginator import Paginator
 from django.utils import timezone
 
-def get_platform_overview():
-    total_withdrawn = WalletTransaction.objects.filter(type='debit').aggregate(total=Sum('amount'))['total'] or 0
-    total_credits = WalletTransaction.objects.filter(type='credit').aggregate(total=Sum('amount'))['total'] or 0
-    total_debits = WalletTransaction.objects.filter(type='debit').aggregate(total=Sum('amount'))['total'] or 0
-    total_transactions = WalletTransaction.objects.count()
-    total_balance = Wallet.objects.aggregate(total=Sum('balance'))['total'] or 0
+OVERVIEW_CACHE_KEY = 'wallet:platform_overview'
+OVERVIEW_VERSION_KEY = 'wallet:platform_overview:version'
+
+def _overview_version():
+    version = cache.get(OVERVIEW_VERSION_KEY)
+    if version is None:
+        cache.add(OVERVIEW_VERSION_KEY, 1, timeout=None)
+        version = cache.get(OVERVIEW_VERSION_KEY, 1)
+    return version
+
+def bump_platform_overview():
+    """
+    Invalidate the cached overview once the current transaction commits.
+    Entries are keyed by version, so an overview computed concurrently with
+    the write is stored under the old version and never served.
+    """
+    def bump():
+        try:
+            cache.incr(OVERVIEW_VERSION_KEY)
+        except ValueError:
+            cache.add(OVERVIEW_VERSION_KEY, 1, timeout=None)
+    transaction.on_commit(bump)
+
+def compute_platform_overview():
+    """Ledger totals in one conditional aggregate, plus the summed wallet balances."""
+    ledger = WalletTransaction.objects.aggregate(
+        total_transactions=Count('id'),
+        total_credits=Sum('amount', filter=Q(type='credit')),
+        total_debits=Sum('amount', filter=Q(type='debit')),
+    )
+    total_debits = float(ledger['total_debits'] or 0)
     return {
-        'total_transactions': total_transactions,
-        'total_credits': total_credits,
+        'total_transactions': ledger['total_transactions'],
+        'total_credits': float(ledger['total_credits'] or 0),
         'total_debits': total_debits,
-        'total_disbursed': total_withdrawn,
-        'total_withdrawn_amount': total_withdrawn,  # for backward compatibility
-        'total_current_balance': total_balance,
-    }, None
+        'total_disbursed': total_debits,
+        'total_withdrawn_amount': total_debits,  # for backward compatibility
+        'total_current_balance': float(Wallet.objects.aggregate(total=Sum('balance'))['total'] or 0),
+    }
 
-def get_recipient_wallet_stats(page=1, page_size=10):
-    recipients = User.objects.filter(role='recipient').order_by('-wallet__balance')
-    paginator = Paginator(recipients, page_size)
-    page_obj = paginator.get_page(page)
-    results = []
-    for user in page_obj:
-        wallet = getattr(user, 'wallet', None)
-        total_received = WalletTransaction.objects.filter(wallet__user=user, type='credit').aggregate(total=Sum('amount'))['total'] or 0
-        total_withdrawn = WalletTransaction.objects.filter(wallet__user=user, type='debit').aggregate(total=Sum('amount'))['total'] or 0
-        current_balance = wallet.balance if wallet else 0
-        # Use full_name property if it exists, else fallback to first + last name, else email
-        name = getattr(user, 'full_name', None)
-        if not name:
-            name = f"{user.first_name} {user.last_name}".strip() or user.email
-        results.append({
-            'id': user.id,
-            'name': name,
-            'email': user.email,
-            'total_received': total_received,
-            'total_withdrawn': total_withdrawn,
-            'current_balance': current_balance,
-        })
+def get_platform_overview(fresh=False):
+    """
+    Platform wallet totals, served from cache until a wallet transaction is
+    written (see bump_platform_overview) or WALLET_OVERVIEW_CACHE_TTL seconds
+    pass; the TTL bounds staleness when the write happened in another process
+    and the cache is not shared. fresh=True recomputes and re-caches.
+    The result carries computed_at, compute_ms, cache_age_seconds and cached.
+    """
+    version = _overview_version()
+    key = f'{OVERVIEW_CACHE_KEY}:{version}'
+    entry = None if fresh else cache.get(key)
+    cached = entry is not None
+    if entry is None:
+        started = time.perf_counter()
+        entry = {
+            'data': compute_platform_overview(),
+            'computed_at': timezone.now(),
+            'compute_ms': round((time.perf_counter() - started) * 1000, 3),
+        }
+        cache.set(key, entry, settings.WALLET_OVERVIEW_CACHE_TTL)
+    age = (timezone.now() - entry['computed_at']).total_seconds()
     return {
-        'count': paginator.count,
-        'next': page_obj.next_page_number() if page_obj.has_next() else None,
-        'previous': page_obj.previous_page_number() if page_obj.has_previous() else None,
-        'results': results,
+        **entry['data'],
+        'computed_at': entry['computed_at'].isoformat(),
+        'compute_ms': entry['compute_ms'],
+        'cache_age_seconds': round(max(age, 0), 3),
+        'cached': cached,
     }, None
 
-def get_recipient_withdrawals(user_id):
-    user = User.objects.filter(id=user_id, role='recipient').first()
-    if not user:
-        return None, 'Recipient not found or invalid role'
-    withdrawals = WalletTransaction.objects.filter(wallet__user=user, type='debit').order_by('-timestamp')
-    data = [
-        {'date': w.timestamp.date().isoformat(), 'amount': w.amount}
-        for w in withdrawals
-    ]
-    return data, None
-
-def get_recipient_transfers(user_id):
-    user = User.objects.filter(id=user_id, role='recipient').first()
-    if not user:
+RECIPIENT_SORT_FIELDS = {
+    'name': 'name',
+    'received': 'total_received',
+    'withdrawn': 'total_withdrawn',
+    'balance': 'current_balance',
+}
+MAX_RECIPIENT_PAGE_SIZE = 100
+
+def _recipient_rows():
+    """
+    Recipients with their wallet figures as one annotated values() queryset.
+    Totals come from the running totals on Wallet, so no ledger aggregation
+    is needed and every column is sortable in the database.
+    """
+    zero = Value(Decimal('0.00'), output_field=DecimalField(max_digits=14, decimal_places=2))
+    full_name = Trim(Concat('first_name', Value(' '), 'last_name'))
+    return User.objects.filter(role='recipient').annotate(
+        name=Coalesce(NullIf(full_name, Value('')), 'email', output_field=CharField()),
+        total_received=Coalesce('wallet__total_credited', zero),
+        total_withdrawn=Coalesce('wallet__total_debited', zero),
+        current_balance=Coalesce('wallet__balance', zero),
+    ).values('id', 'name', 'email', 'total_received', 'total_withdrawn', 'current_balance')
+
+def get_recipient_wallet_stats(page=1, page_size=10, sort='-balance', cursor=None):
+    """
+    One page of recipients with received/withdrawn/balance, in a single query.
+
+    sort is one of name, received, withdrawn, balance (prefix '-' for
+    descending); ties break on id. Passing cursor (use '' for the first page)
+    switches to keyset paging: the response carries next_cursor instead of
+    page numbers and count, and deep pages cost the same as the first.
+    """
+    descending = sort.startswith('-')
+    field = RECIPIENT_SORT_FIELDS.get(sort.lstrip('-'))
+    if field is None:
+        return None, f"Invalid sort; expected one of {', '.join(RECIPIENT_SORT_FIELDS)}"
+    page_size = max(1, min(int(page_size), MAX_RECIPIENT_PAGE_SIZE))
+    prefix = '-' if descending else ''
+    recipients = _recipient_rows().order_by(f'{prefix}{field}', f'{prefix}id')
+
+    if cursor is None:
+        paginator = Paginator(recipients, page_size)
+        page_obj = paginator.get_page(page)
+        return {
+            'count': paginator.count,
+            'next': page_obj.next_page_number() if page_obj.has_next() else None,
+            'previous': page_obj.previous_page_number() if page_obj.has_previous() else None,
+            'results': list(page_obj),
+        }, None
+
+    if cursor:
+        try:
+            value, pk = decode_cursor(cursor)
+            pk = int(pk)
+        except (ValueError, TypeError):
+            return None, 'Invalid cursor'
+        recipients = recipients.filter(keyset_filter(field, value, pk, descending))
+    rows = list(recipients[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        value = last[field]
+        next_cursor = encode_cursor(str(value) if isinstance(value, Decimal) else value, last['id'])
+    return {'results': rows, 'next_cursor': next_cursor}, None
+
+HISTORY_GROUPS = {'day': TruncDay, 'month': TruncMonth}
+HISTORY_PERIOD_FORMATS = {'day': '%Y-%m-%d', 'month': '%Y-%m'}
+MAX_HISTORY_PAGE_SIZE = 100
+
+def _recipient_history(user_id, tx_type, row, start=None, end=None, cursor=None, page_size=50, group_by=None):
+    """
+    One recipient's credits or debits on local days start..end, newest first.
+
+    Returns (data, error); error is set only when the recipient does not
+    exist. Without cursor or group_by data is the plain list of rows. With
+    cursor ('' for the first page) it is {'results', 'next_cursor'}, keyset
+    paged on (timestamp, id). group_by='day'|'month' returns per-period
+    {'period', 'count', 'amount'} aggregated in the database.
+    Raises ValueError for an unknown group_by or a malformed cursor.
+    """
+    if group_by is not None and group_by not in HISTORY_GROUPS:
+        raise ValueError(f"Invalid group_by; expected one of {', '.join(HISTORY_GROUPS)}")
+    if not User.objects.filter(id=user_id, role='recipient').exists():
         return None, 'Recipient not found or invalid role'
-    transfers = WalletTransaction.objects.filter(wallet__user=user, type='credit').order_by('-timestamp')
-    result = []
-    for t in transfers:
-        if hasattr(t, 'transferred_by_user') and t.transferred_by_user:
-            transferred_by = t.transferred_by_user.get_full_name() or t.transferred_by_user.email
-        else:
-            transferred_by = 'System'
-        result.append({
-            'date': t.timestamp.date().isoformat(),
-            'amount': t.amount,
-            'transferred_by': transferred_by,
-        })
-    return result, None
-
-def get_admin_transactions(page=1, page_size=10, search=None):
-    from users.models import User
-    qs = WalletTransaction.objects.select_related('wallet__user').order_by('-timestamp')
-    if search:
-        qs = qs.filter(
-            Q(wallet__user__first_name__icontains=search) |
-            Q(wallet__user__last_name__icontains=search) |
-            Q(wallet__user__email__icontains=search)
+    qs = WalletTransaction.objects.filter(wallet__user_id=user_id, type=tx_type).filter(day_range_q(start, end))
+
+    if group_by is not None:
+        period_format = HISTORY_PERIOD_FORMATS[group_by]
+        grouped = (
+            qs.annotate(period=HISTORY_GROUPS[group_by]('timestamp', tzinfo=platform_timezone()))
+            .values('period').annotate(count=Count('id'), amount=Sum('amount')).order_by('-period')
         )
+        return [
+            {'period': item['period'].strftime(period_format), 'count': item['count'], 'amount': item['amount']}
+            for item in grouped
+        ], None
+
+    qs = qs.order_by('-timestamp', '-id')
+    if cursor is None:
+        return [row(t) for t in qs], None
+    rows, next_cursor = timestamp_keyset_page(qs, cursor, max(1, min(int(page_size), MAX_HISTORY_PAGE_SIZE)))
+    return {'results': [row(t) for t in rows], 'next_cursor': next_cursor}, None
+
+def get_recipient_withdrawals(user_id, **options):
+    return _recipient_history(user_id, 'debit', lambda w: {
+        'date': local_date(w.timestamp).isoformat(),
+        'amount': w.amount,
+    }, **options)
+
+def get_recipient_transfers(user_id, **options):
+    return _recipient_history(user_id, 'credit', lambda t: {
+        'date': local_date(t.timestamp).isoformat(),
+        'amount': t.amount,
+        'transferred_by': t.transfer_by or 'System',
+    }, **options)
+
+def _admin_transaction_row(tx):
+    user = tx.wallet.user
+    name = getattr(user, 'full_name', None) or f"{user.first_name} {user.last_name}".strip() or user.email
+    # Appeal info
+    appeal = tx.appeal if hasattr(tx, 'appeal') else None
+    return {
+        'id': tx.id,
+        'user_name': name,
+        'user_email': user.email,
+        'user_role': getattr(user, 'role', None),
+        'user_id': user.id,
+        'amount': tx.amount,
+        'type': tx.type,
+        'description': tx.description or '',
+        'timestamp': tx.timestamp,
+        'appeal_id': appeal.id if appeal else None,
+        'appeal_title': appeal.title if appeal else '',
+        'appeal_status': appeal.status if appeal else '',
+        'appeal_amount_requested': appeal.amount_requested if appeal else None,
+        'transfer_by': getattr(tx, 'transfer_by', None),
+    }
+
+def get_admin_transactions(page=1, page_size=10, search=None, cursor=None):
+    """
+    All wallet transactions for the admin list, optionally narrowed by a
+    name/email search. Page mode lists the transactions of the best-matching
+    users (see MAX_MATCHED_USERS) first, then the rest of the matches. Passing
+    cursor ('' for the first page) switches to keyset paging on
+    (timestamp, id), newest first, returning results and next_cursor.
+    """
+    qs = WalletTransaction.objects.select_related('wallet__user', 'appeal').order_by('-timestamp', '-id')
+    if search:
+        # Every matching user's transactions: search index subquery, then the (wallet, timestamp) index
+        qs = qs.filter(wallet__in=Wallet.objects.filter(user_id__in=matching_user_ids(search)))
+
+    if cursor is not None:
+        try:
+            rows, next_cursor = timestamp_keyset_page(qs, cursor, max(1, min(int(page_size), 100)))
+        except ValueError as e:
+            return None, str(e)
+        return {
+            'results': [_admin_transaction_row(tx) for tx in rows],
+            'next_cursor': next_cursor,
+        }, None
+
+    if search:
+        # Page mode puts the best-matching users' transactions first, the rest after them
+        user_rank = {user_id: rank for rank, user_id in enumerate(search_user_ids(search))}
+        wallet_users = dict(Wallet.objects.filter(user_id__in=user_rank).values_list('id', 'user_id'))
+        if wallet_users:
+            qs = qs.order_by(
+                Case(*[When(wallet_id=wallet_id, then=Value(user_rank[user_id])) for wallet_id, user_id in wallet_users.items()],
+                     default=Value(len(user_rank)), output_field=IntegerField()),
+                '-timestamp', '-id',
+            )
     paginator = Paginator(qs, page_size)
     page_obj = paginator.get_page(page)
-    results = []
-    for tx in page_obj:
-        user = tx.wallet.user
-        name = getattr(user, 'full_name', None) or f"{user.first_name} {user.last_name}".strip() or user.email
-        # Appeal info
-        appeal = tx.appeal if hasattr(tx, 'appeal') else None
-        results.append({
-            'id': tx.id,
-            'user_name': name,
-            'user_email': user.email,
-            'user_role': getattr(user, 'role', None),
-            'user_id': user.id,
-            'amount': tx.amount,
-            'type': tx.type,
-            'description': tx.description or '',
-            'timestamp': tx.timestamp,
-            'appeal_id': appeal.id if appeal else None,
-            'appeal_title': appeal.title if appeal else '',
-            'appeal_status': appeal.status if appeal else '',
-            'appeal_amount_requested': appeal.amount_requested if appeal else None,
-            'transfer_by': getattr(tx, 'transfer_by', None),
-        })
     return {
         'count': paginator.count,
         'next': page_obj.next_page_number() if page_obj.has_next() else None,
         'previous': page_obj.previous_page_number() if page_obj.has_previous() else None,
-        'results': results,
-    }, None 
\ No newline at end of file
+        'results': [_admin_transaction_row(tx) for tx in page_obj],
+    }, None
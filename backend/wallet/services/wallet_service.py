@@ -1,5 +1,6 @@
-from decimal import Decimal
-from django.db import transaction, models
+from decimal import Decimal, InvalidOperation
+from django.db import connection, transaction, models
+from django.db.models import F, Case, When, Value
 from django.utils import timezone
 from django.core.exceptions import ValidationError, PermissionDenied
 from rest_framework.exceptions import PermissionDenied
@@ -8,54 +9,124 @@ from wallet.models import Wallet, WalletTransaction
 from appeals.models import Appeal
 from django.contrib.auth import get_user_model
 from wallet.utils import generate_description, resolve_transfer_by
+from wallet.services import platform_metrics, dashboard_snapshots
+from wallet.services.wallet_analytics import bump_platform_overview
 
 User = get_user_model()
 
-def create_wallet_for_user(user):
-    if not Wallet.objects.filter(user=user).exists():
-        return Wallet.objects.create(user=user, balance=Decimal('0.00'))
-    return Wallet.objects.get(user=user)
+# Wallets per set-based UPDATE in credit_wallets_bulk; keeps the CASE under bind-parameter limits
+BULK_UPDATE_CHUNK = 500
+# User ids per IN (...) list in get_wallet_stats_many
+STATS_CHUNK = 1000
+
+
+class InsufficientFundsError(ValueError):
+    """Raised when a debit would take a wallet below zero."""
 
-def credit_wallet(user, amount, appeal, donor=None, description=None, created_by=None, action_type=None):
-    if not isinstance(amount, Decimal):
-        amount = Decimal(str(amount))
-    wallet = Wallet.objects.select_for_update().get(user=user)
-    wallet.balance += amount
-    wallet.save()
 
-    # Determine description
+def _update_returning_supported():
+    if connection.vendor == 'postgresql':
+        return True
+    return connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35)
+
+def _apply_delta(user, tx_type, amount, require_funds=False):
+    """
+    Move a wallet's balance and running totals with one conditional
+    UPDATE ... SET balance = balance + x WHERE user_id = .. [AND balance >= x]
+    and return the updated Wallet. No row is read or locked beforehand, so
+    concurrent writers only serialize on the UPDATE itself.
+
+    Raises InsufficientFundsError when require_funds is set and the guard
+    fails, and Wallet.DoesNotExist when the user has no wallet.
+    """
+    credited = amount if tx_type == 'credit' else Decimal('0.00')
+    debited = Decimal('0.00') if tx_type == 'credit' else amount
+    user_id = getattr(user, 'pk', user)
+    if _update_returning_supported():
+        qn = connection.ops.quote_name
+        col = {
+            name: qn(Wallet._meta.get_field(name).column)
+            for name in ('balance', 'total_credited', 'total_debited', 'tx_count', 'user')
+        }
+        sql = (
+            f"UPDATE {qn(Wallet._meta.db_table)} SET "
+            f"{col['balance']} = {col['balance']} + %s, "
+            f"{col['total_credited']} = {col['total_credited']} + %s, "
+            f"{col['total_debited']} = {col['total_debited']} + %s, "
+            f"{col['tx_count']} = {col['tx_count']} + 1 "
+            f"WHERE {col['user']} = %s"
+        )
+        params = [credited - debited, credited, debited, user_id]
+        if require_funds:
+            sql += f" AND {col['balance']} >= %s"
+            params.append(amount)
+        updated = list(Wallet.objects.raw(sql + " RETURNING *", params))
+        wallet = updated[0] if updated else None
+    else:
+        queryset = Wallet.objects.filter(user_id=user_id)
+        if require_funds:
+            queryset = queryset.filter(balance__gte=amount)
+        rows = queryset.update(
+            balance=F('balance') + (credited - debited),
+            total_credited=F('total_credited') + credited,
+            total_debited=F('total_debited') + debited,
+            tx_count=F('tx_count') + 1,
+        )
+        wallet = Wallet.objects.get(user_id=user_id) if rows else None
+    if wallet is None:
+        if require_funds and Wallet.objects.filter(user_id=user_id).exists():
+            raise InsufficientFundsError('Insufficient balance')
+        raise Wallet.DoesNotExist('Wallet matching query does not exist.')
+    return wallet
+
+def _credit_description(appeal, description=None, action_type=None):
     if description:
-        desc = description
+        return description
     elif action_type == 'donation':
-        desc = f"Donation credited – Appeal #{appeal.pk}"
+        return f"Donation credited – Appeal #{appeal.pk}"
     elif action_type == 'withdrawal':
-        desc = f"Funds disbursed – Appeal #{appeal.pk}"
+        return f"Funds disbursed – Appeal #{appeal.pk}"
     elif action_type == 'rejected_withdrawal':
-        desc = f"Withdrawal rejected – Appeal #{appeal.pk}"
+        return f"Withdrawal rejected – Appeal #{appeal.pk}"
     elif action_type == 'admin_credit':
-        desc = "Manual credit added by Admin"
+        return "Manual credit added by Admin"
     elif action_type == 'manual_adjustment':
-        desc = "Manual balance adjustment"
+        return "Manual balance adjustment"
     elif action_type == 'refund':
-        desc = f"Refund issued – Appeal #{appeal.pk}"
-    else:
-        desc = "Transaction"
+        return f"Refund issued – Appeal #{appeal.pk}"
+    return "Transaction"
 
-    # Determine transfer_by
+def _credit_transfer_by(created_by=None, donor=None):
     if created_by:
         role = getattr(created_by, 'role', None)
         if role == 'donor':
-            transfer_by = 'Donor'
+            return 'Donor'
         elif role == 'admin':
-            transfer_by = 'Admin'
-        else:
-            transfer_by = 'System'
+            return 'Admin'
+        return 'System'
     elif donor:
-        transfer_by = 'Donor'
-    else:
-        transfer_by = 'System'
+        return 'Donor'
+    return 'System'
+
+def create_wallet_for_user(user):
+    if not Wallet.objects.filter(user=user).exists():
+        return Wallet.objects.create(user=user, balance=Decimal('0.00'))
+    return Wallet.objects.get(user=user)
 
-    WalletTransaction.objects.create(
+@transaction.atomic
+def credit_wallet(user, amount, appeal, donor=None, description=None, created_by=None, action_type=None):
+    """
+    Credit an appeal transfer or donation. Returns the WalletTransaction; its
+    .wallet is the updated Wallet.
+    """
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    wallet = _apply_delta(user, 'credit', amount)
+
+    desc = _credit_description(appeal, description, action_type)
+    transfer_by = _credit_transfer_by(created_by, donor)
+
+    return WalletTransaction.objects.create(
         wallet=wallet,
         type='credit',
         amount=amount,
@@ -64,17 +135,114 @@ def credit_wallet(user, amount, appeal, donor=None, description=None, created_by
         description=desc,
         transfer_by=transfer_by
     )
-    return wallet
 
+@transaction.atomic
+def credit_wallets_bulk(entries, created_by=None, action_type=None):
+    """
+    Credit many wallets in one transaction. Each entry is
+    (user, amount, appeal[, donor[, description]]).
+
+    Wallets are locked in id order with a single SELECT ... FOR UPDATE, the
+    ledger rows are bulk-inserted and balances/running totals move in one
+    set-based UPDATE per BULK_UPDATE_CHUNK wallets. Returns one result dict
+    per entry, in input order:
+    {'index', 'user_id', 'amount', 'status': 'credited'|'failed', 'transaction_id', 'balance', 'error'}.
+    Failed entries (bad amount, missing wallet) are skipped; the rest still commit.
+    """
+    rows = []
+    results = []
+    for index, entry in enumerate(entries):
+        user, amount, appeal, *extra = entry
+        donor = extra[0] if len(extra) > 0 else None
+        description = extra[1] if len(extra) > 1 else None
+        user_id = getattr(user, 'pk', user)
+        result = {
+            'index': index, 'user_id': user_id, 'amount': amount, 'status': 'failed',
+            'transaction_id': None, 'balance': None, 'error': None,
+        }
+        results.append(result)
+        try:
+            amount = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+        except (InvalidOperation, ValueError, TypeError):
+            result['error'] = 'Invalid amount'
+            continue
+        if amount <= 0:
+            result['error'] = 'Invalid amount'
+            continue
+        result['amount'] = amount
+        rows.append((result, user_id, amount, appeal, donor, description))
+
+    wallets = {
+        wallet.user_id: wallet
+        for wallet in Wallet.objects.select_for_update().filter(
+            user_id__in={row[1] for row in rows}
+        ).order_by('id')
+    }
+
+    pending = []
+    per_wallet = {}
+    for result, user_id, amount, appeal, donor, description in rows:
+        wallet = wallets.get(user_id)
+        if wallet is None:
+            result['error'] = 'Wallet not found'
+            continue
+        pending.append((result, WalletTransaction(
+            wallet=wallet,
+            type='credit',
+            amount=amount,
+            appeal=appeal,
+            donor=donor,
+            description=_credit_description(appeal, description, action_type),
+            transfer_by=_credit_transfer_by(created_by, donor),
+        )))
+        wallet.balance += amount
+        total, count = per_wallet.get(wallet.pk, (Decimal('0.00'), 0))
+        per_wallet[wallet.pk] = (total + amount, count + 1)
+        result['status'] = 'credited'
+        result['balance'] = wallet.balance
+
+    if not pending:
+        return results
+
+    created = WalletTransaction.objects.bulk_create([tx for _, tx in pending], batch_size=500)
+    for (result, _), tx in zip(pending, created):
+        result['transaction_id'] = tx.pk
+
+    items = list(per_wallet.items())
+    for start in range(0, len(items), BULK_UPDATE_CHUNK):
+        chunk = items[start:start + BULK_UPDATE_CHUNK]
+        amount_delta = Case(
+            *[When(pk=pk, then=Value(total)) for pk, (total, _) in chunk],
+            output_field=models.DecimalField(max_digits=14, decimal_places=2),
+        )
+        count_delta = Case(
+            *[When(pk=pk, then=Value(count)) for pk, (_, count) in chunk],
+            output_field=models.IntegerField(),
+        )
+        Wallet.objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+            balance=F('balance') + amount_delta,
+            total_credited=F('total_credited') + amount_delta,
+            tx_count=F('tx_count') + count_delta,
+        )
+
+    # bulk_create and update() bypass post_save, so feed the rollups directly
+    platform_metrics.record_wallet_delta(sum(total for total, _ in per_wallet.values()))
+    dashboard_snapshots.mark_dirty()
+    bump_platform_overview()
+    return results
+
+@transaction.atomic
 def debit_wallet(user, amount, appeal=None, created_by=None):
+    """
+    Debit a withdrawal, refusing to overdraw (InsufficientFundsError). Returns
+    the WalletTransaction; its .wallet is the updated Wallet.
+    """
     if not isinstance(amount, Decimal):
         amount = Decimal(str(amount))
-    wallet = Wallet.objects.select_for_update().get(user=user)
-    wallet.balance -= amount
-    wallet.save()
+    wallet = _apply_delta(user, 'debit', amount, require_funds=True)
     description = generate_description('withdrawal', appeal)
     transfer_by = resolve_transfer_by(created_by)
-    WalletTransaction.objects.create(
+    return WalletTransaction.objects.create(
         wallet=wallet,
         type='debit',
         amount=amount,
@@ -83,14 +251,18 @@ def debit_wallet(user, amount, appeal=None, created_by=None):
         description=description,
         transfer_by=transfer_by
     )
-    return wallet
 
+@transaction.atomic
 def reject_withdrawal(appeal, created_by):
+    """
+    Record a zero-amount entry for a rejected withdrawal. Returns the
+    WalletTransaction; its .wallet is the updated Wallet.
+    """
     user = appeal.beneficiary
-    wallet = Wallet.objects.select_for_update().get(user=user)
+    wallet = _apply_delta(user, 'debit', Decimal('0.00'))
     description = generate_description('rejected_withdrawal', appeal)
     transfer_by = 'Admin'
-    WalletTransaction.objects.create(
+    return WalletTransaction.objects.create(
         wallet=wallet,
         type='debit',
         amount=0,
@@ -99,17 +271,19 @@ def reject_withdrawal(appeal, created_by):
         description=description,
         transfer_by=transfer_by
     )
-    return wallet
 
+@transaction.atomic
 def manual_credit(user, amount, created_by):
+    """
+    Credit by an admin. Returns the WalletTransaction; its .wallet is the
+    updated Wallet.
+    """
     if not isinstance(amount, Decimal):
         amount = Decimal(str(amount))
-    wallet = Wallet.objects.select_for_update().get(user=user)
-    wallet.balance += amount
-    wallet.save()
+    wallet = _apply_delta(user, 'credit', amount)
     description = generate_description('admin_credit')
     transfer_by = 'Admin'
-    WalletTransaction.objects.create(
+    return WalletTransaction.objects.create(
         wallet=wallet,
         type='credit',
         amount=amount,
@@ -118,17 +292,19 @@ def manual_credit(user, amount, created_by):
         description=description,
         transfer_by=transfer_by
     )
-    return wallet
 
+@transaction.atomic
 def adjust_wallet_balance(user, amount, reason, created_by):
+    """
+    Signed admin adjustment with a reason. Returns the WalletTransaction; its
+    .wallet is the updated Wallet.
+    """
     if not isinstance(amount, Decimal):
         amount = Decimal(str(amount))
-    wallet = Wallet.objects.select_for_update().get(user=user)
-    wallet.balance += amount
-    wallet.save()
+    wallet = _apply_delta(user, 'credit' if amount > 0 else 'debit', abs(amount))
     description = generate_description('manual_adjustment', reason=reason)
     transfer_by = 'Admin'
-    WalletTransaction.objects.create(
+    return WalletTransaction.objects.create(
         wallet=wallet,
         type='credit' if amount > 0 else 'debit',
         amount=abs(amount),
@@ -137,17 +313,19 @@ def adjust_wallet_balance(user, amount, reason, created_by):
         description=description,
         transfer_by=transfer_by
     )
-    return wallet
 
+@transaction.atomic
 def issue_refund(user, amount, appeal=None, created_by=None):
+    """
+    Credit a refund. Returns the WalletTransaction; its .wallet is the updated
+    Wallet.
+    """
     if not isinstance(amount, Decimal):
         amount = Decimal(str(amount))
-    wallet = Wallet.objects.select_for_update().get(user=user)
-    wallet.balance += amount
-    wallet.save()
+    wallet = _apply_delta(user, 'credit', amount)
     description = generate_description('refund', appeal)
     transfer_by = resolve_transfer_by(created_by)
-    WalletTransaction.objects.create(
+    return WalletTransaction.objects.create(
         wallet=wallet,
         type='credit',
         amount=amount,
@@ -156,7 +334,70 @@ def issue_refund(user, amount, appeal=None, created_by=None):
         description=description,
         transfer_by=transfer_by
     )
-    return wallet
+
+@transaction.atomic
+def withdraw_funds(user, amount):
+    """
+    Debit a recipient-initiated withdrawal and return its WalletTransaction.
+    Raises InsufficientFundsError if the balance does not cover the amount.
+    """
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    create_wallet_for_user(user)
+    wallet = _apply_delta(user, 'debit', amount, require_funds=True)
+    return WalletTransaction.objects.create(
+        wallet=wallet,
+        type='debit',
+        amount=amount,
+        appeal=None,
+        donor=None,
+        description=generate_description('withdrawal'),
+        transfer_by=resolve_transfer_by(user)
+    )
+
+def _empty_stats():
+    return {'total_credited': Decimal('0.00'), 'total_withdrawn': Decimal('0.00')}
+
+def get_wallet_stats_many(user_ids):
+    """
+    Get wallet statistics for many users with two grouped queries.
+
+    Args:
+        user_ids: Iterable of user ids, or a values_list('id') QuerySet (run as a subquery)
+
+    Returns:
+        dict: {user_id: {'total_credited', 'total_withdrawn', 'available_balance'}},
+        with zeros for users that have no fulfilled appeals or debits
+    """
+    if isinstance(user_ids, models.QuerySet):
+        chunks = [user_ids]
+        stats = {}
+    else:
+        user_ids = list(dict.fromkeys(user_ids))
+        chunks = [user_ids[i:i + STATS_CHUNK] for i in range(0, len(user_ids), STATS_CHUNK)]
+        stats = {user_id: _empty_stats() for user_id in user_ids}
+
+    for chunk in chunks:
+        # Total credited: sum of fulfilled appeals per beneficiary
+        credited = (
+            Appeal.objects.filter(beneficiary_id__in=chunk, status='fulfilled')
+            .values('beneficiary_id').annotate(total=models.Sum('amount_requested'))
+        )
+        for row in credited:
+            entry = stats.setdefault(row['beneficiary_id'], _empty_stats())
+            entry['total_credited'] = row['total'] or Decimal('0.00')
+        # Total withdrawn: sum of debit transactions per wallet owner
+        withdrawn = (
+            WalletTransaction.objects.filter(wallet__user_id__in=chunk, type='debit')
+            .values('wallet__user_id').annotate(total=models.Sum('amount'))
+        )
+        for row in withdrawn:
+            entry = stats.setdefault(row['wallet__user_id'], _empty_stats())
+            entry['total_withdrawn'] = row['total'] or Decimal('0.00')
+
+    for entry in stats.values():
+        entry['available_balance'] = entry['total_credited'] - entry['total_withdrawn']
+    return stats
 
 def get_wallet_stats(user):
     """
@@ -168,25 +409,7 @@ def get_wallet_stats(user):
     Returns:
         dict: Wallet statistics including credited and withdrawn amounts
     """
-    # Total credited: sum of fulfilled appeals for this user
-    total_credited = Appeal.objects.filter(
-        beneficiary=user, 
-        status='fulfilled'
-    ).aggregate(total=models.Sum('amount_requested'))['total'] or Decimal('0.00')
-    
-    # Total withdrawn: sum of debit transactions for this user
-    total_withdrawn = WalletTransaction.objects.filter(
-        wallet__user=user, 
-        type='debit'
-    ).aggregate(total=models.Sum('amount'))['total'] or Decimal('0.00')
-    
-    available_balance = total_credited - total_withdrawn
-    
-    return {
-        'total_credited': total_credited,
-        'total_withdrawn': total_withdrawn,
-        'available_balance': available_balance
-    }
+    return get_wallet_stats_many([user.pk])[user.pk]
 
 def get_available_balance(user):
     """
@@ -0,0 +1,132 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from users.models import User
+from wallet.models import Wallet, WalletTransaction
+from wallet.services.wallet_analytics import bump_platform_overview
+
+TOTAL_FIELDS = ('total_credited', 'total_debited', 'tx_count')
+CHECK_FIELDS = ('balance',) + TOTAL_FIELDS
+LEGACY_FIELD = 'user.wallet_balance'
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _ledger_aggregates():
+    return dict(
+        credited=Sum('amount', filter=Q(type='credit')),
+        debited=Sum('amount', filter=Q(type='debit')),
+        count=Count('id'),
+    )
+
+
+def _expected(row):
+    credited = (row or {}).get('credited') or Decimal('0.00')
+    debited = (row or {}).get('debited') or Decimal('0.00')
+    return {
+        'balance': credited - debited,
+        'total_credited': credited,
+        'total_debited': debited,
+        'tx_count': (row or {}).get('count') or 0,
+    }
+
+
+def iter_ledger_positions(start_id=None, end_id=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream (wallet, expected) pairs in wallet-id order for ids in [start_id, end_id].
+
+    Each chunk is one keyset page of wallets plus one grouped ledger query over
+    that page's id range, read through a server-side iterator, so memory stays
+    flat however many wallets there are. `wallet` is a values() dict with the
+    stored balance/totals and the legacy user__wallet_balance; `expected` is the
+    same shape recomputed from WalletTransaction.
+    """
+    wallets = Wallet.objects.order_by('id').values('id', 'user_id', *CHECK_FIELDS, 'user__wallet_balance')
+    if start_id is not None:
+        wallets = wallets.filter(id__gte=start_id)
+    if end_id is not None:
+        wallets = wallets.filter(id__lte=end_id)
+    last_id = None
+    while True:
+        page = list((wallets.filter(id__gt=last_id) if last_id is not None else wallets)[:chunk_size])
+        if not page:
+            return
+        low, high = page[0]['id'], page[-1]['id']
+        grouped = {
+            row['wallet_id']: row
+            for row in WalletTransaction.objects.filter(wallet_id__gte=low, wallet_id__lte=high)
+            .values('wallet_id').annotate(**_ledger_aggregates()).order_by().iterator(chunk_size=chunk_size)
+        }
+        for wallet in page:
+            yield wallet, _expected(grouped.get(wallet['id']))
+        last_id = high
+
+
+def find_total_mismatches():
+    """
+    Compare each wallet's stored running totals with the ledger. Returns a list
+    of {'wallet_id', 'user_id', 'stored', 'expected'} for wallets that drifted.
+    """
+    mismatches = []
+    for wallet, expected in iter_ledger_positions():
+        stored = {field: wallet[field] for field in TOTAL_FIELDS}
+        expected = {field: expected[field] for field in TOTAL_FIELDS}
+        if stored != expected:
+            mismatches.append({
+                'wallet_id': wallet['id'],
+                'user_id': wallet['user_id'],
+                'stored': stored,
+                'expected': expected,
+            })
+    return mismatches
+
+
+def repair_totals(mismatches):
+    """Overwrite the stored totals with the ledger values. Returns the number of wallets fixed."""
+    for item in mismatches:
+        Wallet.objects.filter(pk=item['wallet_id']).update(**item['expected'])
+    return len(mismatches)
+
+
+@transaction.atomic
+def fix_wallet(wallet_id):
+    """
+    Reset one wallet's balance and totals, and the legacy User.wallet_balance,
+    to the ledger. The ledger is re-read under the wallet's row lock so a
+    concurrent write cannot slip between the check and the fix.
+    """
+    wallet = Wallet.objects.select_for_update().get(pk=wallet_id)
+    expected = _expected(
+        WalletTransaction.objects.filter(wallet_id=wallet_id).aggregate(**_ledger_aggregates())
+    )
+    Wallet.objects.filter(pk=wallet_id).update(**expected)
+    User.objects.filter(pk=wallet.user_id).update(wallet_balance=expected['balance'])
+    bump_platform_overview()
+    return expected
+
+
+def reconcile_range(start_id, end_id, chunk_size=DEFAULT_CHUNK_SIZE, fix=False):
+    """
+    Check wallets with ids in [start_id, end_id] against the ledger. Returns
+    (wallets_checked, discrepancies) where each discrepancy is a compact
+    {'wallet_id', 'user_id', 'field', 'stored', 'expected'} row; a drifted
+    legacy User.wallet_balance is reported as field 'user.wallet_balance'.
+    With fix=True every drifted wallet is reset to the ledger.
+    """
+    checked = 0
+    discrepancies = []
+    for wallet, expected in iter_ledger_positions(start_id, end_id, chunk_size):
+        checked += 1
+        rows = [
+            {'wallet_id': wallet['id'], 'user_id': wallet['user_id'], 'field': field,
+             'stored': wallet[field], 'expected': expected[field]}
+            for field in CHECK_FIELDS if wallet[field] != expected[field]
+        ]
+        if wallet['user__wallet_balance'] != expected['balance']:
+            rows.append({'wallet_id': wallet['id'], 'user_id': wallet['user_id'], 'field': LEGACY_FIELD,
+                         'stored': wallet['user__wallet_balance'], 'expected': expected['balance']})
+        if rows and fix:
+            fix_wallet(wallet['id'])
+        discrepancies.extend(rows)
+    return checked, discrepancies
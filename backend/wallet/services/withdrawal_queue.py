@@ -0,0 +1,117 @@
+import logging
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from wallet.models import Wallet, WithdrawalRequest
+from wallet.services import wallet_service
+from wallet.services.wallet_service import InsufficientFundsError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 20
+# Requests left in 'processing' longer than this belong to a dead worker
+STALE_CLAIM_AFTER = timedelta(minutes=5)
+
+
+def enqueue_withdrawal(user, amount):
+    """Queue a withdrawal for the worker. Returns the pending WithdrawalRequest."""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return WithdrawalRequest.objects.create(user=user, amount=amount)
+
+
+def claim_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Move up to batch_size pending requests to 'processing' for this worker and
+    return them, oldest first. Uses SELECT ... FOR UPDATE SKIP LOCKED where the
+    database supports it so concurrent workers never wait on each other's rows.
+    Elsewhere (SQLite) one UPDATE ... WHERE status='pending' AND id IN
+    (SELECT ... LIMIT n) claims the rows: it is a write from the first
+    statement, so workers queue on the busy timeout instead of failing a
+    read-to-write lock upgrade, and two workers cannot both win a row.
+    """
+    token = uuid.uuid4().hex
+    claim = {'status': 'processing', 'claim_token': token, 'claimed_at': timezone.now()}
+    pending = WithdrawalRequest.objects.filter(status='pending').order_by('created_at', 'id')
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(pending.select_for_update(skip_locked=True).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return []
+            WithdrawalRequest.objects.filter(id__in=ids).update(**claim)
+    elif not WithdrawalRequest.objects.filter(
+        id__in=pending.values('id')[:batch_size], status='pending'
+    ).update(**claim):
+        return []
+    return list(
+        WithdrawalRequest.objects.filter(claim_token=token, status='processing')
+        .select_related('user').order_by('created_at', 'id')
+    )
+
+
+def process_request(request):
+    """
+    Settle one claimed request with debit_wallet and record the outcome. The
+    debit and the status change commit together, so a worker that dies midway
+    leaves the request in 'processing' with no money moved. Returns None if
+    the claim was lost: a slow worker whose claim went stale and was taken
+    over by another worker must not pay out as well.
+    """
+    with transaction.atomic():
+        # Re-assert ownership; the row stays locked until commit, so the claim cannot be released meanwhile
+        if not WithdrawalRequest.objects.filter(
+            pk=request.pk, claim_token=request.claim_token, status='processing'
+        ).update(claimed_at=timezone.now()):
+            logger.warning("Withdrawal request %s was re-claimed by another worker; skipping", request.id)
+            return None
+        try:
+            with transaction.atomic():
+                request.transaction = wallet_service.debit_wallet(request.user, request.amount, created_by=request.user)
+                request.status = 'completed'
+        except InsufficientFundsError:
+            request.status, request.error = 'failed', 'Insufficient balance'
+        except Wallet.DoesNotExist:
+            request.status, request.error = 'failed', 'Wallet not found'
+        request.processed_at = timezone.now()
+        request.save(update_fields=['status', 'transaction', 'error', 'processed_at'])
+    return request
+
+
+def process_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """Claim and settle one batch. Returns the processed requests."""
+    processed = []
+    for request in claim_batch(batch_size):
+        try:
+            settled = process_request(request)
+            if settled is not None:
+                processed.append(settled)
+        except Exception:
+            # Nothing was debited (the transaction rolled back); fail it rather than retry forever
+            logger.exception("Withdrawal request %s failed unexpectedly", request.id)
+            WithdrawalRequest.objects.filter(pk=request.pk, claim_token=request.claim_token).update(
+                status='failed', error='Processing error', processed_at=timezone.now()
+            )
+    return processed
+
+
+def release_stale_claims(older_than=STALE_CLAIM_AFTER):
+    """Put requests claimed by a worker that died back in the queue. Returns the count."""
+    return WithdrawalRequest.objects.filter(
+        status='processing', claimed_at__lt=timezone.now() - older_than
+    ).update(status='pending', claim_token='')
+
+
+def serialize_request(request):
+    return {
+        'id': request.id,
+        'amount': float(request.amount),
+        'status': request.status,
+        'error': request.error or None,
+        'transaction_id': request.transaction_id,
+        'created_at': request.created_at.isoformat(),
+        'processed_at': request.processed_at.isoformat() if request.processed_at else None,
+    }
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+
+from appeals.models import Appeal
+from donations.models import Donation
+from wallet.models import WalletTransaction
+from wallet.services import activity_feed
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Donation)
+def feed_donation(sender, instance, created, **kwargs):
+    if created:
+        activity_feed.record_donation(instance)
+
+
+@receiver(post_save, sender=Appeal)
+def feed_appeal(sender, instance, created, **kwargs):
+    if created:
+        activity_feed.record_appeal(instance)
+
+
+@receiver(post_save, sender=User)
+def feed_user(sender, instance, created, **kwargs):
+    if created:
+        activity_feed.record_user(instance)
+
+
+@receiver(post_save, sender=WalletTransaction)
+def feed_withdrawal(sender, instance, created, **kwargs):
+    if created and instance.type == 'debit':
+        activity_feed.record_withdrawal(instance)
@@ -0,0 +1,87 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+
+from appeals.models import Appeal
+from donations.models import Donation
+from wallet.models import Wallet, WalletTransaction
+from wallet.services import platform_metrics, appeal_processing
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Donation)
+def rollup_donation(sender, instance, created, **kwargs):
+    """Add new donations to today's rollup row."""
+    if created:
+        platform_metrics.record_donation(instance.amount)
+
+
+@receiver(post_save, sender=User)
+def rollup_new_user(sender, instance, created, **kwargs):
+    """Count new registrations in today's rollup row."""
+    if created:
+        platform_metrics.record_new_user()
+
+
+@receiver(post_delete, sender=Donation)
+def rollup_deleted_donation(sender, instance, **kwargs):
+    """
+    Take deleted donations back out of the day they were counted in. Like the
+    handlers below this covers cascades and QuerySet.delete(); raw SQL deletes
+    bypass signals, so run backfill_platform_metrics after those.
+    """
+    platform_metrics.record_donation_deleted(instance.amount, instance.created_at)
+
+
+@receiver(post_delete, sender=User)
+def rollup_deleted_user(sender, instance, **kwargs):
+    """Uncount the sign-up and drop the user from the running total."""
+    platform_metrics.record_user_deleted(instance.date_joined)
+
+
+@receiver(post_delete, sender=Appeal)
+def rollup_deleted_appeal(sender, instance, **kwargs):
+    """A deleted active appeal leaves the active set."""
+    platform_metrics.record_appeal_transition(instance.status, None)
+
+
+@receiver(post_delete, sender=Wallet)
+def rollup_deleted_wallet(sender, instance, **kwargs):
+    """A deleted wallet's balance leaves the platform total."""
+    platform_metrics.record_wallet_deleted(instance.balance)
+
+
+@receiver(pre_save, sender=Appeal)
+def remember_appeal_status(sender, instance, **kwargs):
+    """Stash the stored status so post_save can tell whether it changed."""
+    if instance.pk:
+        instance._previous_status = (
+            Appeal.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        )
+    else:
+        instance._previous_status = None
+
+
+@receiver(post_save, sender=Appeal)
+def rollup_appeal_status(sender, instance, created, **kwargs):
+    """Track appeals entering or leaving the active set, and decision latency."""
+    previous = None if created else getattr(instance, '_previous_status', None)
+    if previous != instance.status:
+        platform_metrics.record_appeal_transition(previous, instance.status)
+        appeal_processing.record_decision(instance, previous)
+
+
+@receiver(post_save, sender=Wallet)
+def rollup_wallet_opening_balance(sender, instance, created, **kwargs):
+    """Wallets created with a non-zero balance move the platform total."""
+    if created and instance.balance:
+        platform_metrics.record_wallet_delta(instance.balance)
+
+
+@receiver(post_save, sender=WalletTransaction)
+def rollup_wallet_transaction(sender, instance, created, **kwargs):
+    """Apply each ledger entry to today's wallet balance delta."""
+    if created:
+        amount = instance.amount if instance.type == 'credit' else -instance.amount
+        platform_metrics.record_wallet_delta(amount)
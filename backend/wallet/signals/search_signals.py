@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+
+from wallet.services import user_search
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def sync_user_search(sender, instance, **kwargs):
+    """Keep the user's normalized search document in step with name/email edits."""
+    user_search.sync_user(instance)
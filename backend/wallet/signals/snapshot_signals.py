@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+
+from appeals.models import Appeal
+from donations.models import Donation
+from wallet.models import Wallet, WalletTransaction
+from wallet.services import dashboard_snapshots
+from wallet.services.wallet_analytics import bump_platform_overview
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Donation)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Appeal)
+@receiver(post_save, sender=Wallet)
+@receiver(post_save, sender=WalletTransaction)
+def mark_dashboard_dirty(sender, **kwargs):
+    """Any write that feeds the dashboard tiles invalidates the snapshots."""
+    dashboard_snapshots.mark_dirty()
+
+
+@receiver(post_save, sender=Wallet)
+@receiver(post_save, sender=WalletTransaction)
+def invalidate_platform_overview(sender, **kwargs):
+    """Ledger and balance writes make the cached admin overview stale."""
+    bump_platform_overview()
@@ -0,0 +1,77 @@
+from decimal import Decimal
+from django.core.management import call_command
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from appeals.models import Appeal
+from donations.models import Donation
+from wallet.models import Wallet, ActivityEvent
+from wallet.services.wallet_service import credit_wallet, debit_wallet
+from wallet.services.activity_feed import get_activity_feed
+
+
+class ActivityFeedTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        self.donor = User.objects.create_user(
+            email='donor@example.com', password='donorpass', role='donor', first_name='Donor', last_name='User', phone='1234567892'
+        )
+        self.wallet = Wallet.objects.create(user=self.recipient, balance=0)
+        self.appeal = Appeal.objects.create(
+            title='Medical Help',
+            description='Help needed for surgery',
+            category='medical',
+            amount_requested=20000,
+            created_by=self.recipient,
+            beneficiary=self.recipient,
+            status='approved',
+            approved_by=self.admin
+        )
+        Donation.objects.create(donor=self.donor, amount=Decimal('500.00'), payment_method='jazzcash')
+        credit_wallet(self.recipient, Decimal('300.00'), self.appeal, action_type='donation')
+        debit_wallet(self.recipient, Decimal('100.00'), self.appeal, created_by=self.recipient)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_events_written_on_create(self):
+        types = sorted(ActivityEvent.objects.values_list('type', flat=True))
+        # 3 users, 1 appeal, 1 donation, 1 debit (the credit is not a feed event)
+        self.assertEqual(types, ['appeal', 'donation', 'user', 'user', 'user', 'withdrawal'])
+        donation = ActivityEvent.objects.get(type='donation')
+        self.assertEqual(donation.actor_name, 'Donor User')
+        self.assertEqual(donation.amount, Decimal('500.00'))
+
+    def test_feed_is_one_query(self):
+        with self.assertNumQueries(1):
+            activities, _, _ = get_activity_feed(limit=10)
+        self.assertEqual(len(activities), 6)
+
+    def test_cursor_pagination_walks_whole_feed(self):
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 4}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get('/api/dashboard/recent-activity/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(a['id'] for a in response.data['activities'])
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(len(set(seen)), 6)
+
+    def test_invalid_cursor_returns_400(self):
+        response = self.client.get('/api/dashboard/recent-activity/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_backfill_rebuilds_feed(self):
+        ActivityEvent.objects.all().delete()
+        call_command('backfill_activity_events', stdout=open('/dev/null', 'w'))
+        self.assertEqual(ActivityEvent.objects.count(), 6)
@@ -0,0 +1,91 @@
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from appeals.models import Appeal
+from wallet.models import AppealProcessingHistogram
+from wallet.services.appeal_processing import bucket_for, get_processing_summary
+
+
+class AppealProcessingTimeTests(APITestCase):
+    def setUp(self):
+        self.shura = User.objects.create_user(
+            email='shura@example.com', password='shurapass', role='shura', first_name='Shura', last_name='Member', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.shura)
+
+    def decide(self, category, hours, outcome='approved'):
+        appeal = Appeal.objects.create(
+            title=f'{category} appeal', description='Test', category=category, amount_requested=1000,
+            created_by=self.recipient, beneficiary=self.recipient, status='pending'
+        )
+        now = timezone.now()
+        Appeal.objects.filter(pk=appeal.pk).update(created_at=now - timedelta(hours=hours))
+        appeal.refresh_from_db()
+        appeal.status = outcome
+        if outcome == 'approved':
+            appeal.approved_by = self.shura
+            appeal.approved_at = now
+        else:
+            appeal.rejected_by = self.shura
+            appeal.rejected_at = now
+            appeal.rejection_reason = 'Incomplete documents'
+        appeal.save()
+        return appeal
+
+    def test_transition_updates_histogram(self):
+        self.decide('medical', 10)
+        row = AppealProcessingHistogram.objects.get()
+        self.assertEqual(row.outcome, 'approved')
+        self.assertEqual(row.bucket, bucket_for(10))
+        self.assertEqual(row.count, 1)
+        self.assertAlmostEqual(row.total_seconds / 3600, 10, places=1)
+
+    def test_re_decided_appeal_is_sampled_once(self):
+        appeal = self.decide('medical', 10)
+        appeal.status = 'rejected'
+        appeal.rejected_by = self.shura
+        appeal.rejected_at = timezone.now()
+        appeal.rejection_reason = 'Incomplete documents'
+        appeal.save()
+        appeal.status = 'approved'
+        appeal.save()
+        row = AppealProcessingHistogram.objects.get()
+        self.assertEqual((row.outcome, row.count), ('approved', 1))
+        self.assertEqual(get_processing_summary()['overall']['count'], 1)
+
+    def test_summary_percentiles_and_average(self):
+        self.decide('medical', 3)
+        self.decide('school_fee', 10)
+        self.decide('debt', 100, outcome='rejected')
+        summary = get_processing_summary()
+        self.assertEqual(summary['overall']['count'], 3)
+        self.assertAlmostEqual(summary['overall']['avg_hours'], (3 + 10 + 100) / 3, places=1)
+        p50 = summary['overall']['p50_hours']
+        self.assertTrue(8 <= p50 <= 12)
+        self.assertTrue(72 <= summary['overall']['p99_hours'] <= 120)
+        self.assertEqual(summary['by_outcome']['rejected']['count'], 1)
+        self.assertEqual(len(summary['monthly']), 1)
+        self.assertEqual(summary['monthly'][0]['approved'], 2)
+
+    def test_rebuild_matches_incremental(self):
+        self.decide('medical', 3)
+        self.decide('debt', 100, outcome='rejected')
+        incremental = list(AppealProcessingHistogram.objects.values_list('month', 'outcome', 'bucket', 'count'))
+        call_command('backfill_processing_histogram', stdout=open('/dev/null', 'w'))
+        rebuilt = list(AppealProcessingHistogram.objects.values_list('month', 'outcome', 'bucket', 'count'))
+        self.assertEqual(sorted(rebuilt), sorted(incremental))
+
+    def test_shura_summary_endpoint(self):
+        self.decide('medical', 10)
+        response = self.client.get('/api/dashboard/shura-summary/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertAlmostEqual(response.data['avg_processing_time_hours'], 10, places=1)
+        self.assertEqual(response.data['total_withdrawals'], 0)
+        self.assertIn('p90_hours', response.data['processing_time']['overall'])
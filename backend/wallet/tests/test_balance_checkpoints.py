@@ -0,0 +1,106 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from wallet.models import Wallet, WalletTransaction, WalletBalanceCheckpoint
+from wallet.services import wallet_service
+from settings.models import Setting
+from settings.utils import local_date
+from wallet.services.balance_checkpoints import balance_at, create_checkpoints, day_range_q, local_midnight
+
+
+def at(day, hour=12):
+    return timezone.make_aware(datetime(day.year, day.month, day.day, hour))
+
+
+class BalanceCheckpointTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        wallet_service.create_wallet_for_user(self.recipient)
+        self.wallet = Wallet.objects.get(user=self.recipient)
+        self.post(date(2025, 1, 10), 'credit', 100)
+        self.post(date(2025, 1, 20), 'debit', 30)
+        self.post(date(2025, 2, 5), 'credit', 50)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.recipient)
+
+    def post(self, day, tx_type, amount):
+        if tx_type == 'credit':
+            wallet_service.manual_credit(self.recipient, amount, self.admin)
+        else:
+            wallet_service.debit_wallet(self.recipient, amount, created_by=self.admin)
+        tx = WalletTransaction.objects.latest('id')
+        WalletTransaction.objects.filter(pk=tx.pk).update(timestamp=at(day))
+
+    def test_balance_at_without_checkpoints_replays_ledger(self):
+        self.assertEqual(balance_at(self.wallet, local_midnight(date(2025, 1, 15))), Decimal('100.00'))
+        self.assertEqual(balance_at(self.wallet, local_midnight(date(2025, 2, 1))), Decimal('70.00'))
+        self.assertEqual(balance_at(self.wallet, timezone.now()), Decimal('120.00'))
+
+    def test_checkpoints_chain_and_are_used(self):
+        self.assertEqual(create_checkpoints(local_midnight(date(2025, 1, 15))), 1)
+        self.assertEqual(create_checkpoints(local_midnight(date(2025, 2, 1))), 1)
+        self.assertEqual(create_checkpoints(local_midnight(date(2025, 2, 1))), 0)
+        checkpoint = WalletBalanceCheckpoint.objects.get(as_of=local_midnight(date(2025, 2, 1)))
+        self.assertEqual(checkpoint.balance, Decimal('70.00'))
+        self.assertEqual(checkpoint.tx_count, 2)
+        self.assertEqual(balance_at(self.wallet, timezone.now()), Decimal('120.00'))
+
+        # Only the tail after the nearest checkpoint is replayed
+        WalletBalanceCheckpoint.objects.filter(pk=checkpoint.pk).update(balance=Decimal('1070.00'))
+        self.assertEqual(balance_at(self.wallet, timezone.now()), Decimal('1120.00'))
+        self.assertEqual(balance_at(self.wallet, local_midnight(date(2025, 1, 16))), Decimal('100.00'))
+
+    def test_command_checkpoints_today(self):
+        call_command('checkpoint_wallet_balances', stdout=open('/dev/null', 'w'))
+        checkpoint = WalletBalanceCheckpoint.objects.get()
+        self.assertEqual(checkpoint.as_of, local_midnight(local_date()))
+        self.assertEqual(checkpoint.balance, Decimal('120.00'))
+
+    def test_monthly_statement_endpoint(self):
+        create_checkpoints(local_midnight(date(2025, 1, 15)))
+        response = self.client.get('/api/wallet/statement/', {'month': '2025-01'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['opening_balance'], Decimal('0.00'))
+        self.assertEqual(response.data['closing_balance'], Decimal('70.00'))
+        self.assertEqual([line['balance_after'] for line in response.data['transactions']], [Decimal('100.00'), Decimal('70.00')])
+
+        response = self.client.get('/api/wallet/statement/', {'month': '2025-02'})
+        self.assertEqual(response.data['opening_balance'], Decimal('70.00'))
+        self.assertEqual(response.data['closing_balance'], Decimal('120.00'))
+
+        response = self.client.get('/api/wallet/statement/', {'month': 'January'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_day_boundaries_follow_platform_timezone(self):
+        cache.clear()
+        # 20:00 UTC on 4 Feb is 01:00 on 5 Feb in Asia/Karachi (UTC+5), the default timezone
+        WalletTransaction.objects.filter(type='credit', amount=50).update(
+            timestamp=datetime(2025, 2, 4, 20, 0, tzinfo=dt_timezone.utc)
+        )
+        def feb_5():
+            return WalletTransaction.objects.filter(day_range_q(date(2025, 2, 5), date(2025, 2, 5))).count()
+
+        self.assertEqual(local_midnight(date(2025, 2, 5)), datetime(2025, 2, 4, 19, 0, tzinfo=dt_timezone.utc))
+        self.assertEqual(feb_5(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Setting.objects.update_or_create(key='timezone', defaults={'value': 'UTC'})
+        self.assertEqual(local_midnight(date(2025, 2, 5)), datetime(2025, 2, 5, tzinfo=dt_timezone.utc))
+        self.assertEqual(feb_5(), 0)
+
+    def test_admin_statement_requires_admin_or_shura(self):
+        url = f'/api/wallet/admin/recipients/{self.recipient.id}/statement/'
+        self.assertEqual(self.client.get(url, {'month': '2025-01'}).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(url, {'month': '2025-01'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['closing_balance'], Decimal('70.00'))
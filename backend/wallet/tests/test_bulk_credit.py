@@ -0,0 +1,72 @@
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from users.models import User
+from appeals.models import Appeal
+from wallet.models import Wallet, WalletTransaction, DailyPlatformMetrics
+from wallet.services import wallet_service
+from wallet.services.wallet_totals import find_total_mismatches
+
+
+class BulkCreditTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipients = []
+        for i in range(5):
+            user = User.objects.create_user(
+                email=f'recipient{i}@example.com', password='recipientpass', role='recipient', is_verified_syed=True,
+                first_name='Recipient', last_name=str(i), phone=f'12345679{i:02d}'
+            )
+            wallet_service.create_wallet_for_user(user)
+            self.recipients.append(user)
+        self.appeal = Appeal.objects.create(
+            title='Monthly support', description='Test', category='medical', amount_requested=1000,
+            created_by=self.recipients[0], beneficiary=self.recipients[0], status='approved', approved_by=self.admin
+        )
+
+    def test_credits_every_row_and_reports_results(self):
+        entries = [(user, 100 + i, self.appeal) for i, user in enumerate(self.recipients)]
+        results = wallet_service.credit_wallets_bulk(entries, created_by=self.admin, action_type='donation')
+        self.assertEqual([r['status'] for r in results], ['credited'] * 5)
+        self.assertEqual(WalletTransaction.objects.count(), 5)
+        for i, user in enumerate(self.recipients):
+            wallet = Wallet.objects.get(user=user)
+            self.assertEqual(wallet.balance, Decimal(100 + i))
+            self.assertEqual(wallet.tx_count, 1)
+            self.assertEqual(results[i]['balance'], wallet.balance)
+            tx = WalletTransaction.objects.get(pk=results[i]['transaction_id'])
+            self.assertEqual(tx.transfer_by, 'Admin')
+            self.assertEqual(tx.description, f'Donation credited – Appeal #{self.appeal.pk}')
+        self.assertEqual(find_total_mismatches(), [])
+        self.assertEqual(DailyPlatformMetrics.objects.get().wallet_balance_delta, Decimal('510.00'))
+
+    def test_repeated_user_and_failed_rows(self):
+        stranger = User.objects.create_user(
+            email='nowallet@example.com', password='x', role='recipient', is_verified_syed=True, first_name='No', last_name='Wallet', phone='1234567999'
+        )
+        Wallet.objects.filter(user=stranger).delete()
+        user = self.recipients[0]
+        results = wallet_service.credit_wallets_bulk([
+            (user, 50, None),
+            (user, '25.50', None),
+            (user, -5, None),
+            (stranger, 10, None),
+            (user, 'abc', None),
+        ])
+        self.assertEqual([r['status'] for r in results], ['credited', 'credited', 'failed', 'failed', 'failed'])
+        self.assertEqual(results[3]['error'], 'Wallet not found')
+        self.assertEqual(results[1]['balance'], Decimal('75.50'))
+        wallet = Wallet.objects.get(user=user)
+        self.assertEqual(wallet.balance, Decimal('75.50'))
+        self.assertEqual(wallet.total_credited, Decimal('75.50'))
+        self.assertEqual(wallet.tx_count, 2)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def run(users):
+            with CaptureQueriesContext(connection) as ctx:
+                wallet_service.credit_wallets_bulk([(u, 10, self.appeal) for u in users], created_by=self.admin)
+            return len(ctx.captured_queries)
+        self.assertEqual(run(self.recipients[:1]), run(self.recipients))
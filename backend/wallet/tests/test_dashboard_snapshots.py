@@ -0,0 +1,84 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from donations.models import Donation
+from wallet.models import DashboardSnapshot
+from wallet.services import dashboard_snapshots
+
+
+@override_settings(DASHBOARD_SNAPSHOT_ASYNC_REFRESH=False, DASHBOARD_SNAPSHOT_MIN_AGE=5, DASHBOARD_SNAPSHOT_MAX_AGE=60)
+class DashboardSnapshotTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.donor = User.objects.create_user(
+            email='donor@example.com', password='donorpass', role='donor', first_name='Donor', last_name='User', phone='1234567892'
+        )
+        Donation.objects.create(donor=self.donor, amount=Decimal('500.00'), payment_method='jazzcash')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def get_stats(self):
+        response = self.client.get('/api/dashboard/stats/', {'period': '7'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def age_snapshot(self, seconds):
+        DashboardSnapshot.objects.filter(period=7).update(computed_at=timezone.now() - timedelta(seconds=seconds))
+
+    def test_first_request_builds_snapshot(self):
+        data = self.get_stats()
+        self.assertEqual(data['stats']['total_donations'], 500.0)
+        self.assertIn('snapshot_age_seconds', data)
+        self.assertTrue(DashboardSnapshot.objects.filter(period=7).exists())
+
+    def test_fresh_snapshot_is_served_with_one_query(self):
+        self.get_stats()
+        with self.assertNumQueries(1):
+            self.get_stats()
+
+    def test_write_marks_dirty_but_young_snapshot_is_still_served(self):
+        self.get_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            Donation.objects.create(donor=self.donor, amount=Decimal('250.00'), payment_method='stripe')
+        self.assertTrue(DashboardSnapshot.objects.get(period=7).dirty)
+        self.assertEqual(self.get_stats()['stats']['total_donations'], 500.0)
+
+    def test_dirty_snapshot_past_min_age_is_rebuilt(self):
+        self.get_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            Donation.objects.create(donor=self.donor, amount=Decimal('250.00'), payment_method='stripe')
+        self.age_snapshot(10)
+        self.assertEqual(self.get_stats()['stats']['total_donations'], 750.0)
+        self.assertFalse(DashboardSnapshot.objects.get(period=7).dirty)
+
+    def test_write_during_rebuild_keeps_snapshot_dirty(self):
+        self.get_stats()
+        build_payload = dashboard_snapshots.build_payload
+
+        def build_then_write(days):
+            payload = build_payload(days)
+            # Commits after the payload was read, before the rebuild stores it
+            with self.captureOnCommitCallbacks(execute=True):
+                Donation.objects.create(donor=self.donor, amount=Decimal('250.00'), payment_method='stripe')
+            return payload
+
+        with mock.patch.object(dashboard_snapshots, 'build_payload', side_effect=build_then_write):
+            snapshot = dashboard_snapshots.refresh_snapshot(7)
+        self.assertEqual(snapshot.payload['stats']['total_donations'], 500.0)
+        self.assertTrue(snapshot.dirty)
+        self.age_snapshot(10)
+        self.assertEqual(self.get_stats()['stats']['total_donations'], 750.0)
+        self.assertFalse(DashboardSnapshot.objects.get(period=7).dirty)
+
+    def test_expired_snapshot_is_rebuilt_without_writes(self):
+        self.get_stats()
+        self.age_snapshot(120)
+        data = self.get_stats()
+        self.assertLess(data['snapshot_age_seconds'], 60)
@@ -0,0 +1,95 @@
+from decimal import Decimal
+from unittest import mock
+
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from wallet.models import Wallet, WalletTransaction, IdempotencyKey, WithdrawalRequest
+from wallet.services import wallet_service
+
+
+class IdempotencyKeyTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        wallet_service.create_wallet_for_user(self.recipient)
+        wallet_service.manual_credit(self.recipient, 100, self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.recipient)
+
+    def withdraw(self, amount, key):
+        return self.client.post('/api/wallet/withdraw/', {'amount': amount}, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retried_withdraw_is_replayed(self):
+        first = self.withdraw(40, 'abc-123')
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        with self.assertNumQueries(1):
+            retry = self.withdraw(40, 'abc-123')
+        self.assertEqual(retry.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertEqual(WithdrawalRequest.objects.count(), 1)
+
+    def test_new_key_is_a_new_withdrawal(self):
+        self.withdraw(40, 'first')
+        self.withdraw(40, 'second')
+        self.assertEqual(WithdrawalRequest.objects.count(), 2)
+
+    def test_key_reused_with_different_amount_is_rejected(self):
+        self.withdraw(40, 'abc-123')
+        response = self.withdraw(50, 'abc-123')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(WithdrawalRequest.objects.count(), 1)
+
+    def test_insufficient_funds_response_is_cached(self):
+        response = self.withdraw(500, 'too-much')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.withdraw(500, 'too-much').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_admin_credit_with_key_applies_once(self):
+        self.client.force_authenticate(user=self.admin)
+        url = f'/api/wallet/admin/recipients/{self.recipient.id}/credit/'
+        first = self.client.post(url, {'amount': '25.00'}, format='json', HTTP_IDEMPOTENCY_KEY='credit-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        retry = self.client.post(url, {'amount': '25.00'}, format='json', HTTP_IDEMPOTENCY_KEY='credit-1')
+        self.assertEqual(retry.data, first.data)
+        adjust = self.client.post(url, {'amount': '-5', 'reason': 'Correction'}, format='json', HTTP_IDEMPOTENCY_KEY='adjust-1')
+        self.assertEqual(adjust.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Wallet.objects.get(user=self.recipient).balance, Decimal('120.00'))
+        self.assertEqual(WalletTransaction.objects.count(), 3)
+
+    def test_admin_credit_requires_admin(self):
+        url = f'/api/wallet/admin/recipients/{self.recipient.id}/credit/'
+        response = self.client.post(url, {'amount': '25.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_admin_credit_rejects_non_finite_amounts(self):
+        self.client.force_authenticate(user=self.admin)
+        url = f'/api/wallet/admin/recipients/{self.recipient.id}/credit/'
+        for amount in ('NaN', 'sNaN', 'Infinity', '-Infinity'):
+            response = self.client.post(url, {'amount': amount, 'reason': 'Correction'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, amount)
+            self.assertEqual(response.data['detail'], 'Invalid amount')
+
+    def test_admin_credit_reports_its_own_transaction(self):
+        self.client.force_authenticate(user=self.admin)
+        url = f'/api/wallet/admin/recipients/{self.recipient.id}/credit/'
+        manual_credit = wallet_service.manual_credit
+
+        def credit_then_race(*args, **kwargs):
+            tx = manual_credit(*args, **kwargs)
+            # Another admin credits the same recipient before this response is built
+            manual_credit(self.recipient, 7, self.admin)
+            return tx
+
+        with mock.patch.object(wallet_service, 'manual_credit', side_effect=credit_then_race):
+            first = self.client.post(url, {'amount': '25.00'}, format='json', HTTP_IDEMPOTENCY_KEY='credit-1')
+        self.assertEqual(first.data['transaction']['amount'], 25.0)
+        self.assertEqual(first.data['transaction']['id'], WalletTransaction.objects.get(amount=25).id)
+        retry = self.client.post(url, {'amount': '25.00'}, format='json', HTTP_IDEMPOTENCY_KEY='credit-1')
+        self.assertEqual(retry.data['transaction'], first.data['transaction'])
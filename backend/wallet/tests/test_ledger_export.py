@@ -0,0 +1,83 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from appeals.models import Appeal
+from wallet.services import wallet_service
+
+
+class LedgerExportTests(APITestCase):
+    url = '/api/wallet/admin/transactions/export/'
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        self.other = User.objects.create_user(
+            email='other@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Other', last_name='User', phone='1234567892'
+        )
+        self.appeal = Appeal.objects.create(
+            title='Medical Help', description='Test', category='medical', amount_requested=1000,
+            created_by=self.recipient, beneficiary=self.recipient, status='approved', approved_by=self.admin
+        )
+        for user in (self.recipient, self.other):
+            wallet_service.create_wallet_for_user(user)
+        wallet_service.credit_wallet(self.recipient, 300, self.appeal, created_by=self.admin)
+        wallet_service.manual_credit(self.other, 50, self.admin)
+        wallet_service.debit_wallet(self.recipient, 100, created_by=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def read(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_csv_stream_with_joined_fields(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="wallet-ledger.csv"', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self.read(response).decode())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['user_email'], 'recipient@example.com')
+        self.assertEqual(rows[0]['appeal_title'], 'Medical Help')
+        self.assertEqual(rows[0]['amount'], '300.00')
+        self.assertEqual(rows[2]['type'], 'debit')
+
+    def test_ndjson_with_filters(self):
+        response = self.client.get(self.url, {'output': 'ndjson', 'type': 'credit', 'user': self.recipient.id})
+        records = [json.loads(line) for line in self.read(response).decode().splitlines()]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['amount'], '300.00')
+        self.assertEqual(records[0]['appeal_id'], self.appeal.id)
+
+    def test_gzip_and_date_range(self):
+        response = self.client.get(self.url, {'gzip': '1', 'start': '2000-01-01', 'end': '2000-12-31'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        lines = gzip.decompress(self.read(response)).decode().splitlines()
+        self.assertEqual(len(lines), 1)  # header only
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get(self.url, {'output': 'xml'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'start': '2024-13-01'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'type': 'refund'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_admin_forbidden(self):
+        self.client.force_authenticate(user=self.recipient)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command_writes_gzipped_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'ledger.ndjson.gz')
+            call_command('export_wallet_ledger', format='ndjson', gzip=True, output=path, chunk_size=1, stderr=io.StringIO())
+            with gzip.open(path, 'rt') as handle:
+                records = [json.loads(line) for line in handle]
+        self.assertEqual([r['type'] for r in records], ['credit', 'credit', 'debit'])
@@ -0,0 +1,106 @@
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from appeals.models import Appeal
+from donations.models import Donation
+from wallet.models import Wallet, DailyPlatformMetrics
+from wallet.services.wallet_service import credit_wallet
+
+
+class DailyPlatformMetricsTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        self.donor = User.objects.create_user(
+            email='donor@example.com', password='donorpass', role='donor', first_name='Donor', last_name='User', phone='1234567892'
+        )
+        self.wallet = Wallet.objects.create(user=self.recipient, balance=0)
+        self.appeal = Appeal.objects.create(
+            title='Medical Help',
+            description='Help needed for surgery',
+            category='medical',
+            amount_requested=20000,
+            created_by=self.recipient,
+            beneficiary=self.recipient,
+            status='approved',
+            approved_by=self.admin
+        )
+        self.client = APIClient()
+
+    def today_row(self):
+        return DailyPlatformMetrics.objects.get(date=timezone.localdate())
+
+    def test_writes_update_todays_row(self):
+        Donation.objects.create(donor=self.donor, amount=Decimal('500.00'), payment_method='jazzcash')
+        Donation.objects.create(donor=self.donor, amount=Decimal('250.00'), payment_method='stripe')
+        credit_wallet(self.recipient, Decimal('300.00'), self.appeal, action_type='donation')
+
+        row = self.today_row()
+        self.assertEqual(row.donations_total, Decimal('750.00'))
+        self.assertEqual(row.donations_count, 2)
+        self.assertEqual(row.total_users, 3)
+        self.assertEqual(row.active_appeals, 1)
+        self.assertEqual(row.wallet_balance_delta, Decimal('300.00'))
+        self.assertEqual(row.wallet_balance, Decimal('300.00'))
+
+    def test_appeal_leaving_active_set_decrements_gauge(self):
+        self.appeal.status = 'fulfilled'
+        self.appeal.save()
+        self.assertEqual(self.today_row().active_appeals, 0)
+
+    def test_backfill_matches_incremental_rollup(self):
+        Donation.objects.create(donor=self.donor, amount=Decimal('500.00'), payment_method='jazzcash')
+        credit_wallet(self.recipient, Decimal('300.00'), self.appeal, action_type='donation')
+        incremental = DailyPlatformMetrics.objects.values(
+            'donations_total', 'donations_count', 'new_users', 'total_users', 'active_appeals', 'wallet_balance'
+        ).get(date=timezone.localdate())
+
+        DailyPlatformMetrics.objects.all().delete()
+        call_command('backfill_platform_metrics', stdout=open('/dev/null', 'w'))
+        rebuilt = DailyPlatformMetrics.objects.values(*incremental.keys()).get(date=timezone.localdate())
+        self.assertEqual(rebuilt, incremental)
+
+    def test_deletes_are_taken_back_out(self):
+        leaving = User.objects.create_user(
+            email='leaving@example.com', password='leavingpass', role='recipient', is_verified_syed=True, first_name='Leaving', last_name='User', phone='1234567893'
+        )
+        Wallet.objects.create(user=leaving, balance=0)
+        credit_wallet(leaving, Decimal('80.00'), self.appeal, action_type='donation')
+        Appeal.objects.create(
+            title='School Fee', description='Fees', category='school_fee', amount_requested=5000,
+            created_by=leaving, beneficiary=leaving, status='pending'
+        )
+        Donation.objects.create(donor=leaving, amount=Decimal('40.00'), payment_method='stripe')
+        kept = Donation.objects.create(donor=self.donor, amount=Decimal('500.00'), payment_method='jazzcash')
+        Donation.objects.create(donor=self.donor, amount=Decimal('250.00'), payment_method='stripe').delete()
+        # Cascades to the wallet, the appeal and the donation
+        leaving.delete()
+
+        row = self.today_row()
+        self.assertEqual((row.donations_total, row.donations_count), (kept.amount, 1))
+        self.assertEqual((row.new_users, row.total_users), (3, 3))
+        self.assertEqual((row.active_appeals, row.wallet_balance), (1, Decimal('0.00')))
+
+        incremental = DailyPlatformMetrics.objects.values(
+            'donations_total', 'donations_count', 'new_users', 'total_users', 'active_appeals', 'wallet_balance'
+        ).get(date=timezone.localdate())
+        call_command('backfill_platform_metrics', stdout=open('/dev/null', 'w'))
+        rebuilt = DailyPlatformMetrics.objects.values(*incremental.keys()).get(date=timezone.localdate())
+        self.assertEqual(rebuilt, incremental)
+
+    def test_dashboard_stats_read_from_rollup(self):
+        Donation.objects.create(donor=self.donor, amount=Decimal('500.00'), payment_method='jazzcash')
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get('/api/dashboard/stats/?period=7')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.data['stats']
+        self.assertEqual(Decimal(stats['total_donations']), Decimal('500.00'))
+        self.assertEqual(stats['registered_users'], 3)
+        self.assertEqual(stats['active_appeals'], 1)
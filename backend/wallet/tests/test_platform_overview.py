@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from wallet.services import wallet_service
+
+
+class PlatformOverviewCacheTests(APITestCase):
+    url = '/api/wallet/admin/overview/'
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        wallet_service.create_wallet_for_user(self.recipient)
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet_service.manual_credit(self.recipient, 500, self.admin)
+            wallet_service.debit_wallet(self.recipient, 200, created_by=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_totals_from_single_ledger_aggregate(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_transactions'], 2)
+        self.assertEqual(response.data['total_credits'], 500.0)
+        self.assertEqual(response.data['total_debits'], 200.0)
+        self.assertEqual(response.data['total_withdrawn_amount'], 200.0)
+        self.assertEqual(response.data['total_current_balance'], 300.0)
+        self.assertFalse(response.data['cached'])
+        self.assertIn('compute_ms', response.data)
+
+    def test_second_read_is_cached_until_a_write(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertTrue(response.data['cached'])
+        self.assertGreaterEqual(response.data['cache_age_seconds'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet_service.manual_credit(self.recipient, 100, self.admin)
+        response = self.client.get(self.url)
+        self.assertFalse(response.data['cached'])
+        self.assertEqual(response.data['total_credits'], 600.0)
+
+    def test_bulk_credit_bumps_cache(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet_service.credit_wallets_bulk([(self.recipient, 50, None)], created_by=self.admin)
+        self.assertEqual(self.client.get(self.url).data['total_transactions'], 3)
+
+    def test_fresh_forces_recompute(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url, {'fresh': '1'})
+        self.assertFalse(response.data['cached'])
+        self.assertTrue(self.client.get(self.url).data['cached'])
+
+    @override_settings(WALLET_OVERVIEW_CACHE_TTL=0)
+    def test_write_in_another_process_is_seen_after_ttl(self):
+        self.client.get(self.url)
+        # Another worker's write never bumps this process's version key
+        wallet_service.manual_credit(self.recipient, 100, self.admin)
+        response = self.client.get(self.url)
+        self.assertFalse(response.data['cached'])
+        self.assertEqual(response.data['total_credits'], 600.0)
@@ -0,0 +1,61 @@
+from datetime import datetime
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from wallet.models import WalletTransaction
+from wallet.services import wallet_service
+
+
+class RecipientHistoryTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        wallet_service.create_wallet_for_user(self.recipient)
+        wallet_service.manual_credit(self.recipient, 1000, self.admin)
+        days = [(2024, 1, 5), (2024, 1, 20), (2024, 2, 3), (2024, 2, 3), (2024, 3, 15)]
+        for i, day in enumerate(days):
+            wallet_service.debit_wallet(self.recipient, 10 * (i + 1), created_by=self.admin)
+            WalletTransaction.objects.filter(pk=WalletTransaction.objects.latest('id').pk).update(timestamp=timezone.make_aware(datetime(*day, 12)))
+        self.withdrawals = f'/api/wallet/admin/recipients/{self.recipient.id}/withdrawals/'
+        self.transfers = f'/api/wallet/admin/recipients/{self.recipient.id}/transfers/'
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_plain_list_with_date_range(self):
+        response = self.client.get(self.withdrawals, {'start': '2024-01-20', 'end': '2024-02-03'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['date'] for row in response.data], ['2024-02-03', '2024-02-03', '2024-01-20'])
+
+    def test_cursor_pages(self):
+        dates, cursor = [], ''
+        while cursor is not None:
+            response = self.client.get(self.withdrawals, {'cursor': cursor, 'page_size': 2})
+            self.assertLessEqual(len(response.data['results']), 2)
+            dates += [row['date'] for row in response.data['results']]
+            cursor = response.data['next_cursor']
+        self.assertEqual(dates, ['2024-03-15', '2024-02-03', '2024-02-03', '2024-01-20', '2024-01-05'])
+
+    def test_group_by_month_and_day(self):
+        response = self.client.get(self.withdrawals, {'group_by': 'month'})
+        self.assertEqual(
+            [(row['period'], row['count'], row['amount']) for row in response.data],
+            [('2024-03', 1, 50), ('2024-02', 2, 70), ('2024-01', 2, 30)],
+        )
+        response = self.client.get(self.withdrawals, {'group_by': 'day', 'start': '2024-02-01', 'end': '2024-02-29'})
+        self.assertEqual(response.data, [{'period': '2024-02-03', 'count': 2, 'amount': 70}])
+
+    def test_transfers_report_transfer_by(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.transfers)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['transferred_by'], 'Admin')
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get(self.withdrawals, {'group_by': 'week'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.withdrawals, {'start': 'yesterday'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.transfers, {'cursor': 'bogus'}).status_code, status.HTTP_400_BAD_REQUEST)
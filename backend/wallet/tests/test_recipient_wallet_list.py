@@ -0,0 +1,62 @@
+from decimal import Decimal
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from wallet.services import wallet_service
+
+
+class RecipientWalletListTests(APITestCase):
+    url = '/api/wallet/admin/recipients/'
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        # Two recipients share a balance so the id tie-breaker is exercised
+        balances = [300, 100, 300, 50, 200]
+        self.recipients = []
+        for i, amount in enumerate(balances):
+            user = User.objects.create_user(
+                email=f'recipient{i}@example.com', password='recipientpass', role='recipient', is_verified_syed=True,
+                first_name=f'Name{4 - i}', last_name='Recipient', phone=f'12345679{i:02d}'
+            )
+            wallet_service.create_wallet_for_user(user)
+            wallet_service.manual_credit(user, amount, self.admin)
+            wallet_service.debit_wallet(user, i, created_by=self.admin) if i else None
+            self.recipients.append(user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def walk(self, sort, page_size=2):
+        ids, cursor = [], ''
+        while cursor is not None:
+            with self.assertNumQueries(1):
+                response = self.client.get(self.url, {'sort': sort, 'cursor': cursor, 'page_size': page_size})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [row['id'] for row in response.data['results']]
+            cursor = response.data['next_cursor']
+        return ids
+
+    def test_page_mode_keeps_counts(self):
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(response.data['next'], 2)
+        first = response.data['results'][0]
+        self.assertEqual(first['id'], self.recipients[0].id)
+        self.assertEqual(first['current_balance'], Decimal('300.00'))
+        self.assertEqual(first['name'], 'Name4 Recipient')
+
+    def test_keyset_walk_matches_offset_order(self):
+        for sort in ('-balance', 'balance', 'received', '-withdrawn', 'name'):
+            offset_ids = [row['id'] for row in self.client.get(self.url, {'sort': sort, 'page_size': 100}).data['results']]
+            self.assertEqual(self.walk(sort), offset_ids, sort)
+            self.assertEqual(len(offset_ids), 5)
+
+    def test_sort_by_name(self):
+        response = self.client.get(self.url, {'sort': 'name', 'page_size': 100})
+        names = [row['name'] for row in response.data['results']]
+        self.assertEqual(names, sorted(names))
+
+    def test_invalid_sort_and_cursor(self):
+        self.assertEqual(self.client.get(self.url, {'sort': 'email'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'cursor': 'not-a-cursor'}).status_code, status.HTTP_400_BAD_REQUEST)
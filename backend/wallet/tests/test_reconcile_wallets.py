@@ -0,0 +1,61 @@
+import csv
+import tempfile
+from decimal import Decimal
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from users.models import User
+from wallet.models import Wallet
+from wallet.services import wallet_service
+from wallet.services.wallet_totals import reconcile_range
+from wallet.management.commands.reconcile_wallets import split_id_range
+
+
+class ReconcileWalletsTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipients = []
+        for i in range(3):
+            user = User.objects.create_user(
+                email=f'recipient{i}@example.com', password='recipientpass', role='recipient', is_verified_syed=True,
+                first_name='Recipient', last_name=str(i), phone=f'12345679{i:02d}'
+            )
+            wallet_service.create_wallet_for_user(user)
+            wallet_service.manual_credit(user, 100, self.admin)
+            User.objects.filter(pk=user.pk).update(wallet_balance=Decimal('100.00'))
+            self.recipients.append(user)
+        self.ids = list(Wallet.objects.order_by('id').values_list('id', flat=True))
+
+    def test_consistent_wallets_have_no_discrepancies(self):
+        checked, rows = reconcile_range(self.ids[0], self.ids[-1], chunk_size=1)
+        self.assertEqual(checked, 3)
+        self.assertEqual(rows, [])
+
+    def test_reports_balance_and_legacy_drift(self):
+        Wallet.objects.filter(user=self.recipients[1]).update(balance=Decimal('90.00'))
+        User.objects.filter(pk=self.recipients[2].pk).update(wallet_balance=Decimal('0.00'))
+        checked, rows = reconcile_range(self.ids[0], self.ids[-1], chunk_size=2)
+        self.assertEqual(checked, 3)
+        self.assertEqual(
+            [(row['user_id'], row['field'], row['stored'], row['expected']) for row in rows],
+            [
+                (self.recipients[1].id, 'balance', Decimal('90.00'), Decimal('100.00')),
+                (self.recipients[2].id, 'user.wallet_balance', Decimal('0.00'), Decimal('100.00')),
+            ],
+        )
+
+    def test_command_writes_report_and_fixes(self):
+        Wallet.objects.filter(user=self.recipients[0]).update(balance=Decimal('5.00'), tx_count=7)
+        with tempfile.NamedTemporaryFile('r', suffix='.csv') as report:
+            call_command('reconcile_wallets', '--workers', '1', '--chunk-size', '2', '--report', report.name, '--fix',
+                         stderr=open('/dev/null', 'w'))
+            rows = list(csv.DictReader(report))
+        self.assertEqual({row['field'] for row in rows}, {'balance', 'tx_count'})
+        wallet = Wallet.objects.get(user=self.recipients[0])
+        self.assertEqual((wallet.balance, wallet.tx_count), (Decimal('100.00'), 1))
+        self.assertEqual(reconcile_range(self.ids[0], self.ids[-1])[1], [])
+
+    def test_split_id_range_covers_span(self):
+        self.assertEqual(split_id_range(1, 10, 3), [(1, 4), (5, 8), (9, 10)])
+        self.assertEqual(split_id_range(5, 5, 8), [(5, 5)])
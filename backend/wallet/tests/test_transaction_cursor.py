@@ -0,0 +1,77 @@
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory, force_authenticate
+from rest_framework import status
+from users.models import User
+from wallet.models import WalletTransaction
+from wallet.services import wallet_service
+from wallet.api.views.wallet_view import WalletTransactionListView
+
+
+class TransactionCursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        wallet_service.create_wallet_for_user(self.recipient)
+        for amount in range(1, 8):
+            wallet_service.manual_credit(self.recipient, amount, self.admin)
+        # Two transactions share a timestamp so the id tie-breaker is exercised
+        now = timezone.now()
+        txs = list(WalletTransaction.objects.order_by('id'))
+        for i, tx in enumerate(txs):
+            WalletTransaction.objects.filter(pk=tx.pk).update(timestamp=now - timedelta(minutes=min(i, 5)))
+        self.expected = list(WalletTransaction.objects.order_by('-timestamp', '-id').values_list('id', flat=True))
+        self.client = APIClient()
+
+    def walk(self, url, key='next_cursor'):
+        ids, cursor = [], ''
+        while cursor is not None:
+            response = self.client.get(url, {'cursor': cursor, 'page_size': 3})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids += [row['id'] for row in response.data['results']]
+            cursor = response.data[key]
+        return ids
+
+    def test_recipient_history_cursor_walk(self):
+        self.client.force_authenticate(user=self.recipient)
+        self.assertEqual(self.walk('/api/wallet/transactions/'), self.expected)
+
+    def test_recipient_history_page_mode_unchanged(self):
+        self.client.force_authenticate(user=self.recipient)
+        response = self.client.get('/api/wallet/transactions/', {'page_size': 3})
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual([row['id'] for row in response.data['results']], self.expected[:3])
+
+    def test_admin_transactions_cursor_walk(self):
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.walk('/api/wallet/admin/transactions/'), self.expected)
+
+    def test_cursor_pages_cost_one_query(self):
+        self.client.force_authenticate(user=self.admin)
+        first = self.client.get('/api/wallet/admin/transactions/', {'cursor': '', 'page_size': 3})
+        with self.assertNumQueries(1):
+            self.client.get('/api/wallet/admin/transactions/', {'cursor': first.data['next_cursor'], 'page_size': 3})
+
+    def test_list_view_cursor_mode(self):
+        request = APIRequestFactory().get('/', {'cursor': '', 'page_size': 4})
+        force_authenticate(request, user=self.recipient)
+        response = WalletTransactionListView.as_view()(request)
+        self.assertEqual([row['id'] for row in response.data['results']], self.expected[:4])
+        self.assertIsNotNone(response.data['next_cursor'])
+
+        request = APIRequestFactory().get('/', {'cursor': 'bogus'})
+        force_authenticate(request, user=self.recipient)
+        response = WalletTransactionListView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['detail'], 'Invalid cursor')
+
+    def test_invalid_cursor(self):
+        self.client.force_authenticate(user=self.recipient)
+        self.assertEqual(self.client.get('/api/wallet/transactions/', {'cursor': 'bogus'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.client.get('/api/wallet/admin/transactions/', {'cursor': 'bogus'}).status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,73 @@
+from functools import partial
+from unittest import mock
+
+from django.db import connection
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from wallet.models import UserSearchEntry
+from wallet.services import wallet_service
+from wallet.services.user_search import FTS_TABLE, search_backend, search_user_ids, rebuild_user_search
+
+
+class AdminTransactionSearchTests(APITestCase):
+    url = '/api/wallet/admin/transactions/'
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.ayesha = self.recipient('Ayesha', 'Khan', 'ayesha@example.com', '1234567891')
+        self.ayaan = self.recipient('Ayaan', 'Malik', 'malik.a@example.org', '1234567892')
+        self.bilal = self.recipient('Bilal', 'Ahmed', 'bilal@example.com', '1234567893')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def recipient(self, first, last, email, phone):
+        user = User.objects.create_user(
+            email=email, password='recipientpass', role='recipient', is_verified_syed=True,
+            first_name=first, last_name=last, phone=phone
+        )
+        wallet_service.create_wallet_for_user(user)
+        wallet_service.manual_credit(user, 100, self.admin)
+        return user
+
+    def search(self, term):
+        response = self.client.get(self.url, {'search': term, 'page_size': 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['user_id'] for row in response.data['results']]
+
+    def test_sqlite_uses_fts5(self):
+        # The FTS5 table is created by migration 0013
+        if FTS_TABLE not in connection.introspection.table_names():
+            self.skipTest('search index migration not applied')
+        self.assertEqual(search_backend(), 'sqlite_fts5')
+
+    def test_matches_name_and_email_case_insensitively(self):
+        self.assertEqual(self.search('KHAN'), [self.ayesha.id])
+        self.assertEqual(self.search('example.org'), [self.ayaan.id])
+        self.assertEqual(self.search('ayesha khan'), [self.ayesha.id])
+        self.assertEqual(self.search('nobody'), [])
+
+    def test_short_terms_fall_back_to_like(self):
+        self.assertEqual(set(self.search('ay')), {self.ayesha.id, self.ayaan.id})
+
+    def test_matches_beyond_the_ranking_cap_are_listed(self):
+        ranked = partial(search_user_ids, limit=1)
+        with mock.patch('wallet.services.wallet_analytics.search_user_ids', ranked):
+            self.assertEqual(set(self.search('example.com')), {self.ayesha.id, self.bilal.id})
+            response = self.client.get(self.url, {'search': 'example.com', 'cursor': ''})
+        self.assertEqual({row['user_id'] for row in response.data['results']}, {self.ayesha.id, self.bilal.id})
+
+    def test_renamed_user_is_found_by_new_name(self):
+        self.bilal.last_name = 'Qureshi'
+        self.bilal.save()
+        self.assertEqual(self.search('qureshi'), [self.bilal.id])
+        self.assertEqual(self.search('ahmed'), [])
+
+    def test_rebuild_resyncs_bulk_updates(self):
+        User.objects.filter(pk=self.bilal.pk).update(first_name='Zubair')
+        self.assertEqual(search_user_ids('zubair'), [])
+        rebuild_user_search()
+        self.assertEqual(search_user_ids('zubair'), [self.bilal.id])
+        self.assertEqual(UserSearchEntry.objects.count(), User.objects.count())
@@ -0,0 +1,43 @@
+from decimal import Decimal
+from rest_framework.test import APITestCase
+from users.models import User
+from appeals.models import Appeal
+from wallet.services import wallet_service
+
+
+class WalletStatsManyTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipients = []
+        for i in range(3):
+            user = User.objects.create_user(
+                email=f'recipient{i}@example.com', password='recipientpass', role='recipient', is_verified_syed=True,
+                first_name='Recipient', last_name=str(i), phone=f'12345679{i:02d}'
+            )
+            wallet_service.create_wallet_for_user(user)
+            self.recipients.append(user)
+        for i, user in enumerate(self.recipients[:2]):
+            Appeal.objects.create(
+                title='Support', description='Test', category='medical', amount_requested=1000 * (i + 1),
+                created_by=user, beneficiary=user, status='fulfilled', approved_by=self.admin
+            )
+            wallet_service.manual_credit(user, 500, self.admin)
+            wallet_service.debit_wallet(user, 100 * (i + 1), created_by=self.admin)
+
+    def test_matches_single_user_stats(self):
+        ids = [user.id for user in self.recipients]
+        stats = wallet_service.get_wallet_stats_many(ids)
+        self.assertEqual(set(stats), set(ids))
+        for user in self.recipients:
+            self.assertEqual(stats[user.id], wallet_service.get_wallet_stats(user))
+        self.assertEqual(stats[self.recipients[1].id]['available_balance'], Decimal('1800.00'))
+        self.assertEqual(stats[self.recipients[2].id]['total_credited'], Decimal('0.00'))
+
+    def test_constant_query_count(self):
+        with self.assertNumQueries(2):
+            wallet_service.get_wallet_stats_many([user.id for user in self.recipients])
+        with self.assertNumQueries(2):
+            stats = wallet_service.get_wallet_stats_many(User.objects.filter(role='recipient').values('id'))
+        self.assertEqual(stats[self.recipients[0].id]['total_withdrawn'], Decimal('100.00'))
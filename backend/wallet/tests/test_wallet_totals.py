@@ -0,0 +1,121 @@
+from decimal import Decimal
+from django.core.management import call_command
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from appeals.models import Appeal
+from wallet.models import Wallet, WalletTransaction
+from wallet.services import wallet_service
+from wallet.services.wallet_service import InsufficientFundsError
+from wallet.services.wallet_totals import find_total_mismatches
+from wallet.services.withdrawal_queue import process_batch
+
+
+class WalletRunningTotalsTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        self.appeal = Appeal.objects.create(
+            title='Medical Help', description='Test', category='medical', amount_requested=1000,
+            created_by=self.recipient, beneficiary=self.recipient, status='approved', approved_by=self.admin
+        )
+        wallet_service.create_wallet_for_user(self.recipient)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.recipient)
+
+    def wallet(self):
+        return Wallet.objects.get(user=self.recipient)
+
+    def test_every_mutation_updates_totals(self):
+        wallet_service.credit_wallet(self.recipient, 500, self.appeal, created_by=self.admin)
+        wallet_service.manual_credit(self.recipient, 100, self.admin)
+        wallet_service.adjust_wallet_balance(self.recipient, Decimal('-50'), 'correction', self.admin)
+        wallet_service.issue_refund(self.recipient, 25, created_by=self.admin)
+        wallet_service.debit_wallet(self.recipient, 200, self.appeal, created_by=self.admin)
+        wallet_service.withdraw_funds(self.recipient, 75)
+        wallet = self.wallet()
+        self.assertEqual(wallet.total_credited, Decimal('625.00'))
+        self.assertEqual(wallet.total_debited, Decimal('325.00'))
+        self.assertEqual(wallet.tx_count, 6)
+        self.assertEqual(wallet.balance, wallet.total_credited - wallet.total_debited)
+        self.assertEqual(find_total_mismatches(), [])
+
+    def test_withdraw_rejects_insufficient_balance(self):
+        wallet_service.manual_credit(self.recipient, 100, self.admin)
+        with self.assertRaises(InsufficientFundsError):
+            wallet_service.withdraw_funds(self.recipient, 150)
+        wallet = self.wallet()
+        self.assertEqual(wallet.balance, Decimal('100.00'))
+        self.assertEqual(wallet.tx_count, 1)
+
+    def test_queued_withdrawal_updates_totals(self):
+        wallet_service.manual_credit(self.recipient, 100, self.admin)
+        response = self.client.post('/api/wallet/withdraw/', {'amount': 40}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        response = self.client.post('/api/wallet/withdraw/', {'amount': 400}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        process_batch()
+        wallet = self.wallet()
+        self.assertEqual(wallet.balance, Decimal('60.00'))
+        self.assertEqual(wallet.total_debited, Decimal('40.00'))
+
+    def test_balance_endpoints_read_stored_totals(self):
+        wallet_service.manual_credit(self.recipient, 300, self.admin)
+        wallet_service.withdraw_funds(self.recipient, 100)
+        self.client.force_authenticate(user=User.objects.get(pk=self.recipient.pk))
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/wallet/balance/')
+        self.assertEqual(response.data['total_received'], 300.0)
+        self.assertEqual(response.data['total_withdrawn'], 100.0)
+        response = self.client.get('/api/wallet/stats/')
+        self.assertEqual(response.data['total_credited'], 300.0)
+        self.assertEqual(response.data['total_withdrawn'], 100.0)
+
+    def test_verify_command_repairs_drift(self):
+        wallet_service.manual_credit(self.recipient, 300, self.admin)
+        Wallet.objects.filter(user=self.recipient).update(total_credited=0, tx_count=0)
+        self.assertEqual(len(find_total_mismatches()), 1)
+        call_command('verify_wallet_totals', '--repair', stdout=open('/dev/null', 'w'))
+        self.assertEqual(find_total_mismatches(), [])
+        self.assertEqual(self.wallet().total_credited, Decimal('300.00'))
+
+
+class AtomicBalanceUpdateTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        wallet_service.create_wallet_for_user(self.recipient)
+
+    def test_mutations_return_transaction_with_updated_wallet(self):
+        tx = wallet_service.manual_credit(self.recipient, '100.25', self.admin)
+        self.assertEqual((tx.type, tx.amount), ('credit', Decimal('100.25')))
+        wallet = tx.wallet
+        self.assertEqual(wallet.balance, Decimal('100.25'))
+        self.assertEqual(wallet.tx_count, 1)
+        tx = wallet_service.debit_wallet(self.recipient, 40, created_by=self.admin)
+        self.assertEqual((tx.type, tx.amount), ('debit', Decimal('40.00')))
+        wallet = tx.wallet
+        self.assertEqual(wallet.balance, Decimal('60.25'))
+        self.assertEqual(wallet.total_debited, Decimal('40.00'))
+
+    def test_failed_guard_raises_and_leaves_wallet_untouched(self):
+        wallet_service.manual_credit(self.recipient, 50, self.admin)
+        with self.assertRaises(InsufficientFundsError):
+            wallet_service.debit_wallet(self.recipient, 80, created_by=self.admin)
+        wallet = Wallet.objects.get(user=self.recipient)
+        self.assertEqual(wallet.balance, Decimal('50.00'))
+        self.assertEqual(wallet.tx_count, 1)
+        self.assertEqual(WalletTransaction.objects.filter(type='debit').count(), 0)
+
+    def test_missing_wallet_raises_does_not_exist(self):
+        Wallet.objects.filter(user=self.recipient).delete()
+        with self.assertRaises(Wallet.DoesNotExist):
+            wallet_service.manual_credit(self.recipient, 10, self.admin)
@@ -0,0 +1,88 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from users.models import User
+from wallet.models import Wallet, WalletTransaction, WithdrawalRequest
+from wallet.services import wallet_service
+from wallet.services.withdrawal_queue import claim_batch, enqueue_withdrawal, process_batch, process_request, release_stale_claims
+
+
+class WithdrawalQueueTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email='admin@example.com', password='adminpass', role='admin', first_name='Admin', last_name='User', phone='1234567890'
+        )
+        self.recipient = User.objects.create_user(
+            email='recipient@example.com', password='recipientpass', role='recipient', is_verified_syed=True, first_name='Recipient', last_name='User', phone='1234567891'
+        )
+        wallet_service.create_wallet_for_user(self.recipient)
+        wallet_service.manual_credit(self.recipient, 100, self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.recipient)
+
+    def test_endpoint_queues_and_reports_status(self):
+        response = self.client.post('/api/wallet/withdraw/', {'amount': 30}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertEqual(Wallet.objects.get(user=self.recipient).balance, Decimal('100.00'))
+
+        process_batch()
+        status_response = self.client.get(response.data['status_url'])
+        self.assertEqual(status_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(status_response.data['status'], 'completed')
+        self.assertIsNotNone(status_response.data['transaction_id'])
+        self.assertEqual(Wallet.objects.get(user=self.recipient).balance, Decimal('70.00'))
+
+    def test_worker_fails_requests_the_balance_cannot_cover(self):
+        first = enqueue_withdrawal(self.recipient, 80)
+        second = enqueue_withdrawal(self.recipient, 80)
+        process_batch()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, 'completed')
+        self.assertEqual((second.status, second.error), ('failed', 'Insufficient balance'))
+        self.assertEqual(Wallet.objects.get(user=self.recipient).balance, Decimal('20.00'))
+
+    def test_claimed_rows_are_not_claimed_twice(self):
+        for _ in range(3):
+            enqueue_withdrawal(self.recipient, 10)
+        first = claim_batch(2)
+        second = claim_batch(2)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse({r.id for r in first} & {r.id for r in second})
+        self.assertEqual(claim_batch(2), [])
+
+    def test_stale_claims_are_released(self):
+        enqueue_withdrawal(self.recipient, 10)
+        claimed = claim_batch()
+        WithdrawalRequest.objects.filter(pk=claimed[0].pk).update(claimed_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(release_stale_claims(), 1)
+        self.assertEqual(len(claim_batch()), 1)
+
+    def test_slow_worker_that_lost_its_claim_does_not_pay_out(self):
+        enqueue_withdrawal(self.recipient, 10)
+        slow = claim_batch()[0]
+        WithdrawalRequest.objects.filter(pk=slow.pk).update(claimed_at=timezone.now() - timedelta(hours=1))
+        release_stale_claims()
+        fast = claim_batch()[0]
+        self.assertIsNone(process_request(slow))
+        self.assertEqual(process_request(fast).status, 'completed')
+        self.assertEqual(Wallet.objects.get(user=self.recipient).balance, Decimal('90.00'))
+        self.assertEqual(WalletTransaction.objects.filter(type='debit').count(), 1)
+
+    def test_status_is_private_to_owner(self):
+        request_obj = enqueue_withdrawal(self.recipient, 10)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(f'/api/wallet/withdrawals/{request_obj.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command_drains_queue(self):
+        enqueue_withdrawal(self.recipient, 10)
+        enqueue_withdrawal(self.recipient, 15)
+        call_command('process_withdrawals', '--batch-size', '1', stdout=open('/dev/null', 'w'))
+        self.assertEqual(WithdrawalRequest.objects.filter(status='completed').count(), 2)
+        self.assertEqual(Wallet.objects.get(user=self.recipient).balance, Decimal('75.00'))
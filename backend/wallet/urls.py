@@ -1,12 +1,15 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from wallet.views.recipient_wallet import wallet_balance, wallet_transactions, withdraw_funds
+from wallet.views.recipient_wallet import wallet_balance, wallet_transactions, withdraw_funds, withdrawal_status, wallet_statement
 from wallet.views.admin_wallet_view import (  # <- FIX import
     AdminWalletOverviewView,
     AdminRecipientWalletListView,
     AdminRecipientWithdrawalsView,
     AdminRecipientTransfersView,
+    AdminRecipientStatementView,
+    AdminRecipientCreditView,
     AdminWalletTransactionListView,
+    AdminLedgerExportView,
 )
 
 app_name = 'wallet'
@@ -18,13 +21,18 @@ urlpatterns = [
     path('balance/', wallet_balance, name='wallet-balance'),
     path('transactions/', wallet_transactions, name='wallet-transactions'),
     path('withdraw/', withdraw_funds, name='wallet-withdraw'),
+    path('withdrawals/<int:pk>/', withdrawal_status, name='wallet-withdrawal-status'),
+    path('statement/', wallet_statement, name='wallet-statement'),
 
     # Admin wallet analytics endpoints
     path('admin/overview/', AdminWalletOverviewView.as_view(), name='admin-wallet-overview'),
     path('admin/recipients/', AdminRecipientWalletListView.as_view(), name='admin-recipients'),
     path('admin/recipients/<int:user_id>/withdrawals/', AdminRecipientWithdrawalsView.as_view(), name='admin-recipient-withdrawals'),
     path('admin/recipients/<int:user_id>/transfers/', AdminRecipientTransfersView.as_view(), name='admin-recipient-transfers'),
+    path('admin/recipients/<int:user_id>/statement/', AdminRecipientStatementView.as_view(), name='admin-recipient-statement'),
+    path('admin/recipients/<int:user_id>/credit/', AdminRecipientCreditView.as_view(), name='admin-recipient-credit'),
     path('admin/transactions/', AdminWalletTransactionListView.as_view(), name='admin-wallet-transactions'),
+    path('admin/transactions/export/', AdminLedgerExportView.as_view(), name='admin-wallet-ledger-export'),
 ]
 
 urlpatterns += router.urls
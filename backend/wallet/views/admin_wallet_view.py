@@ -2,6 +2,15 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework import status
+from decimal import Decimal, InvalidOperation
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from wallet.api.permissions import IsAdminOrShuraUser, IsAdminUserRole
+from wallet.models import Wallet
+from wallet.services import wallet_service, idempotency
+from wallet.services.idempotency import IdempotencyKeyReused
+from wallet.services.balance_checkpoints import get_monthly_statement, parse_month, parse_day_range
+from wallet.services import ledger_export
 from wallet.services.wallet_analytics import (
     get_platform_overview,
     get_recipient_wallet_stats,
@@ -20,7 +29,8 @@ from wallet.serializers.admin_wallet import (
 class AdminWalletOverviewView(APIView):
     permission_classes = [AllowAny]
     def get(self, request):
-        data, error = get_platform_overview()
+        fresh = request.GET.get('fresh', '').lower() in ('1', 'true')
+        data, error = get_platform_overview(fresh=fresh)
         return Response(data)
 
 class AdminRecipientWalletListView(APIView):
@@ -28,15 +38,37 @@ class AdminRecipientWalletListView(APIView):
     def get(self, request):
         page = int(request.GET.get('page', 1))
         page_size = int(request.GET.get('page_size', 10))
-        result, error = get_recipient_wallet_stats(page=page, page_size=page_size)
+        result, error = get_recipient_wallet_stats(
+            page=page,
+            page_size=page_size,
+            sort=request.GET.get('sort', '-balance'),
+            cursor=request.GET.get('cursor'),
+        )
         if error:
-            return Response({'detail': error}, status=status.HTTP_404_NOT_FOUND)
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
         return Response(result)
 
+def _history_options(request):
+    """?start=&end= (YYYY-MM-DD), ?group_by=day|month, ?cursor= and ?page_size= for recipient histories."""
+    try:
+        start, end = parse_day_range(request.GET)
+    except ValueError:
+        raise ValueError('Invalid date, expected YYYY-MM-DD') from None
+    return {
+        'start': start,
+        'end': end,
+        'group_by': request.GET.get('group_by') or None,
+        'cursor': request.GET.get('cursor'),
+        'page_size': int(request.GET.get('page_size', 50)),
+    }
+
 class AdminRecipientWithdrawalsView(APIView):
     permission_classes = [AllowAny]
     def get(self, request, user_id):
-        data, error = get_recipient_withdrawals(user_id)
+        try:
+            data, error = get_recipient_withdrawals(user_id, **_history_options(request))
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         if error:
             return Response({'detail': error}, status=status.HTTP_404_NOT_FOUND)
         return Response(data)
@@ -44,18 +76,113 @@ class AdminRecipientWithdrawalsView(APIView):
 class AdminRecipientTransfersView(APIView):
     permission_classes = [AllowAny]
     def get(self, request, user_id):
-        data, error = get_recipient_transfers(user_id)
+        try:
+            data, error = get_recipient_transfers(user_id, **_history_options(request))
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         if error:
             return Response({'detail': error}, status=status.HTTP_404_NOT_FOUND)
         return Response(data)
 
+class AdminRecipientStatementView(APIView):
+    permission_classes = [IsAdminOrShuraUser]
+    def get(self, request, user_id):
+        wallet = Wallet.objects.filter(user_id=user_id, user__role='recipient').first()
+        if not wallet:
+            return Response({'detail': 'Recipient wallet not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            year, month = parse_month(request.GET.get('month'))
+        except ValueError:
+            return Response({'detail': 'Invalid month, expected YYYY-MM'}, status=status.HTTP_400_BAD_REQUEST)
+        data, error = get_monthly_statement(wallet, year, month)
+        if error:
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
+class AdminRecipientCreditView(APIView):
+    """
+    Credit a recipient's wallet: {"amount": ...} for a manual credit, or
+    {"amount": ..., "reason": ...} for a signed balance adjustment.
+    Honors the Idempotency-Key header.
+    """
+    permission_classes = [IsAdminUserRole]
+    def post(self, request, user_id):
+        recipient = get_user_model().objects.filter(id=user_id, role='recipient').first()
+        if not recipient:
+            return Response({'detail': 'Recipient not found or invalid role'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            amount = Decimal(str(request.data.get('amount'))).quantize(Decimal('0.01'))
+            if not amount.is_finite():
+                # NaN survives quantize() and only fails at the first comparison
+                raise InvalidOperation
+        except (InvalidOperation, ValueError):
+            return Response({'detail': 'Invalid amount'}, status=status.HTTP_400_BAD_REQUEST)
+        reason = request.data.get('reason')
+        if amount == 0 or (amount < 0 and not reason):
+            return Response({'detail': 'Invalid amount'}, status=status.HTTP_400_BAD_REQUEST)
+
+        def perform():
+            wallet_service.create_wallet_for_user(recipient)
+            if reason:
+                transaction = wallet_service.adjust_wallet_balance(recipient, amount, reason, request.user)
+            else:
+                transaction = wallet_service.manual_credit(recipient, amount, request.user)
+            return status.HTTP_201_CREATED, {
+                'user_id': recipient.id,
+                'balance': float(transaction.wallet.balance),
+                'transaction': {
+                    'id': transaction.id,
+                    'type': transaction.type,
+                    'amount': float(transaction.amount),
+                    'description': transaction.description,
+                },
+            }
+
+        try:
+            code, body, replayed = idempotency.run_once(
+                request.user, f'wallet.admin_credit.{recipient.id}', request.headers.get('Idempotency-Key'),
+                {'amount': amount, 'reason': reason}, perform,
+            )
+        except IdempotencyKeyReused as e:
+            return Response({'detail': str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        response = Response(body, status=code)
+        if replayed:
+            response['Idempotent-Replayed'] = 'true'
+        return response
+
 class AdminWalletTransactionListView(APIView):
     permission_classes = [AllowAny]
     def get(self, request):
         page = int(request.GET.get('page', 1))
         page_size = int(request.GET.get('page_size', 10))
         search = request.GET.get('search', None)
-        result, error = get_admin_transactions(page=page, page_size=page_size, search=search)
+        result, error = get_admin_transactions(
+            page=page, page_size=page_size, search=search, cursor=request.GET.get('cursor')
+        )
         if error:
-            return Response({'detail': error}, status=status.HTTP_404_NOT_FOUND)
-        return Response(result) 
\ No newline at end of file
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
+
+class AdminLedgerExportView(APIView):
+    """
+    Stream the full wallet ledger (joined with user and appeal fields) as CSV
+    or NDJSON. ?output=csv|ndjson, ?gzip=1, and the filters ?start=/?end=
+    (YYYY-MM-DD, inclusive), ?type=credit|debit, ?user=<id>.
+    """
+    permission_classes = [IsAdminUserRole]
+
+    def get(self, request):
+        fmt = request.GET.get('output', 'csv')
+        if fmt not in ledger_export.FORMATS:
+            return Response({'detail': 'Invalid output, expected csv or ndjson'}, status=status.HTTP_400_BAD_REQUEST)
+        filters, error = ledger_export.parse_filters(request.GET)
+        if error:
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+        compress = request.GET.get('gzip', '').lower() in ('1', 'true')
+        response = StreamingHttpResponse(
+            ledger_export.iter_export(fmt, compress=compress, **filters),
+            content_type='application/gzip' if compress else ledger_export.CONTENT_TYPES[fmt],
+        )
+        filename = ledger_export.export_filename(fmt, compress, **filters)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -7,13 +7,17 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from wallet.models import Wallet, WalletTransaction
+from wallet.models import Wallet, WalletTransaction, WithdrawalRequest
 from wallet.api.serializers.wallet_serializer import WalletSerializer
 from wallet.api.serializers.transaction_serializer import WalletTransactionSerializer
 from django.core.paginator import Paginator
-from django.db.models import Sum
+from core.pagination import timestamp_keyset_page
 import json
-from wallet.utils import generate_description, resolve_transfer_by
+from decimal import Decimal
+from django.urls import reverse
+from wallet.services import idempotency, withdrawal_queue
+from wallet.services.idempotency import IdempotencyKeyReused
+from wallet.services.balance_checkpoints import get_monthly_statement, parse_month
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -23,21 +27,10 @@ def wallet_balance(request):
         user = request.user
         wallet, created = Wallet.objects.get_or_create(user=user, defaults={'balance': 0})
         
-        # Calculate totals
-        total_received = WalletTransaction.objects.filter(
-            wallet=wallet, 
-            type='credit'
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        total_withdrawn = WalletTransaction.objects.filter(
-            wallet=wallet, 
-            type='debit'
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
         data = {
             'balance': float(wallet.balance),
-            'total_received': float(total_received),
-            'total_withdrawn': float(total_withdrawn),
+            'total_received': float(wallet.total_credited),
+            'total_withdrawn': float(wallet.total_debited),
         }
         
         return Response(data)
@@ -59,7 +52,23 @@ def wallet_transactions(request):
         page = request.GET.get('page', 1)
         page_size = request.GET.get('page_size', 10)
         
-        transactions = WalletTransaction.objects.filter(wallet=wallet).order_by('-timestamp')
+        transactions = WalletTransaction.objects.filter(wallet=wallet).order_by('-timestamp', '-id')
+        
+        # Opt-in keyset paging for infinite scroll: no COUNT, no OFFSET
+        if 'cursor' in request.GET:
+            try:
+                rows, next_cursor = timestamp_keyset_page(
+                    transactions, request.GET['cursor'], max(1, min(int(page_size), 100))
+                )
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid cursor'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response({
+                'results': WalletTransactionSerializer(rows, many=True).data,
+                'next_cursor': next_cursor,
+            })
         
         paginator = Paginator(transactions, page_size)
         page_obj = paginator.get_page(page)
@@ -85,7 +94,11 @@ def wallet_transactions(request):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def withdraw_funds(request):
-    """Withdraw funds from wallet."""
+    """
+    Queue a withdrawal and return 202 with a status URL; the process_withdrawals
+    worker debits the wallet. Retries carrying the same Idempotency-Key replay
+    the first response.
+    """
     try:
         user = request.user
         data = json.loads(request.body)
@@ -97,36 +110,56 @@ def withdraw_funds(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        wallet, created = Wallet.objects.get_or_create(user=user, defaults={'balance': 0})
-        
-        if wallet.balance < amount:
-            return Response(
-                {'error': 'Insufficient balance'}, 
-                status=status.HTTP_400_BAD_REQUEST
+        def perform():
+            # Cheap unlocked pre-check; the worker re-checks atomically when it debits
+            wallet = Wallet.objects.filter(user=user).only('balance').first()
+            if wallet is None or wallet.balance < Decimal(str(amount)):
+                return status.HTTP_400_BAD_REQUEST, {'error': 'Insufficient balance'}
+            request_obj = withdrawal_queue.enqueue_withdrawal(user, amount)
+            return status.HTTP_202_ACCEPTED, {
+                **withdrawal_queue.serialize_request(request_obj),
+                'status_url': reverse('wallet:wallet-withdrawal-status', args=[request_obj.id]),
+            }
+
+        try:
+            code, body, replayed = idempotency.run_once(
+                user, 'wallet.withdraw', request.headers.get('Idempotency-Key'), {'amount': Decimal(str(amount)).quantize(Decimal('0.01'))}, perform
             )
-        
-        # Create withdrawal transaction
-        description = generate_description('withdrawal')
-        transfer_by = resolve_transfer_by(user)
-        transaction = WalletTransaction.objects.create(
-            wallet=wallet,
-            type='debit',
-            amount=amount,
-            description=description,
-            transfer_by=transfer_by,
-            appeal=None,  # No appeal for withdrawals
-            donor=None,   # No donor for withdrawals
-        )
-        
-        # Update wallet balance
-        wallet.balance -= amount
-        wallet.save()
-        
-        serializer = WalletTransactionSerializer(transaction)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        except IdempotencyKeyReused as e:
+            return Response({'error': str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        response = Response(body, status=code)
+        if replayed:
+            response['Idempotent-Replayed'] = 'true'
+        return response
         
     except Exception as e:
         return Response(
             {'error': str(e)}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def withdrawal_status(request, pk):
+    """Status of one of the authenticated user's queued withdrawals."""
+    request_obj = WithdrawalRequest.objects.filter(pk=pk, user=request.user).first()
+    if request_obj is None:
+        return Response({'error': 'Withdrawal request not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(withdrawal_queue.serialize_request(request_obj))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def wallet_statement(request):
+    """Month-end statement for the authenticated user's wallet (?month=YYYY-MM, default last month)."""
+    try:
+        year, month = parse_month(request.GET.get('month'))
+    except ValueError:
+        return Response(
+            {'error': 'Invalid month, expected YYYY-MM'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    wallet, created = Wallet.objects.get_or_create(user=request.user, defaults={'balance': 0})
+    data, error = get_monthly_statement(wallet, year, month)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(data)